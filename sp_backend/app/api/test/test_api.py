@@ -1,4 +1,5 @@
 # Test用
+from app.core.response_cache import mark_user_changed
 from app.models.stock import Stock
 from app.models.user import User
 from app.repositories.test.test_repo import test_create_stock
@@ -18,6 +19,7 @@ def create_stock_test_api(item_id: int, request: StockTestRequest, db: Session,
   
   try:
     test_create_stock(new_stock, db)
+    mark_user_changed(db, new_stock.user_id)
     return success(StockResponse.model_validate(new_stock))
   except Exception:
     db.rollback()
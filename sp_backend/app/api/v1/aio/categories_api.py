@@ -0,0 +1,92 @@
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.response_cache import mark_user_changed
+from app.models.category import Category
+from app.models.user import User
+from app.repositories.aio.categories_repo import create_category, delete_category, get_categories, get_category_by_id, update_category
+from app.repositories.aio.items_repo import get_item_by_category
+from app.repositories.categories_repo import CATEGORY_PAGE_KEYS
+from app.schemas.category import CategoryResponse, CreateCategoryRequest
+from app.utils.pagination import PageParams, split_page
+from app.utils.response import cached_async, error, success
+from app.utils.rows import validate_rows
+
+async def get_categories_api(page: PageParams | None, db: AsyncSession, current_user: User):
+  return await cached_async(current_user.id, "categories", page, lambda: __private_get_categories(page, db, current_user))
+
+async def get_category_api(category_id: int, db: AsyncSession):
+  category = await __private_category_check(category_id, db)
+  
+  if isinstance(category, JSONResponse):
+    return category
+  
+  return success(CategoryResponse.model_validate(category))
+
+async def create_category_api(request: CreateCategoryRequest, db: AsyncSession, current_user: User):
+  new_category = Category(
+    name=request.name,
+    icon=request.icon,
+    user_id=current_user.id
+  )
+
+  try:
+    await create_category(new_category, db)
+    mark_user_changed(db, new_category.user_id)
+    return success(CategoryResponse.model_validate(new_category))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def update_category_api(category_id: int, request: CreateCategoryRequest, db: AsyncSession):
+  category = await __private_category_check(category_id, db)
+  
+  if isinstance(category, JSONResponse):
+    return category
+
+  if request.name:
+    category.name = request.name
+  if request.icon:
+    category.icon = request.icon
+    
+  try:
+    response = await update_category(category, db)
+    mark_user_changed(db, category.user_id)
+    return success(CategoryResponse.model_validate(response))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def delete_category_api(category_id: int, db: AsyncSession):
+  category = await __private_category_check(category_id, db)
+  
+  if isinstance(category, JSONResponse):
+    return category
+  
+  item_exists = await get_item_by_category(category_id, db)
+  
+  if item_exists:
+    return error("This category is used by items and cannot be deleted.", 400)
+  
+  try:
+    await delete_category(category, db)
+    mark_user_changed(db, category.user_id)
+    return success(CategoryResponse.model_validate(category))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+# private
+
+async def __private_get_categories(page: PageParams | None, db: AsyncSession, current_user: User):
+  categories = await get_categories(current_user.id, db, page)
+  categories, next_cursor = split_page(categories, CATEGORY_PAGE_KEYS, page)
+  response = validate_rows(CategoryResponse, categories)
+  return success(response, next_cursor)
+
+async def __private_category_check(category_id: int, db: AsyncSession):
+  category = await get_category_by_id(category_id, db)
+  
+  if not category:
+    return error("Category not found", 404)
+  else:
+    return category
@@ -0,0 +1,242 @@
+import time
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.forecast import RESTOCK_POLICY, forecast_days_of_supply, needs_restock
+from app.core.response_cache import mark_user_changed
+from app.models.item import Item
+from app.models.shopping_list import ShoppingList
+from app.models.stock_history import StockHistory
+from app.models.user import User
+from app.api.v1.analytics_api import price_history_response
+from app.api.v1.items_api import item_response
+from app.repositories.aio.forecast_repo import get_consumption_history
+from app.repositories.aio.items_repo import create_item, delete_item, get_item_rows, get_items, get_items_by_id, update_item
+from app.repositories.items_repo import ITEM_INCLUDES, ITEM_PAGE_KEYS
+from app.repositories.stock_history_repo import STOCK_HISTORY_EXPORT_COLUMNS, STOCK_HISTORY_PAGE_KEYS
+from app.repositories.aio.price_analytics_repo import get_price_history
+from app.repositories.aio.shopping_list_repo import create_shopping_list, increment_shopping_list
+from app.repositories.aio.stock_history_repo import create_stock_history, get_stock_history_by_item_id, stream_stock_history
+from app.repositories.aio.stocks_repo import adjust_stock, get_stock_by_item_id
+from app.schemas.item import ItemRequest, ItemResponse
+from app.schemas.shopping_list import ShoppingListResponse
+from app.schemas.stock import StockRequest, StockResponse
+from app.schemas.stock_history import StockHistoryResponse
+from app.utils.export import ExportFormat, export_chunks_async, export_response
+from app.utils.pagination import PageParams, split_page
+from app.utils.params import parse_csv_param
+from app.utils.response import cached_async, error, success
+from app.utils.rows import validate_rows
+
+async def get_items_api(category_id: int, is_favorite: bool, include: str | None, page: PageParams | None, db: AsyncSession, current_user: User):
+  return await cached_async(current_user.id, "items", (category_id, is_favorite, include, page), lambda: __private_get_items(category_id, is_favorite, include, page, db, current_user))
+
+async def get_item_api(item_id: int, include: str | None, db: AsyncSession):
+  include, unknown = parse_csv_param(include, ITEM_INCLUDES)
+  if unknown:
+    return error(f"Unknown include: {', '.join(unknown)}", 400)
+
+  item = await __private_item_check(item_id, db, include)
+  
+  if isinstance(item, JSONResponse):
+    return item
+  
+  return success(item_response(item, include))
+
+async def create_item_api(request: ItemRequest, db: AsyncSession, current_user: User):
+  new_item = Item(
+    name=request.name,
+    brand=request.brand,
+    unit=request.unit,
+    image_url=request.image_url,
+    default_quantity=request.default_quantity,
+    notes=request.notes,
+    is_favorite=request.is_favorite,
+    user_id=current_user.id,
+    category_id=request.category_id
+  )
+  
+  try:
+    await create_item(new_item, db)
+    mark_user_changed(db, new_item.user_id)
+    return success(ItemResponse.model_validate(new_item))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def update_item_api(item_id: int, request: ItemRequest, db: AsyncSession):
+  item = await __private_item_check(item_id, db)
+
+  if isinstance(item, JSONResponse):
+    return item
+  
+  if request.name:
+    item.name = request.name
+  if request.brand:
+    item.brand = request.brand
+  if request.unit:
+    item.unit = request.unit
+  if request.image_url:
+    item.image_url = request.image_url
+  if request.default_quantity:
+    item.default_quantity = request.default_quantity
+  if request.notes:
+    item.notes = request.notes
+  if request.is_favorite:
+    item.is_favorite = request.is_favorite
+  if request.category_id:
+    item.category_id = request.category_id
+  
+  try:
+    response = await update_item(item, db)
+    mark_user_changed(db, item.user_id)
+    return success(ItemResponse.model_validate(response))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def delete_item_api(item_id: int, db: AsyncSession):
+  item = await __private_item_check(item_id, db)
+  
+  if isinstance(item, JSONResponse):
+    return item
+  
+  try:
+    await delete_item(item, db)
+    mark_user_changed(db, item.user_id)
+    return success(ItemResponse.model_validate(item))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def get_stock_by_item_id_api(item_id: int, db: AsyncSession):
+  stock = await __private_stock_check(item_id, db)
+  
+  if isinstance(stock, JSONResponse):
+    return stock
+  
+  return success(StockResponse.model_validate(stock))
+
+async def update_stock_api(item_id: int, request: StockRequest, db: AsyncSession, current_user: User):
+  if request.quantity and request.action not in ("increase", "decrease", "manual"):
+    return error("Invalid action type", 400)
+
+  try:
+    result = await adjust_stock(item_id, request.action, request.quantity, request.threshold, request.location, db)
+    if result is None:
+      stock = await __private_stock_check(item_id, db)
+      if isinstance(stock, JSONResponse):
+        return stock
+      return error("Insufficient stock", 400)
+
+    stock, old_quantity = result
+
+    # 在庫履歴更新
+    new_stock_history = StockHistory(
+      change=stock.quantity - old_quantity,
+      reason=request.reason,
+      memo=request.memo,
+      user_id=current_user.id,
+      item_id=item_id
+    )
+    await create_stock_history(new_stock_history, db)
+    mark_user_changed(db, new_stock_history.user_id)
+
+    # 在庫がなければ（forecast のときは尽きそうなら）買い物リストに追加
+    days_of_supply = None
+    if RESTOCK_POLICY == "forecast":
+      history = await get_consumption_history(current_user.id, db, item_id)
+      days_of_supply = forecast_days_of_supply(history, item_id, stock.quantity, time.time())
+    shopping_list = None
+    if needs_restock(stock.quantity, stock.threshold, days_of_supply):
+      shopping_list = await increment_shopping_list(current_user.id, item_id, db)
+      if not shopping_list:
+        shopping_list = ShoppingList(
+          item_id=item_id,
+          quantity=1,
+          checked=False,
+          user_id=current_user.id
+        )
+        await create_shopping_list(shopping_list, db)
+
+    response = {
+      "stock": StockResponse.model_validate(stock),
+      "history": StockHistoryResponse.model_validate(new_stock_history),
+    }
+    if shopping_list:
+      response["shopping_list"] = ShoppingListResponse.model_validate(shopping_list)
+    return success(response)
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def get_stock_history_by_item_id_api(item_id: int, page: PageParams | None, db: AsyncSession):
+  stock_history = await __private_stock_history_check(item_id, page, db)
+  
+  if isinstance(stock_history, JSONResponse):
+    return stock_history
+  
+  stock_history, next_cursor = split_page(stock_history, STOCK_HISTORY_PAGE_KEYS, page)
+  response = validate_rows(StockHistoryResponse, stock_history)
+  return success(response, next_cursor)
+
+async def get_price_history_api(item_id: int, window: int, db: AsyncSession, current_user: User):
+  return await cached_async(current_user.id, "price_history", (item_id, window), lambda: __private_get_price_history(item_id, window, db, current_user))
+
+async def export_stock_history_api(item_id: int, format: ExportFormat, db: AsyncSession, current_user: User):
+  item = await __private_item_check(item_id, db)
+
+  if isinstance(item, JSONResponse):
+    return item
+
+  rows = stream_stock_history(item_id, current_user.id, db)
+  return export_response(export_chunks_async(rows, STOCK_HISTORY_EXPORT_COLUMNS, format), format, f"stock_history_{item_id}")
+  
+# private
+
+async def __private_get_items(category_id: int, is_favorite: bool, include: str | None, page: PageParams | None, db: AsyncSession, current_user: User):
+  include, unknown = parse_csv_param(include, ITEM_INCLUDES)
+  if unknown:
+    return error(f"Unknown include: {', '.join(unknown)}", 400)
+
+  if not include:
+    items, next_cursor = split_page(await get_item_rows(current_user.id, category_id, is_favorite, db, page), ITEM_PAGE_KEYS, page)
+    return success(validate_rows(ItemResponse, items), next_cursor)
+
+  items = await get_items(current_user.id, category_id, is_favorite, db, include, page)
+  items, next_cursor = split_page(items, ITEM_PAGE_KEYS, page)
+  response = [item_response(c, include) for c in items]
+  return success(response, next_cursor)
+
+async def __private_get_price_history(item_id: int, window: int, db: AsyncSession, current_user: User):
+  item = await __private_item_check(item_id, db)
+
+  if isinstance(item, JSONResponse):
+    return item
+
+  rows = await get_price_history(current_user.id, item_id, window, db)
+  return success(price_history_response(item, rows))
+
+async def __private_item_check(item_id: int, db: AsyncSession, include: tuple[str, ...] = ()):
+  item = await get_items_by_id(item_id, db, include)
+  
+  if not item:
+    return error("Item not found", 404)
+  else:
+    return item
+
+async def __private_stock_check(item_id: int, db: AsyncSession):
+  stock = await get_stock_by_item_id(item_id, db)
+  
+  if not stock:
+    return error("Stock not found", 404)
+  else:
+    return stock
+
+async def __private_stock_history_check(item_id: int, page: PageParams | None, db: AsyncSession):
+  stock_history = await get_stock_history_by_item_id(item_id, db, page)
+  
+  # 2 ページ目以降が空なのは正常
+  if not stock_history and not (page and page.after):
+    return error("StockHistory not found", 404)
+  else:
+    return stock_history
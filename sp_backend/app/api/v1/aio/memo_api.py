@@ -0,0 +1,90 @@
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.response_cache import mark_user_changed
+from app.models.memo import Memo
+from app.models.user import User
+from app.repositories.aio.memos_repo import create_memo, delete_memo, get_memo_by_id, get_memos, update_memo
+from app.repositories.memos_repo import MEMO_PAGE_KEYS
+from app.schemas.memo import CreateMemoRequest, MemoResponse
+from app.utils.pagination import PageParams, split_page
+from app.utils.response import error, success
+from app.utils.rows import validate_rows
+
+async def get_memos_api(page: PageParams | None, db: AsyncSession, current_user: User):
+  memos = await get_memos(current_user.id, db, page)
+  memos, next_cursor = split_page(memos, MEMO_PAGE_KEYS, page)
+  response = validate_rows(MemoResponse, memos)
+  return success(response, next_cursor)
+
+async def get_memo_api(memo_id: int, db: AsyncSession):
+  memo = await __private_memo_check(memo_id, db)
+  
+  if isinstance(memo, JSONResponse):
+    return memo
+  
+  return success(MemoResponse.model_validate(memo))
+
+async def create_memo_api(request: CreateMemoRequest, db: AsyncSession, current_user: User):
+  new_memo = Memo(
+    title=request.title,
+    content=request.content,
+    type=request.type,
+    is_done=request.is_done,
+    tags=request.tags,
+    user_id=current_user.id
+  )
+
+  try:
+    await create_memo(new_memo, db)
+    mark_user_changed(db, new_memo.user_id)
+    return success(MemoResponse.model_validate(new_memo))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def update_memo_api(memo_id: int, request: CreateMemoRequest, db: AsyncSession):
+  memo = await __private_memo_check(memo_id, db)
+  
+  if isinstance(memo, JSONResponse):
+    return memo
+
+  memo.title = request.title
+  if request.content:
+    memo.content = request.content
+  if request.type:
+    memo.type = request.type
+  memo.is_done = request.is_done
+  if request.tags:
+    memo.tags = request.tags
+    
+  try:
+    response = await update_memo(memo, db)
+    mark_user_changed(db, memo.user_id)
+    return success(MemoResponse.model_validate(response))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def delete_memo_api(memo_id: int, db: AsyncSession):
+  memo = await __private_memo_check(memo_id, db)
+  
+  if isinstance(memo, JSONResponse):
+    return memo
+  
+  try:
+    await delete_memo(memo, db)
+    mark_user_changed(db, memo.user_id)
+    return success(MemoResponse.model_validate(memo))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+# private
+
+async def __private_memo_check(memo_id: int, db: AsyncSession):
+  memo = await get_memo_by_id(memo_id, db)
+  
+  if not memo:
+    return error("Memo not found", 404)
+  else:
+    return memo
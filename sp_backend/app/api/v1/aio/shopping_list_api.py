@@ -0,0 +1,97 @@
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.shopping_list_api import recommendation_since, store_recommendation_response
+from app.core.response_cache import mark_user_changed
+from app.models.shopping_list import ShoppingList
+from app.models.user import User
+from app.repositories.aio.shopping_list_repo import create_shopping_list, delete_shopping_list, get_shopping_list_by_id, get_shopping_list_by_item, get_shopping_lists, update_shopping_list
+from app.repositories.aio.store_prices_repo import get_store_recommendation
+from app.repositories.shopping_list_repo import SHOPPING_LIST_PAGE_KEYS
+from app.schemas.shopping_list import ShoppingListCheckRequest, ShoppingListRequest, ShoppingListResponse
+from app.utils.pagination import PageParams, split_page
+from app.utils.response import cached_async, error, success
+from app.utils.rows import validate_rows
+
+async def get_shopping_lists_api(page: PageParams | None, db: AsyncSession, current_user: User):
+  shopping_lists = await get_shopping_lists(current_user.id, db, page)
+  shopping_lists, next_cursor = split_page(shopping_lists, SHOPPING_LIST_PAGE_KEYS, page)
+  response = validate_rows(ShoppingListResponse, shopping_lists)
+  return success(response, next_cursor)
+
+async def get_store_recommendation_api(recent_days: int | None, db: AsyncSession, current_user: User):
+  return await cached_async(current_user.id, "store_recommendation", recent_days, lambda: __private_get_store_recommendation(recent_days, db, current_user))
+
+async def get_shopping_list_api(shopping_list_id: int, db: AsyncSession):
+  shopping_list = await __private_shopping_list_check(shopping_list_id, db)
+  
+  if isinstance(shopping_list, JSONResponse):
+    return shopping_list
+  
+  return success(ShoppingListResponse.model_validate(shopping_list))
+
+async def create_shopping_list_api(request: ShoppingListRequest, db: AsyncSession, current_user: User):
+  new_shopping_list = ShoppingList(
+    quantity=request.quantity,
+    checked=False,
+    user_id=current_user.id,
+    item_id=request.item_id
+  )
+  
+  existing = await get_shopping_list_by_item(current_user.id, request.item_id, db)
+  if existing:
+    existing.quantity += request.quantity
+    response = await update_shopping_list(existing, db)
+    mark_user_changed(db, existing.user_id)
+    return success(ShoppingListResponse.model_validate(response))
+  
+  try:
+    await create_shopping_list(new_shopping_list, db)
+    mark_user_changed(db, new_shopping_list.user_id)
+    return success(ShoppingListResponse.model_validate(new_shopping_list))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def update_shopping_list_api(shopping_list_id: int, request: ShoppingListCheckRequest, db: AsyncSession):
+  shopping_list = await __private_shopping_list_check(shopping_list_id, db)
+
+  if isinstance(shopping_list, JSONResponse):
+    return shopping_list
+  
+  shopping_list.checked = request.checked
+  
+  try:
+    response = await update_shopping_list(shopping_list, db)
+    mark_user_changed(db, shopping_list.user_id)
+    return success(ShoppingListResponse.model_validate(response))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def delete_shopping_list_api(shopping_list_id: int, db: AsyncSession):
+  shopping_list = await __private_shopping_list_check(shopping_list_id, db)
+
+  if isinstance(shopping_list, JSONResponse):
+    return shopping_list
+  
+  try:
+    await delete_shopping_list(shopping_list, db)
+    mark_user_changed(db, shopping_list.user_id)
+    return success(ShoppingListResponse.model_validate(shopping_list))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+  
+# private
+
+async def __private_get_store_recommendation(recent_days: int | None, db: AsyncSession, current_user: User):
+  rows = await get_store_recommendation(current_user.id, recommendation_since(recent_days), db)
+  return success(store_recommendation_response(rows))
+
+async def __private_shopping_list_check(shopping_list_id: int, db: AsyncSession):
+  shopping_list = await get_shopping_list_by_id(shopping_list_id, db)
+  
+  if not shopping_list:
+    return error("ShoppingList not found", 404)
+  else:
+    return shopping_list
@@ -0,0 +1,162 @@
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.aio.items_api import update_stock_api
+from app.core.response_cache import mark_user_changed
+from app.models.shopping_record import ShoppingRecord
+from app.models.user import User
+from app.repositories.aio.shopping_list_repo import delete_shopping_list, get_shopping_list_by_item
+from app.repositories.aio.shopping_records_repo import create_shopping_record, delete_shopping_record, get_monthly_spending, get_shopping_record_by_id, get_shopping_records, get_spending_by_category, get_spending_by_item, stream_shopping_records, update_shopping_record
+from app.repositories.aio.stocks_repo import get_stock_by_item_id
+from app.repositories.shopping_records_repo import SHOPPING_RECORD_EXPORT_COLUMNS, SHOPPING_RECORD_PAGE_KEYS, record_snapshot
+from app.schemas.shopping_record import ShoppingRecordRequest, ShoppingRecordResponse, ShoppingRecordUpdateRequest
+from app.schemas.stock import StockRequest
+from app.utils.export import ExportFormat, export_chunks_async, export_response
+from app.utils.pagination import PageParams, split_page
+from app.utils.period import SummaryPeriod
+from app.utils.response import error, row_data, success
+from app.utils.rows import validate_rows
+
+async def get_shopping_records_api(page: PageParams | None, db: AsyncSession, current_user: User):
+  shopping_records = await get_shopping_records(current_user.id, db, page)
+  shopping_records, next_cursor = split_page(shopping_records, SHOPPING_RECORD_PAGE_KEYS, page)
+  response = validate_rows(ShoppingRecordResponse, shopping_records)
+  return success(response, next_cursor)
+
+async def export_shopping_records_api(format: ExportFormat, period: SummaryPeriod, db: AsyncSession, current_user: User):
+  rows = stream_shopping_records(current_user.id, db, period)
+  return export_response(export_chunks_async(rows, SHOPPING_RECORD_EXPORT_COLUMNS, format), format, "shopping_records")
+
+async def get_shopping_record_api(shopping_record_id: int, db: AsyncSession):
+  shopping_record = await __private_shopping_record_check(shopping_record_id, db)
+  
+  if isinstance(shopping_record, JSONResponse):
+    return shopping_record
+  
+  return success(ShoppingRecordResponse.model_validate(shopping_record))
+
+async def create_shopping_record_api(request: ShoppingRecordRequest, db: AsyncSession, current_user: User):
+  new_shopping_record = ShoppingRecord(
+    item_id=request.item_id,
+    quantity=request.quantity,
+    price=request.price,
+    store=request.store,
+    bought_at=request.bought_at,
+    user_id=current_user.id
+  )
+  
+  stock = await get_stock_by_item_id(request.item_id, db)
+  update_stock = StockRequest(
+    reason="shopping",
+    memo="",
+    action="increase",
+    quantity=request.quantity,
+    threshold=stock.threshold,
+    location=stock.location
+  )
+  
+  shopping_list = await get_shopping_list_by_item(current_user.id, request.item_id, db)
+
+  try:
+    await create_shopping_record(new_shopping_record, db)
+    mark_user_changed(db, new_shopping_record.user_id)
+    stock_response = await update_stock_api(request.item_id, update_stock, db, current_user)
+    if __private_is_error(stock_response):
+      await db.rollback()
+      return stock_response
+    if shopping_list:
+      await delete_shopping_list(shopping_list, db)
+    return success(ShoppingRecordResponse.model_validate(new_shopping_record))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def update_shopping_record_api(shopping_record_id: int, request: ShoppingRecordUpdateRequest, db: AsyncSession, current_user: User):
+  shopping_record = await __private_shopping_record_check(shopping_record_id, db)
+  
+  if isinstance(shopping_record, JSONResponse):
+    return shopping_record
+
+  previous = record_snapshot(shopping_record)
+  if request.item_id:
+    shopping_record.item_id = request.item_id
+  if request.quantity:
+    shopping_record.quantity = request.quantity
+  if request.price:
+    shopping_record.price = request.price
+  if request.store:
+    shopping_record.store = request.store
+  if request.bought_at:
+    shopping_record.bought_at = request.bought_at
+  
+  stock = await get_stock_by_item_id(request.item_id, db)
+  update_stock = StockRequest(
+    reason=request.reason,
+    memo="",
+    action=request.action,
+    quantity=request.quantity,
+    threshold=stock.threshold,
+    location=stock.location
+  )
+    
+  try:
+    response = await update_shopping_record(shopping_record, previous, db)
+    mark_user_changed(db, shopping_record.user_id)
+    stock_response = await update_stock_api(request.item_id, update_stock, db, current_user)
+    if __private_is_error(stock_response):
+      await db.rollback()
+      return stock_response
+    return success(ShoppingRecordResponse.model_validate(response))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def delete_shopping_record_api(shopping_record_id: int, db: AsyncSession):
+  shopping_record = await __private_shopping_record_check(shopping_record_id, db)
+  
+  if isinstance(shopping_record, JSONResponse):
+    return shopping_record
+  
+  try:
+    await delete_shopping_record(shopping_record, db)
+    mark_user_changed(db, shopping_record.user_id)
+    return success(ShoppingRecordResponse.model_validate(shopping_record))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def get_monthly_spending_api(period: SummaryPeriod, db: AsyncSession, current_user: User):
+  try:
+    data = await get_monthly_spending(current_user.id, db, period)
+    return success(row_data(data))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def get_spending_by_item_api(period: SummaryPeriod, db: AsyncSession, current_user: User):
+  try:
+    data = await get_spending_by_item(current_user.id, db, period)
+    return success(row_data(data))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+async def get_spending_by_category_api(period: SummaryPeriod, db: AsyncSession, current_user: User):
+  try:
+    data = await get_spending_by_category(current_user.id, db, period)
+    return success(row_data(data))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+# private
+
+async def __private_shopping_record_check(shopping_record_id: int, db: AsyncSession):
+  shopping_record = await get_shopping_record_by_id(shopping_record_id, db)
+  
+  if not shopping_record:
+    return error("ShoppingRecord not found", 404)
+  else:
+    return shopping_record
+
+def __private_is_error(response):
+  return isinstance(response, JSONResponse) and response.status_code >= 400
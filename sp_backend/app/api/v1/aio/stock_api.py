@@ -0,0 +1,50 @@
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.stock_api import forecast_response
+from app.core.forecast import forecast_consumption
+from app.core.response_cache import mark_user_changed
+from app.models.stock import Stock
+from app.models.user import User
+from app.repositories.aio.forecast_repo import get_consumption_history, get_stock_levels
+from app.repositories.aio.stocks_repo import create_stock, get_stocks
+from app.repositories.stocks_repo import STOCK_PAGE_KEYS
+from app.schemas.stock import StockOnlyRequest, StockResponse
+from app.utils.pagination import PageParams, split_page
+from app.utils.response import cached_async, error, success
+from app.utils.rows import validate_rows
+
+async def get_stocks_api(page: PageParams | None, db: AsyncSession, current_user: User):
+  return await cached_async(current_user.id, "stocks", page, lambda: __private_get_stocks(page, db, current_user))
+
+async def get_stock_forecast_api(db: AsyncSession, current_user: User):
+  return await cached_async(current_user.id, "stock_forecast", None, lambda: __private_get_stock_forecast(db, current_user))
+
+async def create_stock_api(request: StockOnlyRequest, db: AsyncSession, current_user: User):
+  new_stock = Stock(
+    quantity=request.quantity,
+    threshold=request.threshold,
+    location=request.location,
+    user_id=current_user.id,
+    item_id=request.item_id
+  )
+  
+  try:
+    await create_stock(new_stock, db)
+    mark_user_changed(db, new_stock.user_id)
+    return success(StockResponse.model_validate(new_stock))
+  except Exception:
+    await db.rollback()
+    return error("db_error", 500)
+
+# private
+
+async def __private_get_stock_forecast(db: AsyncSession, current_user: User):
+  history = await get_consumption_history(current_user.id, db)
+  stocks = await get_stock_levels(current_user.id, db)
+  return success(forecast_response(forecast_consumption(history, stocks, time.time())))
+
+async def __private_get_stocks(page: PageParams | None, db: AsyncSession, current_user: User):
+  stocks = await get_stocks(current_user.id, db, page)
+  stocks, next_cursor = split_page(stocks, STOCK_PAGE_KEYS, page)
+  response = validate_rows(StockResponse, stocks)
+  return success(response, next_cursor)
@@ -0,0 +1,57 @@
+from sqlalchemy.orm import Session
+from app.models.item import Item
+from app.models.user import User
+from app.repositories.price_analytics_repo import get_price_summary
+from app.schemas.price import ItemPriceSummaryResponse, PriceHistoryResponse, PricePointResponse, StorePriceResponse
+from app.utils.response import cached, success
+
+def get_price_analytics_api(window: int, db: Session, current_user: User):
+  return cached(current_user.id, "price_analytics", window, lambda: __private_get_price_analytics(window, db, current_user))
+
+# price_window_query の行からアイテムごとのサマリーを組み立てる（集計は SQL 側で済んでいる）
+def item_price_summaries(rows) -> list[ItemPriceSummaryResponse]:
+  summaries = {}
+  for row in rows:
+    if row.store_rn != 1:
+      continue
+    summary = summaries.setdefault(row.item_id, {
+      "item_id": row.item_id,
+      "name": getattr(row, "name", None),
+      "stores": [],
+    })
+    summary["stores"].append(StorePriceResponse(
+      store=row.store,
+      last_unit_price=row.unit_price,
+      min_unit_price=row.store_min,
+      max_unit_price=row.store_max,
+      count=row.store_count,
+    ))
+    if row.item_rn == 1:
+      summary.update(
+        last_unit_price=row.unit_price,
+        last_store=row.store,
+        last_bought_at=row.bought_at,
+        rolling_avg=row.rolling_avg,
+        min_unit_price=row.item_min,
+        max_unit_price=row.item_max,
+        count=row.item_count,
+      )
+  for summary in summaries.values():
+    summary["stores"].sort(key=lambda s: s.store)
+  return [ItemPriceSummaryResponse(**s) for s in summaries.values()]
+
+def price_history_response(item: Item, rows) -> PriceHistoryResponse:
+  summary = next(iter(item_price_summaries(rows)), None)
+  if summary:
+    summary.name = item.name
+  return PriceHistoryResponse(
+    item_id=item.id,
+    summary=summary,
+    points=[PricePointResponse.model_validate(row) for row in rows],
+  )
+
+# private
+
+def __private_get_price_analytics(window: int, db: Session, current_user: User):
+  rows = get_price_summary(current_user.id, window, db)
+  return success(item_price_summaries(rows))
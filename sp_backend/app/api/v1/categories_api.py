@@ -1,16 +1,17 @@
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from app.core.response_cache import mark_user_changed
 from app.models.category import Category
 from app.models.user import User
-from app.repositories.categories_repo import create_category, delete_category, get_categories, get_category_by_id, update_category
+from app.repositories.categories_repo import CATEGORY_PAGE_KEYS, create_category, delete_category, get_categories, get_category_by_id, update_category
 from app.repositories.items_repo import get_item_by_category
 from app.schemas.category import CategoryResponse, CreateCategoryRequest
-from app.utils.response import error, success
+from app.utils.pagination import PageParams, split_page
+from app.utils.response import cached, error, success
+from app.utils.rows import validate_rows
 
-def get_categories_api(db: Session, current_user: User):
-  categories = get_categories(current_user.id, db)
-  response = [CategoryResponse.model_validate(c) for c in categories]
-  return success(response)
+def get_categories_api(page: PageParams | None, db: Session, current_user: User):
+  return cached(current_user.id, "categories", page, lambda: __private_get_categories(page, db, current_user))
 
 def get_category_api(category_id: int, db: Session):
   category = __private_category_check(category_id, db)
@@ -29,6 +30,7 @@ def create_category_api(request: CreateCategoryRequest, db: Session, current_use
 
   try:
     create_category(new_category, db)
+    mark_user_changed(db, new_category.user_id)
     return success(CategoryResponse.model_validate(new_category))
   except Exception:
     db.rollback()
@@ -47,6 +49,7 @@ def update_category_api(category_id: int, request: CreateCategoryRequest, db: Se
     
   try:
     response = update_category(category, db)
+    mark_user_changed(db, category.user_id)
     return success(CategoryResponse.model_validate(response))
   except Exception:
     db.rollback()
@@ -65,6 +68,7 @@ def delete_category_api(category_id: int, db: Session):
   
   try:
     delete_category(category, db)
+    mark_user_changed(db, category.user_id)
     return success(CategoryResponse.model_validate(category))
   except Exception:
     db.rollback()
@@ -72,6 +76,12 @@ def delete_category_api(category_id: int, db: Session):
 
 # private
 
+def __private_get_categories(page: PageParams | None, db: Session, current_user: User):
+  categories = get_categories(current_user.id, db, page)
+  categories, next_cursor = split_page(categories, CATEGORY_PAGE_KEYS, page)
+  response = validate_rows(CategoryResponse, categories)
+  return success(response, next_cursor)
+
 def __private_category_check(category_id: int, db: Session):
   category = get_category_by_id(category_id, db)
   
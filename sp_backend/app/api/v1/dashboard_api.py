@@ -0,0 +1,64 @@
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.repositories.dashboard_repo import get_item_overview, get_open_shopping_list, get_recent_memos
+from app.schemas.dashboard import DashboardItemResponse, DashboardShoppingListResponse
+from app.schemas.memo import MemoResponse
+from app.schemas.shopping_list import ShoppingListResponse
+from app.schemas.stock import StockResponse
+from app.utils.params import parse_csv_param
+from app.utils.response import cached, error, success
+
+DASHBOARD_SECTIONS = ("user", "items", "low_stock", "shopping_list", "memos")
+
+def get_dashboard_api(sections: str | None, limit: int | None, db: Session, current_user: User):
+  return cached(current_user.id, "dashboard", (sections, limit), lambda: __private_get_dashboard(sections, limit, db, current_user))
+
+# private
+
+def __private_get_dashboard(sections: str | None, limit: int | None, db: Session, current_user: User):
+  requested, unknown = parse_csv_param(sections, DASHBOARD_SECTIONS)
+  if unknown:
+    return error(f"Unknown sections: {', '.join(unknown)}", 400)
+  requested = requested or DASHBOARD_SECTIONS
+
+  response = {}
+
+  if "user" in requested:
+    response["user"] = {
+      "name": current_user.name,
+      "email": current_user.email,
+    }
+
+  if "items" in requested or "low_stock" in requested:
+    items = [__private_item_overview(*row) for row in get_item_overview(current_user.id, db)]
+    if "items" in requested:
+      response["items"] = items
+    if "low_stock" in requested:
+      low_stock = [i for i in items if i.stock and i.stock.quantity < i.stock.threshold]
+      response["low_stock"] = low_stock[:limit]
+
+  if "shopping_list" in requested:
+    response["shopping_list"] = [
+      __private_shopping_list_overview(*row)
+      for row in get_open_shopping_list(current_user.id, limit, db)
+    ]
+
+  if "memos" in requested:
+    response["memos"] = [MemoResponse.model_validate(m) for m in get_recent_memos(current_user.id, limit, db)]
+
+  return success(response)
+
+def __private_item_overview(item, category_name, stock):
+  response = DashboardItemResponse.model_validate(item)
+  response.category_name = category_name
+  response.stock = StockResponse.model_validate(stock) if stock else None
+  return response
+
+def __private_shopping_list_overview(shopping_list, name, image_url, notes):
+  response = DashboardShoppingListResponse.model_validate({
+    **ShoppingListResponse.model_validate(shopping_list).model_dump(),
+    "name": name,
+    "image_url": image_url,
+    "notes": notes,
+  })
+  return response
@@ -1,31 +1,62 @@
+import time
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from app.api.v1.analytics_api import price_history_response
+from app.core.forecast import RESTOCK_POLICY, forecast_days_of_supply, needs_restock
+from app.core.response_cache import mark_user_changed
 from app.models.item import Item
 from app.models.shopping_list import ShoppingList
 from app.models.stock_history import StockHistory
 from app.models.user import User
-from app.repositories.items_repo import create_item, delete_item, get_items, get_items_by_id, update_item
-from app.repositories.shopping_list_repo import create_shopping_list, get_shopping_list_by_item, update_shopping_list
-from app.repositories.stock_history_repo import create_stock_history, get_stock_history_by_item_id
-from app.repositories.stocks_repo import get_stock_by_item_id, update_stock
+from app.repositories.forecast_repo import get_consumption_history
+from app.repositories.items_repo import ITEM_INCLUDES, ITEM_PAGE_KEYS, create_item, delete_item, get_item_rows, get_items, get_items_by_id, update_item
+from app.repositories.price_analytics_repo import get_price_history
+from app.repositories.shopping_list_repo import create_shopping_list, increment_shopping_list
+from app.repositories.stock_history_repo import STOCK_HISTORY_EXPORT_COLUMNS, STOCK_HISTORY_PAGE_KEYS, create_stock_history, get_stock_history_by_item_id, stream_stock_history
+from app.repositories.stocks_repo import adjust_stock, get_stock_by_item_id
+from app.schemas.category import CategoryResponse
 from app.schemas.item import ItemRequest, ItemResponse
 from app.schemas.shopping_list import ShoppingListResponse
 from app.schemas.stock import StockRequest, StockResponse
 from app.schemas.stock_history import StockHistoryResponse
-from app.utils.response import error, success
+from app.utils.export import ExportFormat, export_chunks, export_response
+from app.utils.pagination import PageParams, split_page
+from app.utils.params import parse_csv_param
+from app.utils.response import cached, error, success
+from app.utils.rows import validate_rows
 
-def get_items_api(category_id: int, is_favorite: bool, db: Session, current_user: User):
-  items = get_items(current_user.id, category_id, is_favorite, db)
-  response = [ItemResponse.model_validate(c) for c in items]
-  return success(response)
+def get_items_api(category_id: int, is_favorite: bool, include: str | None, page: PageParams | None, db: Session, current_user: User):
+  return cached(current_user.id, "items", (category_id, is_favorite, include, page), lambda: __private_get_items(category_id, is_favorite, include, page, db, current_user))
 
-def get_item_api(item_id: int, db: Session):
-  item = __private_item_check(item_id, db)
+def get_item_api(item_id: int, include: str | None, db: Session):
+  include, unknown = parse_csv_param(include, ITEM_INCLUDES)
+  if unknown:
+    return error(f"Unknown include: {', '.join(unknown)}", 400)
+
+  item = __private_item_check(item_id, db, include)
   
   if isinstance(item, JSONResponse):
     return item
   
-  return success(ItemResponse.model_validate(item))
+  return success(item_response(item, include))
+
+# include なしなら従来どおり ItemResponse、ありなら指定された関連を埋め込む
+def item_response(item: Item, include: tuple[str, ...]):
+  if not include:
+    return ItemResponse.model_validate(item)
+
+  related = {}
+  if "stock" in include:
+    related["stock"] = StockResponse.model_validate(item.stocks[0]) if item.stocks else None
+  if "category" in include:
+    related["category"] = CategoryResponse.model_validate(item.category) if item.category else None
+  if "shopping_list" in include:
+    related["shopping_list"] = [ShoppingListResponse.model_validate(s) for s in item.shopping_list]
+
+  # ItemDetailResponse の形（指定された関連のキーだけを持つ）。検証し直さず、関連はモデルのまま success() でシリアライズする
+  response = ItemResponse.model_validate(item).model_dump()
+  response.update(related)
+  return response
 
 def create_item_api(request: ItemRequest, db: Session, current_user: User):
   new_item = Item(
@@ -42,6 +73,7 @@ def create_item_api(request: ItemRequest, db: Session, current_user: User):
   
   try:
     create_item(new_item, db)
+    mark_user_changed(db, new_item.user_id)
     return success(ItemResponse.model_validate(new_item))
   except Exception:
     db.rollback()
@@ -72,6 +104,7 @@ def update_item_api(item_id: int, request: ItemRequest, db: Session):
   
   try:
     response = update_item(item, db)
+    mark_user_changed(db, item.user_id)
     return success(ItemResponse.model_validate(response))
   except Exception:
     db.rollback()
@@ -85,6 +118,7 @@ def delete_item_api(item_id: int, db: Session):
   
   try:
     delete_item(item, db)
+    mark_user_changed(db, item.user_id)
     return success(ItemResponse.model_validate(item))
   except Exception:
     db.rollback()
@@ -99,83 +133,108 @@ def get_stock_by_item_id_api(item_id: int, db: Session):
   return success(StockResponse.model_validate(stock))
 
 def update_stock_api(item_id: int, request: StockRequest, db: Session, current_user: User):
-  stock = __private_stock_check(item_id, db)
+  if request.quantity and request.action not in ("increase", "decrease", "manual"):
+    return error("Invalid action type", 400)
 
-  if isinstance(stock, JSONResponse):
-    return stock
-  
-  old_quantity = stock.quantity
-  if request.quantity:
-    if request.action == "increase":
-      stock.quantity += request.quantity
-    elif request.action == "decrease":
-      if stock.quantity - request.quantity < 0:
-        return error("Insufficient stock", 400)
-      stock.quantity -= request.quantity
-    elif request.action == "manual":
-      stock.quantity = request.quantity
-    else:
-      return error("Invalid action type", 400)
-
-  if request.threshold:
-    stock.threshold = request.threshold
-  if request.location:
-    stock.location = request.location
-  
-  # 在庫履歴更新
-  new_stock_history = StockHistory(
-    change=stock.quantity - old_quantity,
-    reason=request.reason,
-    memo=request.memo,
-    user_id=current_user.id,
-    item_id=item_id
-  )
-  
-  stock_response = update_stock(stock, db)
-  history_response = create_stock_history(new_stock_history, db)
-  # 在庫がなければ買い物リストに追加
-  if stock.quantity < stock.threshold:
-    shopping_list = get_shopping_list_by_item(current_user.id, item_id, db)
+  try:
+    result = adjust_stock(item_id, request.action, request.quantity, request.threshold, request.location, db)
+    if result is None:
+      stock = __private_stock_check(item_id, db)
+      if isinstance(stock, JSONResponse):
+        return stock
+      return error("Insufficient stock", 400)
+
+    stock, old_quantity = result
+
+    # 在庫履歴更新
+    new_stock_history = StockHistory(
+      change=stock.quantity - old_quantity,
+      reason=request.reason,
+      memo=request.memo,
+      user_id=current_user.id,
+      item_id=item_id
+    )
+    create_stock_history(new_stock_history, db)
+    mark_user_changed(db, new_stock_history.user_id)
+
+    # 在庫がなければ（forecast のときは尽きそうなら）買い物リストに追加
+    days_of_supply = None
+    if RESTOCK_POLICY == "forecast":
+      history = get_consumption_history(current_user.id, db, item_id)
+      days_of_supply = forecast_days_of_supply(history, item_id, stock.quantity, time.time())
+    shopping_list = None
+    if needs_restock(stock.quantity, stock.threshold, days_of_supply):
+      shopping_list = increment_shopping_list(current_user.id, item_id, db)
+      if not shopping_list:
+        shopping_list = ShoppingList(
+          item_id=item_id,
+          quantity=1,
+          checked=False,
+          user_id=current_user.id
+        )
+        create_shopping_list(shopping_list, db)
+
+    response = {
+      "stock": StockResponse.model_validate(stock),
+      "history": StockHistoryResponse.model_validate(new_stock_history),
+    }
     if shopping_list:
-      shopping_list.quantity += 1
-      list_response = update_shopping_list(shopping_list, db)
-      return success({
-        "stock": StockResponse.model_validate(stock_response),
-        "history": StockHistoryResponse.model_validate(history_response),
-        "shopping_list": ShoppingListResponse.model_validate(list_response),
-      })
-    else:
-      new_shopping_list = ShoppingList(
-        item_id=item_id,
-        quantity=1,
-        checked=False,
-        user_id=current_user.id
-      )
-      list_response = create_shopping_list(new_shopping_list, db)
-      return success({
-        "stock": StockResponse.model_validate(stock_response),
-        "history": StockHistoryResponse.model_validate(history_response),
-        "shopping_list": ShoppingListResponse.model_validate(list_response),
-      })
-  else:
-    return success({
-      "stock": StockResponse.model_validate(stock_response),
-      "history": StockHistoryResponse.model_validate(history_response),
-    })
+      response["shopping_list"] = ShoppingListResponse.model_validate(shopping_list)
+    return success(response)
+  except Exception:
+    db.rollback()
+    return error("db_error", 500)
 
-def get_stock_history_by_item_id_api(item_id: int, db: Session):
-  stock_history = __private_stock_history_check(item_id, db)
+def get_stock_history_by_item_id_api(item_id: int, page: PageParams | None, db: Session):
+  stock_history = __private_stock_history_check(item_id, page, db)
   
   if isinstance(stock_history, JSONResponse):
     return stock_history
   
-  response = [StockHistoryResponse.model_validate(c) for c in stock_history]
-  return success(response)
+  stock_history, next_cursor = split_page(stock_history, STOCK_HISTORY_PAGE_KEYS, page)
+  response = validate_rows(StockHistoryResponse, stock_history)
+  return success(response, next_cursor)
+
+def get_price_history_api(item_id: int, window: int, db: Session, current_user: User):
+  return cached(current_user.id, "price_history", (item_id, window), lambda: __private_get_price_history(item_id, window, db, current_user))
+
+def export_stock_history_api(item_id: int, format: ExportFormat, db: Session, current_user: User):
+  item = __private_item_check(item_id, db)
+
+  if isinstance(item, JSONResponse):
+    return item
+
+  rows = stream_stock_history(item_id, current_user.id, db)
+  return export_response(export_chunks(rows, STOCK_HISTORY_EXPORT_COLUMNS, format), format, f"stock_history_{item_id}")
   
 # private
 
-def __private_item_check(item_id: int, db: Session):
-  item = get_items_by_id(item_id, db)
+def __private_get_items(category_id: int, is_favorite: bool, include: str | None, page: PageParams | None, db: Session, current_user: User):
+  include, unknown = parse_csv_param(include, ITEM_INCLUDES)
+  if unknown:
+    return error(f"Unknown include: {', '.join(unknown)}", 400)
+
+  # include なしなら Core の行をそのまま ItemResponse にする（関連の eager load が要るときだけ ORM）
+  if not include:
+    items, next_cursor = split_page(get_item_rows(current_user.id, category_id, is_favorite, db, page), ITEM_PAGE_KEYS, page)
+    return success(validate_rows(ItemResponse, items), next_cursor)
+
+  items = get_items(current_user.id, category_id, is_favorite, db, include, page)
+  items, next_cursor = split_page(items, ITEM_PAGE_KEYS, page)
+  response = [item_response(c, include) for c in items]
+  return success(response, next_cursor)
+
+def __private_get_price_history(item_id: int, window: int, db: Session, current_user: User):
+  item = __private_item_check(item_id, db)
+
+  if isinstance(item, JSONResponse):
+    return item
+
+  rows = get_price_history(current_user.id, item_id, window, db)
+  return success(price_history_response(item, rows))
+
+def __private_item_check(item_id: int, db: Session, include: tuple[str, ...] = ()):
+  item = get_items_by_id(item_id, db, include)
   
   if not item:
     return error("Item not found", 404)
@@ -190,10 +249,11 @@ def __private_stock_check(item_id: int, db: Session):
   else:
     return stock
 
-def __private_stock_history_check(item_id: int, db: Session):
-  stock_history = get_stock_history_by_item_id(item_id, db)
+def __private_stock_history_check(item_id: int, page: PageParams | None, db: Session):
+  stock_history = get_stock_history_by_item_id(item_id, db, page)
   
-  if not stock_history:
+  # 2 ページ目以降が空なのは正常
+  if not stock_history and not (page and page.after):
     return error("StockHistory not found", 404)
   else:
     return stock_history
@@ -1,15 +1,19 @@
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from app.core.response_cache import mark_user_changed
 from app.models.memo import Memo
 from app.models.user import User
-from app.repositories.memos_repo import create_memo, delete_memo, get_memo_by_id, get_memos, update_memo
+from app.repositories.memos_repo import MEMO_PAGE_KEYS, create_memo, delete_memo, get_memo_by_id, get_memos, update_memo
 from app.schemas.memo import CreateMemoRequest, MemoResponse
+from app.utils.pagination import PageParams, split_page
 from app.utils.response import error, success
+from app.utils.rows import validate_rows
 
-def get_memos_api(db: Session, current_user: User):
-  memos = get_memos(current_user.id, db)
-  response = [MemoResponse.model_validate(c) for c in memos]
-  return success(response)
+def get_memos_api(page: PageParams | None, db: Session, current_user: User):
+  memos = get_memos(current_user.id, db, page)
+  memos, next_cursor = split_page(memos, MEMO_PAGE_KEYS, page)
+  response = validate_rows(MemoResponse, memos)
+  return success(response, next_cursor)
 
 def get_memo_api(memo_id: int, db: Session):
   memo = __private_memo_check(memo_id, db)
@@ -31,6 +35,7 @@ def create_memo_api(request: CreateMemoRequest, db: Session, current_user: User)
 
   try:
     create_memo(new_memo, db)
+    mark_user_changed(db, new_memo.user_id)
     return success(MemoResponse.model_validate(new_memo))
   except Exception:
     db.rollback()
@@ -53,6 +58,7 @@ def update_memo_api(memo_id: int, request: CreateMemoRequest, db: Session):
     
   try:
     response = update_memo(memo, db)
+    mark_user_changed(db, memo.user_id)
     return success(MemoResponse.model_validate(response))
   except Exception:
     db.rollback()
@@ -66,6 +72,7 @@ def delete_memo_api(memo_id: int, db: Session):
   
   try:
     delete_memo(memo, db)
+    mark_user_changed(db, memo.user_id)
     return success(MemoResponse.model_validate(memo))
   except Exception:
     db.rollback()
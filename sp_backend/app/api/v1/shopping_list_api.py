@@ -1,15 +1,25 @@
+from datetime import datetime, timedelta
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from app.core.response_cache import mark_user_changed
 from app.models.shopping_list import ShoppingList
 from app.models.user import User
-from app.repositories.shopping_list_repo import create_shopping_list, delete_shopping_list, get_shopping_list_by_id, get_shopping_list_by_item, get_shopping_lists, update_shopping_list
+from app.repositories.shopping_list_repo import SHOPPING_LIST_PAGE_KEYS, create_shopping_list, delete_shopping_list, get_shopping_list_by_id, get_shopping_list_by_item, get_shopping_lists, update_shopping_list
+from app.repositories.store_prices_repo import get_store_recommendation
 from app.schemas.shopping_list import ShoppingListCheckRequest, ShoppingListRequest, ShoppingListResponse
-from app.utils.response import error, success
+from app.schemas.store_price import StoreBasketResponse, StoreOfferResponse, StoreRecommendationItemResponse, StoreRecommendationResponse
+from app.utils.pagination import PageParams, split_page
+from app.utils.response import cached, error, success
+from app.utils.rows import validate_rows
 
-def get_shopping_lists_api(db: Session, current_user: User):
-  shopping_lists = get_shopping_lists(current_user.id, db)
-  response = [ShoppingListResponse.model_validate(c) for c in shopping_lists]
-  return success(response)
+def get_shopping_lists_api(page: PageParams | None, db: Session, current_user: User):
+  shopping_lists = get_shopping_lists(current_user.id, db, page)
+  shopping_lists, next_cursor = split_page(shopping_lists, SHOPPING_LIST_PAGE_KEYS, page)
+  response = validate_rows(ShoppingListResponse, shopping_lists)
+  return success(response, next_cursor)
+
+def get_store_recommendation_api(recent_days: int | None, db: Session, current_user: User):
+  return cached(current_user.id, "store_recommendation", recent_days, lambda: __private_get_store_recommendation(recent_days, db, current_user))
 
 def get_shopping_list_api(shopping_list_id: int, db: Session):
   shopping_list = __private_shopping_list_check(shopping_list_id, db)
@@ -31,10 +41,12 @@ def create_shopping_list_api(request: ShoppingListRequest, db: Session, current_
   if existing:
     existing.quantity += request.quantity
     response = update_shopping_list(existing, db)
+    mark_user_changed(db, existing.user_id)
     return success(ShoppingListResponse.model_validate(response))
   
   try:
     create_shopping_list(new_shopping_list, db)
+    mark_user_changed(db, new_shopping_list.user_id)
     return success(ShoppingListResponse.model_validate(new_shopping_list))
   except Exception:
     db.rollback()
@@ -50,6 +62,7 @@ def update_shopping_list_api(shopping_list_id: int, request: ShoppingListCheckRe
   
   try:
     response = update_shopping_list(shopping_list, db)
+    mark_user_changed(db, shopping_list.user_id)
     return success(ShoppingListResponse.model_validate(response))
   except Exception:
     db.rollback()
@@ -63,13 +76,56 @@ def delete_shopping_list_api(shopping_list_id: int, db: Session):
   
   try:
     delete_shopping_list(shopping_list, db)
+    mark_user_changed(db, shopping_list.user_id)
     return success(ShoppingListResponse.model_validate(shopping_list))
   except Exception:
     db.rollback()
     return error("db_error", 500)
   
+# store_recommendation_query の行をアイテムごと・店舗ごとにまとめる（集計は SQL 側で済んでいる）
+def store_recommendation_response(rows) -> StoreRecommendationResponse:
+  items = {}
+  stores = {}
+  for row in rows:
+    item = items.setdefault(row.shopping_list_id, StoreRecommendationItemResponse(
+      shopping_list_id=row.shopping_list_id,
+      item_id=row.item_id,
+      name=row.name,
+      quantity=row.quantity,
+      store_count=0,
+    ))
+    if row.store is None:
+      continue
+    item.store_count += 1
+    if row.item_rank == 1:
+      item.cheapest = StoreOfferResponse(
+        store=row.store,
+        unit_price=row.recent_unit_price,
+        purchase_count=row.purchase_count,
+        last_bought_at=row.last_bought_at,
+      )
+    stores.setdefault(row.store, (row.basket_total, row.basket_items))
+
+  baskets = [
+    StoreBasketResponse(store=store, basket_total=total, item_count=count, missing_item_count=len(items) - count)
+    for store, (total, count) in stores.items()
+  ]
+  # 揃うアイテムが多い店舗、その中で安い店舗から
+  baskets.sort(key=lambda b: (b.missing_item_count, b.basket_total, b.store))
+  return StoreRecommendationResponse(items=list(items.values()), stores=baskets)
+
+# recent_days 日以内に買った記録のある店舗だけを候補にする
+def recommendation_since(recent_days: int | None) -> datetime | None:
+  if recent_days is None:
+    return None
+  return datetime.utcnow() - timedelta(days=recent_days)
+
 # private
 
+def __private_get_store_recommendation(recent_days: int | None, db: Session, current_user: User):
+  rows = get_store_recommendation(current_user.id, recommendation_since(recent_days), db)
+  return success(store_recommendation_response(rows))
+
 def __private_shopping_list_check(shopping_list_id: int, db: Session):
   shopping_list = get_shopping_list_by_id(shopping_list_id, db)
   
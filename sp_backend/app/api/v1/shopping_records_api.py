@@ -1,19 +1,29 @@
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from app.api.v1.items_api import update_stock_api
+from app.core.response_cache import mark_user_changed
 from app.models.shopping_record import ShoppingRecord
 from app.models.user import User
 from app.repositories.shopping_list_repo import delete_shopping_list, get_shopping_list_by_item
-from app.repositories.shopping_records_repo import create_shopping_record, delete_shopping_record, get_monthly_spending, get_shopping_record_by_id, get_shopping_records, get_spending_by_category, get_spending_by_item, update_shopping_record
+from app.repositories.shopping_records_repo import SHOPPING_RECORD_EXPORT_COLUMNS, SHOPPING_RECORD_PAGE_KEYS, create_shopping_record, delete_shopping_record, get_monthly_spending, get_shopping_record_by_id, get_shopping_records, get_spending_by_category, get_spending_by_item, record_snapshot, stream_shopping_records, update_shopping_record
 from app.repositories.stocks_repo import get_stock_by_item_id
 from app.schemas.shopping_record import ShoppingRecordRequest, ShoppingRecordResponse, ShoppingRecordUpdateRequest
 from app.schemas.stock import StockRequest
-from app.utils.response import error, success
+from app.utils.export import ExportFormat, export_chunks, export_response
+from app.utils.pagination import PageParams, split_page
+from app.utils.period import SummaryPeriod
+from app.utils.response import error, row_data, success
+from app.utils.rows import validate_rows
 
-def get_shopping_records_api(db: Session, current_user: User):
-  shopping_records = get_shopping_records(current_user.id, db)
-  response = [ShoppingRecordResponse.model_validate(c) for c in shopping_records]
-  return success(response)
+def get_shopping_records_api(page: PageParams | None, db: Session, current_user: User):
+  shopping_records = get_shopping_records(current_user.id, db, page)
+  shopping_records, next_cursor = split_page(shopping_records, SHOPPING_RECORD_PAGE_KEYS, page)
+  response = validate_rows(ShoppingRecordResponse, shopping_records)
+  return success(response, next_cursor)
+
+def export_shopping_records_api(format: ExportFormat, period: SummaryPeriod, db: Session, current_user: User):
+  rows = stream_shopping_records(current_user.id, db, period)
+  return export_response(export_chunks(rows, SHOPPING_RECORD_EXPORT_COLUMNS, format), format, "shopping_records")
 
 def get_shopping_record_api(shopping_record_id: int, db: Session):
   shopping_record = __private_shopping_record_check(shopping_record_id, db)
@@ -47,7 +57,11 @@ def create_shopping_record_api(request: ShoppingRecordRequest, db: Session, curr
 
   try:
     create_shopping_record(new_shopping_record, db)
-    update_stock_api(request.item_id, update_stock, db, current_user)
+    mark_user_changed(db, new_shopping_record.user_id)
+    stock_response = update_stock_api(request.item_id, update_stock, db, current_user)
+    if __private_is_error(stock_response):
+      db.rollback()
+      return stock_response
     if shopping_list:
       delete_shopping_list(shopping_list, db)
     return success(ShoppingRecordResponse.model_validate(new_shopping_record))
@@ -61,6 +75,7 @@ def update_shopping_record_api(shopping_record_id: int, request: ShoppingRecordU
   if isinstance(shopping_record, JSONResponse):
     return shopping_record
 
+  previous = record_snapshot(shopping_record)
   if request.item_id:
     shopping_record.item_id = request.item_id
   if request.quantity:
@@ -83,8 +98,12 @@ def update_shopping_record_api(shopping_record_id: int, request: ShoppingRecordU
   )
     
   try:
-    response = update_shopping_record(shopping_record, db)
-    update_stock_api(request.item_id, update_stock, db, current_user)
+    response = update_shopping_record(shopping_record, previous, db)
+    mark_user_changed(db, shopping_record.user_id)
+    stock_response = update_stock_api(request.item_id, update_stock, db, current_user)
+    if __private_is_error(stock_response):
+      db.rollback()
+      return stock_response
     return success(ShoppingRecordResponse.model_validate(response))
   except Exception:
     db.rollback()
@@ -98,31 +117,32 @@ def delete_shopping_record_api(shopping_record_id: int, db: Session):
   
   try:
     delete_shopping_record(shopping_record, db)
+    mark_user_changed(db, shopping_record.user_id)
     return success(ShoppingRecordResponse.model_validate(shopping_record))
   except Exception:
     db.rollback()
     return error("db_error", 500)
 
-def get_monthly_spending_api(db: Session, current_user: User):
+def get_monthly_spending_api(period: SummaryPeriod, db: Session, current_user: User):
   try:
-    data = get_monthly_spending(current_user.id, db)
-    return success([dict(row._mapping) for row in data])
+    data = get_monthly_spending(current_user.id, db, period)
+    return success(row_data(data))
   except Exception:
     db.rollback()
     return error("db_error", 500)
 
-def get_spending_by_item_api(db: Session, current_user: User):
+def get_spending_by_item_api(period: SummaryPeriod, db: Session, current_user: User):
   try:
-    data = get_spending_by_item(current_user.id, db)
-    return success([dict(row._mapping) for row in data])
+    data = get_spending_by_item(current_user.id, db, period)
+    return success(row_data(data))
   except Exception:
     db.rollback()
     return error("db_error", 500)
 
-def get_spending_by_category_api(db: Session, current_user: User):
+def get_spending_by_category_api(period: SummaryPeriod, db: Session, current_user: User):
   try:
-    data = get_spending_by_category(current_user.id, db)
-    return success([dict(row._mapping) for row in data])
+    data = get_spending_by_category(current_user.id, db, period)
+    return success(row_data(data))
   except Exception:
     db.rollback()
     return error("db_error", 500)
@@ -135,4 +155,7 @@ def __private_shopping_record_check(shopping_record_id: int, db: Session):
   if not shopping_record:
     return error("ShoppingRecord not found", 404)
   else:
-    return shopping_record
\ No newline at end of file
+    return shopping_record
+
+def __private_is_error(response):
+  return isinstance(response, JSONResponse) and response.status_code >= 400
@@ -1,14 +1,23 @@
+import math
+import time
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
+from app.core.forecast import Forecast, forecast_consumption
+from app.core.response_cache import mark_user_changed
 from app.models.stock import Stock
 from app.models.user import User
-from app.repositories.stocks_repo import create_stock, get_stocks
-from app.schemas.stock import StockOnlyRequest, StockResponse
-from app.utils.response import error, success
+from app.repositories.forecast_repo import get_consumption_history, get_stock_levels
+from app.repositories.stocks_repo import STOCK_PAGE_KEYS, create_stock, get_stocks
+from app.schemas.stock import StockForecastResponse, StockOnlyRequest, StockResponse
+from app.utils.pagination import PageParams, split_page
+from app.utils.response import cached, error, success
+from app.utils.rows import validate_rows
 
-def get_stocks_api(db: Session, current_user: User):
-  stocks = get_stocks(current_user.id, db)
-  response = [StockResponse.model_validate(c) for c in stocks]
-  return success(response)
+def get_stocks_api(page: PageParams | None, db: Session, current_user: User):
+  return cached(current_user.id, "stocks", page, lambda: __private_get_stocks(page, db, current_user))
+
+def get_stock_forecast_api(db: Session, current_user: User):
+  return cached(current_user.id, "stock_forecast", None, lambda: __private_get_stock_forecast(db, current_user))
 
 def create_stock_api(request: StockOnlyRequest, db: Session, current_user: User):
   new_stock = Stock(
@@ -21,7 +30,42 @@ def create_stock_api(request: StockOnlyRequest, db: Session, current_user: User)
   
   try:
     create_stock(new_stock, db)
+    mark_user_changed(db, new_stock.user_id)
     return success(StockResponse.model_validate(new_stock))
   except Exception:
     db.rollback()
-    return error("db_error", 500)
\ No newline at end of file
+    return error("db_error", 500)
+
+def forecast_response(forecast: Forecast) -> list[StockForecastResponse]:
+  columns = zip(
+    forecast.item_ids.tolist(),
+    forecast.quantities.tolist(),
+    forecast.rates.tolist(),
+    forecast.days_of_supply.tolist(),
+    forecast.run_out_at.tolist(),
+    forecast.samples.tolist(),
+  )
+  return [
+    StockForecastResponse(
+      item_id=item_id,
+      quantity=quantity,
+      rate_per_day=None if math.isnan(rate) else round(rate, 4),
+      days_of_supply=None if math.isnan(days) else round(days, 2),
+      run_out_at=None if math.isnan(run_out_at) else datetime.fromtimestamp(run_out_at, timezone.utc),
+      samples=samples,
+    )
+    for item_id, quantity, rate, days, run_out_at, samples in columns
+  ]
+
+# private
+
+def __private_get_stock_forecast(db: Session, current_user: User):
+  history = get_consumption_history(current_user.id, db)
+  stocks = get_stock_levels(current_user.id, db)
+  return success(forecast_response(forecast_consumption(history, stocks, time.time())))
+
+def __private_get_stocks(page: PageParams | None, db: Session, current_user: User):
+  stocks = get_stocks(current_user.id, db, page)
+  stocks, next_cursor = split_page(stocks, STOCK_PAGE_KEYS, page)
+  response = validate_rows(StockResponse, stocks)
+  return success(response, next_cursor)
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+import zlib
+from fastapi import Request
+
+try:
+  import brotli
+except ImportError:
+  brotli = None
+
+# レスポンス圧縮（Accept-Encoding で br / gzip を選ぶ）
+# - 本文が一括のレスポンスは COMPRESSION_MINIMUM_SIZE 未満なら圧縮しない
+# - ストリーミング（エクスポートなど）はチャンクごとに圧縮して flush し、そのまま流す
+# - Depends(skip_compression) を付けたルートは圧縮しない
+# - Content-Encoding が付いている（すでに圧縮済みの）レスポンスはそのまま流す
+# ルートごとの圧縮前後のバイト数と圧縮にかかった CPU 時間を compression_stats に集計する
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# 動的なレスポンス向けに低め（11 は静的ファイル向け）
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class CompressionStats:
+  def __init__(self):
+    self._routes: dict[str, dict] = {}
+    self._lock = threading.Lock()
+
+  # bytes_in / bytes_out / cpu_seconds は圧縮したレスポンスだけの合計。圧縮しなかった分は uncompressed_bytes
+  def record(self, route: str, encoding: str | None, bytes_in: int, bytes_out: int, cpu_seconds: float):
+    with self._lock:
+      stats = self._routes.setdefault(route, {"responses": 0, "compressed": 0, "bytes_in": 0, "bytes_out": 0, "uncompressed_bytes": 0, "cpu_seconds": 0.0, "encodings": {}})
+      stats["responses"] += 1
+      if encoding is None:
+        stats["uncompressed_bytes"] += bytes_out
+        return
+      stats["compressed"] += 1
+      stats["bytes_in"] += bytes_in
+      stats["bytes_out"] += bytes_out
+      stats["cpu_seconds"] += cpu_seconds
+      stats["encodings"][encoding] = stats["encodings"].get(encoding, 0) + 1
+
+  def stats(self) -> dict:
+    with self._lock:
+      routes = {route: {**stats, "encodings": dict(stats["encodings"])} for route, stats in self._routes.items()}
+    for stats in routes.values():
+      # 圧縮後 / 圧縮前（小さいほどよく縮んでいる）
+      stats["ratio"] = round(stats["bytes_out"] / stats["bytes_in"], 4) if stats["bytes_in"] else None
+      stats["cpu_seconds"] = round(stats["cpu_seconds"], 6)
+    return routes
+
+  def clear(self):
+    with self._lock:
+      self._routes.clear()
+
+
+compression_stats = CompressionStats()
+
+# ルート単位のオプトアウト（dependencies=[Depends(skip_compression)]）
+def skip_compression(request: Request):
+  request.state.skip_compression = True
+
+# Accept-Encoding から使うエンコーディングを選ぶ。q が同じなら br を優先
+def negotiate_encoding(accept_encoding: str) -> str | None:
+  available = ("br", "gzip") if brotli is not None else ("gzip",)
+  weights = {}
+  for part in accept_encoding.split(","):
+    name, _, params = part.strip().partition(";")
+    name = name.strip().lower()
+    q = 1.0
+    for param in params.split(";"):
+      key, _, value = param.strip().partition("=")
+      if key == "q":
+        try:
+          q = float(value)
+        except ValueError:
+          q = 0.0
+    weights[name] = q
+  best = None
+  for encoding in available:
+    q = weights.get(encoding, weights.get("*", 0.0))
+    if q > 0 and (best is None or q > best[1]):
+      best = (encoding, q)
+  return best[0] if best else None
+
+
+# "GET /api/v1/items/{item_id}" の形。route.path には include_router の prefix が入らないので、
+# 実際のパスとの差分から補う
+def route_key(scope) -> str:
+  route = scope.get("route")
+  template = getattr(route, "path_format", None)
+  if template is None:
+    return f"{scope['method']} unmatched"
+  path = scope["path"]
+  try:
+    concrete = template.format(**scope.get("path_params", {}))
+  except (KeyError, IndexError, ValueError):
+    concrete = None
+  if concrete and path.endswith(concrete):
+    template = path[:len(path) - len(concrete)] + template
+  return f"{scope['method']} {template}"
+
+
+class CompressionMiddleware:
+  def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE, stats: CompressionStats = compression_stats):
+    self.app = app
+    self.minimum_size = minimum_size
+    self.stats = stats
+
+  async def __call__(self, scope, receive, send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    headers = dict(scope["headers"])
+    encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+    responder = CompressionResponder(scope, send, encoding, self.minimum_size, self.stats)
+    await self.app(scope, receive, responder.send)
+
+# 1 レスポンス分の send をラップして圧縮する
+class CompressionResponder:
+  def __init__(self, scope, send, encoding: str | None, minimum_size: int, stats: CompressionStats):
+    self.scope = scope
+    self.downstream = send
+    self.encoding = encoding
+    self.minimum_size = minimum_size
+    self.stats = stats
+    self.start = None
+    self.compressor = None
+    self.bytes_in = 0
+    self.bytes_out = 0
+    self.cpu_seconds = 0.0
+
+  async def send(self, message):
+    if message["type"] == "http.response.start":
+      # 本文の最初のチャンクを見るまで送らない（一括かストリーミングかで扱いが変わる）
+      self.start = message
+      return
+    if message["type"] != "http.response.body":
+      await self.downstream(message)
+      return
+
+    body = message.get("body", b"")
+    more_body = message.get("more_body", False)
+    if self.start is not None:
+      start, self.start = self.start, None
+      await self.__begin(start, body, more_body)
+      return
+
+    self.bytes_in += len(body)
+    if self.compressor is not None:
+      body = self.__compress(body, finish=not more_body)
+    self.bytes_out += len(body)
+    await self.downstream({"type": "http.response.body", "body": body, "more_body": more_body})
+    if not more_body:
+      self.__record()
+
+  async def __begin(self, start, body: bytes, more_body: bool):
+    headers = [(k.lower(), v) for k, v in start.get("headers", [])]
+    content_type = next((v.decode("latin-1") for k, v in headers if k == b"content-type"), "")
+    compressible = content_type.startswith(COMPRESSIBLE_TYPES) and not any(k == b"content-encoding" for k, _ in headers)
+    if compressible:
+      headers = self.__add_vary(headers)
+
+    skip = (
+      not compressible
+      or self.encoding is None
+      or self.scope.get("state", {}).get("skip_compression")
+      or (not more_body and len(body) < self.minimum_size)
+    )
+    self.bytes_in += len(body)
+    if not skip:
+      self.compressor = self.__compressor()
+      body = self.__compress(body, finish=not more_body)
+      headers = [(k, v) for k, v in headers if k != b"content-length"]
+      headers.append((b"content-encoding", self.encoding.encode()))
+      if not more_body:
+        headers.append((b"content-length", str(len(body)).encode()))
+    self.bytes_out += len(body)
+
+    await self.downstream({**start, "headers": headers})
+    await self.downstream({"type": "http.response.body", "body": body, "more_body": more_body})
+    if not more_body:
+      self.__record()
+
+  def __compress(self, body: bytes, finish: bool) -> bytes:
+    started = time.thread_time()
+    if self.encoding == "br":
+      out = self.compressor.process(body) + (self.compressor.finish() if finish else self.compressor.flush())
+    else:
+      out = self.compressor.compress(body) + self.compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+    self.cpu_seconds += time.thread_time() - started
+    return out
+
+  def __record(self):
+    encoding = self.encoding if self.compressor is not None else None
+    self.stats.record(route_key(self.scope), encoding, self.bytes_in, self.bytes_out, self.cpu_seconds)
+
+  def __compressor(self):
+    if self.encoding == "br":
+      return brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+    # wbits=31 で gzip ヘッダー付き
+    return zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+  def __add_vary(self, headers: list) -> list:
+    for i, (k, v) in enumerate(headers):
+      if k == b"vary":
+        if b"accept-encoding" not in v.lower():
+          headers[i] = (k, v + b", Accept-Encoding")
+        return headers
+    return headers + [(b"vary", b"Accept-Encoding")]
@@ -0,0 +1,94 @@
+import os
+from typing import NamedTuple
+import numpy as np
+
+# 在庫履歴（減った記録）から消費ペースを推定し、在庫が尽きる日を予測する
+# 全アイテム分をまとめて配列で計算する（アイテムごとのループやクエリはしない）
+
+SECONDS_PER_DAY = 86400.0
+# 消費ペースの半減期（日）。古い消費ほど重みが指数的に下がる
+FORECAST_HALF_LIFE_DAYS = float(os.getenv("FORECAST_HALF_LIFE_DAYS", "30"))
+# 買い物リストへの自動追加の判定方法
+# threshold: 在庫 < しきい値（従来どおり） / forecast: 予測の残り日数 <= RESTOCK_LEAD_DAYS（予測できないアイテムは threshold）
+RESTOCK_POLICY = os.getenv("RESTOCK_POLICY", "threshold")
+RESTOCK_LEAD_DAYS = float(os.getenv("RESTOCK_LEAD_DAYS", "3"))
+
+class Forecast(NamedTuple):
+  item_ids: np.ndarray
+  quantities: np.ndarray
+  # 1 日あたりの消費量。履歴が足りないアイテムは nan
+  rates: np.ndarray
+  days_of_supply: np.ndarray
+  # 在庫が尽きる予測時刻（epoch 秒）
+  run_out_at: np.ndarray
+  # 推定に使った消費の間隔の数
+  samples: np.ndarray
+
+# history: (item_id, epoch 秒, 消費量) の行を item_id, 時刻の順に並べたもの
+# stocks: (item_id, 在庫数) の行
+def forecast_consumption(history: np.ndarray, stocks: np.ndarray, now: float, half_life_days: float = FORECAST_HALF_LIFE_DAYS) -> Forecast:
+  history = np.asarray(history, dtype=np.float64).reshape(-1, 3)
+  stocks = np.asarray(stocks, dtype=np.float64).reshape(-1, 2)
+  stock_item_ids = stocks[:, 0].astype(np.int64)
+  quantities = np.maximum(stocks[:, 1], 0)
+
+  rates, samples = __private_consumption_rates(history, stock_item_ids, now, half_life_days)
+  days = np.divide(quantities, rates, out=np.full_like(rates, np.nan), where=rates > 0)
+  return Forecast(
+    item_ids=stock_item_ids,
+    quantities=quantities,
+    rates=rates,
+    days_of_supply=days,
+    run_out_at=now + days * SECONDS_PER_DAY,
+    samples=samples,
+  )
+
+# 1 アイテム分の残り日数（update_stock_api の自動追加用）。予測できなければ None
+def forecast_days_of_supply(history: np.ndarray, item_id: int, quantity, now: float) -> float | None:
+  days = forecast_consumption(history, [(item_id, quantity)], now).days_of_supply[0]
+  return None if np.isnan(days) else float(days)
+
+def needs_restock(quantity, threshold, days_of_supply: float | None) -> bool:
+  if days_of_supply is not None:
+    return days_of_supply <= RESTOCK_LEAD_DAYS
+  return quantity < threshold
+
+# private
+
+# 連続する消費の間隔ごとに「消費量 / 経過時間」を取り、間隔の終わりの時刻で指数的に重み付けする
+# rate = Σ w·消費量 / Σ w·経過時間。最後の消費から now までの（消費のない）期間も分母に入れる
+def __private_consumption_rates(history: np.ndarray, item_ids: np.ndarray, now: float, half_life_days: float):
+  rates = np.full(len(item_ids), np.nan)
+  samples = np.zeros(len(item_ids), dtype=np.int64)
+  if len(history) == 0 or len(item_ids) == 0:
+    return rates, samples
+
+  ids = history[:, 0].astype(np.int64)
+  # 以降は日単位で計算する
+  times = history[:, 1] / SECONDS_PER_DAY
+  now = now / SECONDS_PER_DAY
+  amounts = history[:, 2]
+  groups, group_index = np.unique(ids, return_inverse=True)
+
+  starts = np.ones(len(ids), dtype=bool)
+  starts[1:] = ids[1:] != ids[:-1]
+  intervals = np.diff(times, prepend=times[0])
+  weights = np.exp(-np.log(2) * (now - times) / half_life_days)
+
+  # 各アイテムの最初の記録は間隔が取れないので除く
+  valid = ~starts
+  consumed = np.bincount(group_index[valid], weights=(weights * amounts)[valid], minlength=len(groups)).astype(np.float64)
+  elapsed = np.bincount(group_index[valid], weights=(weights * intervals)[valid], minlength=len(groups)).astype(np.float64)
+  counts = np.bincount(group_index[valid], minlength=len(groups))
+  last = np.append(np.flatnonzero(starts)[1:] - 1, len(ids) - 1)
+  elapsed += np.maximum(now - times[last], 0)
+
+  group_rates = np.divide(consumed, elapsed, out=np.full(len(groups), np.nan), where=(counts > 0) & (elapsed > 0))
+
+  # 在庫のアイテムに対応付ける
+  position = np.clip(np.searchsorted(groups, item_ids), 0, len(groups) - 1)
+  found = groups[position] == item_ids
+  rates[found] = group_rates[position[found]]
+  samples[found] = counts[position[found]]
+  return rates, samples
+
@@ -0,0 +1,279 @@
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+import anyio.to_thread
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.compression import compression_stats
+from app.core.response_cache import response_cache
+from app.core.token_cache import token_cache
+
+# /metrics（Prometheus のテキスト形式）用のプロセス内メトリクス
+# 記録側はスレッドごとの dict に足すだけでロックを取らない。スクレイプ時に全スレッド分を合計する
+# （イベントループのスレッドとスレッドプールの各スレッドがそれぞれ自分の dict に書く）
+# プール・スレッドプール・キャッシュのようにその時点の値を読むものは callback で登録しておき、スクレイプ時に読む
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+# スレッドごとのシャードに足し込む値の集まり（キー -> 数値）
+# anyio のワーカースレッドはしばらく空くと終わり、負荷が来るたびに新しいスレッドができる
+# 終わったスレッドのシャードは retired に畳んで外す（シャードの数はその時点で生きているスレッドの数まで）
+class ShardedValues:
+  def __init__(self):
+    self._local = threading.local()
+    self._shards: list[dict] = []
+    self._retired: dict = {}
+    # シャードを増やす・畳むときだけ取る
+    self._lock = threading.Lock()
+
+  def add(self, key, value: float):
+    shard = getattr(self._local, "shard", None)
+    if shard is None:
+      shard = self.__new_shard()
+    shard[key] = shard.get(key, 0) + value
+
+  def totals(self) -> dict:
+    with self._lock:
+      shards = list(self._shards)
+      totals = dict(self._retired)
+    for shard in shards:
+      # dict.copy() は GIL の下で一度に行われるので、書き込み中のシャードでも壊れない
+      for key, value in shard.copy().items():
+        totals[key] = totals.get(key, 0) + value
+    return totals
+
+  def __new_shard(self) -> dict:
+    shard = {}
+    # スレッドが終わると threading.local の値が消え、owner の finalize でシャードを畳む
+    owner = ShardOwner()
+    self._local.owner = owner
+    self._local.shard = shard
+    with self._lock:
+      self._shards.append(shard)
+    weakref.finalize(owner, self.__retire, shard)
+    return shard
+
+  def __retire(self, shard: dict):
+    with self._lock:
+      self._shards = [s for s in self._shards if s is not shard]
+      for key, value in shard.items():
+        self._retired[key] = self._retired.get(key, 0) + value
+
+
+# シャードの持ち主のスレッドが終わったことを知るための目印（object() は弱参照できない）
+class ShardOwner:
+  pass
+
+
+class Counter:
+  type = "counter"
+
+  def __init__(self, name: str, help: str, labelnames: tuple = ()):
+    self.name = name
+    self.help = help
+    self.labelnames = labelnames
+    self._values = ShardedValues()
+
+  def inc(self, labels: tuple = (), value: float = 1):
+    self._values.add(labels, value)
+
+  def samples(self):
+    for labels, value in sorted(self._values.totals().items()):
+      yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+  type = "histogram"
+
+  def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+    self.name = name
+    self.help = help
+    self.labelnames = labelnames
+    self.buckets = buckets
+    self._values = ShardedValues()
+
+  # バケットは値が入る最初のバケット（le 以下）の位置だけ数え、累積はスクレイプ時に出す
+  def observe(self, seconds: float, labels: tuple = ()):
+    self._values.add((labels, bisect_left(self.buckets, seconds)), 1)
+    self._values.add((labels, "sum"), seconds)
+
+  @contextmanager
+  def time(self, labels: tuple = ()):
+    started = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.observe(time.perf_counter() - started, labels)
+
+  def samples(self):
+    series: dict[tuple, dict] = {}
+    for (labels, slot), value in self._values.totals().items():
+      series.setdefault(labels, {})[slot] = value
+    for labels in sorted(series):
+      values = series[labels]
+      base = dict(zip(self.labelnames, labels))
+      count = 0
+      for i, bound in enumerate(self.buckets):
+        count += values.get(i, 0)
+        yield f"{self.name}_bucket", {**base, "le": repr(float(bound))}, count
+      count += values.get(len(self.buckets), 0)
+      yield f"{self.name}_bucket", {**base, "le": "+Inf"}, count
+      yield f"{self.name}_sum", base, values.get("sum", 0.0)
+      yield f"{self.name}_count", base, count
+
+
+# スクレイプ時に collect() を呼んで (labels, value) を読む
+class CallbackMetric:
+  def __init__(self, name: str, help: str, type: str, labelnames: tuple, collect):
+    self.name = name
+    self.help = help
+    self.type = type
+    self.labelnames = labelnames
+    self.collect = collect
+
+  def samples(self):
+    for labels, value in self.collect():
+      yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class MetricsRegistry:
+  def __init__(self):
+    self._metrics = []
+
+  def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+    return self.__register(Counter(name, help, labelnames))
+
+  def histogram(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+    return self.__register(Histogram(name, help, labelnames, buckets))
+
+  def callback(self, name: str, help: str, type: str, labelnames: tuple, collect) -> CallbackMetric:
+    return self.__register(CallbackMetric(name, help, type, labelnames, collect))
+
+  def render(self) -> str:
+    lines = []
+    for metric in self._metrics:
+      lines.append(f"# HELP {metric.name} {metric.help}")
+      lines.append(f"# TYPE {metric.name} {metric.type}")
+      for name, labels, value in metric.samples():
+        lines.append(f"{name}{self.__labels(labels)} {self.__value(value)}")
+    return "\n".join(lines) + "\n"
+
+  def __register(self, metric):
+    self._metrics.append(metric)
+    return metric
+
+  def __labels(self, labels: dict) -> str:
+    if not labels:
+      return ""
+    escaped = (f'{key}="{self.__escape(str(value))}"' for key, value in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+  def __escape(self, value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+  def __value(self, value) -> str:
+    if isinstance(value, float):
+      return repr(value)
+    return str(value)
+
+
+metrics_registry = MetricsRegistry()
+
+http_request_duration = metrics_registry.histogram(
+  "http_request_duration_seconds", "Request latency (until the last body chunk is sent).", ("method", "route"),
+)
+http_responses = metrics_registry.counter(
+  "http_responses_total", "Responses by route and status code.", ("method", "route", "status"),
+)
+http_db_statements = metrics_registry.counter(
+  "http_db_statements_total", "SQL statements executed while handling requests.", ("method", "route"),
+)
+http_query_budget_exceeded = metrics_registry.counter(
+  "http_query_budget_exceeded_total", "Requests that ran more SQL statements than the route's @query_budget.", ("method", "route"),
+)
+auth_verify_duration = metrics_registry.histogram(
+  "auth_verify_duration_seconds", "ID token verification latency (token cache misses only).",
+)
+auth_verify_failures = metrics_registry.counter(
+  "auth_verify_failures_total", "ID tokens rejected by the verifier.",
+)
+db_pool_wait = metrics_registry.histogram(
+  "db_pool_checkout_wait_seconds", "Connection checkout time (waiting for a free connection, opening overflow connections, pre-ping).",
+  ("engine",), POOL_WAIT_BUCKETS,
+)
+db_pool_timeouts = metrics_registry.counter(
+  "db_pool_checkout_timeouts_total", "Pool checkouts that gave up after pool_timeout.", ("engine",),
+)
+
+
+_pools: weakref.WeakSet = weakref.WeakSet()
+
+# プールには接続待ちのイベントがないので、チェックアウト（connect）を包んで測る
+# database.py で poolclass に渡す。dispose() で作り直されても同じクラスになる
+class TimedQueuePool(QueuePool):
+  engine_label = "sync"
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    _pools.add(self)
+
+  def connect(self):
+    started = time.perf_counter()
+    try:
+      return super().connect()
+    except exc.TimeoutError:
+      db_pool_timeouts.inc((self.engine_label,))
+      raise
+    finally:
+      db_pool_wait.observe(time.perf_counter() - started, (self.engine_label,))
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool, TimedQueuePool):
+  engine_label = "async"
+
+
+def pool_gauge(read):
+  def collect():
+    totals = {}
+    for pool in list(_pools):
+      totals[pool.engine_label] = totals.get(pool.engine_label, 0) + read(pool)
+    return [((label,), value) for label, value in sorted(totals.items())]
+  return collect
+
+metrics_registry.callback("db_pool_size", "Configured pool_size.", "gauge", ("engine",), pool_gauge(lambda pool: pool.size()))
+metrics_registry.callback("db_pool_checked_out", "Connections currently checked out.", "gauge", ("engine",), pool_gauge(lambda pool: pool.checkedout()))
+# QueuePool.overflow() は接続がない間は負の値（-pool_size から始まる）になるので 0 で切る
+metrics_registry.callback("db_pool_overflow", "Overflow connections currently open.", "gauge", ("engine",), pool_gauge(lambda pool: max(pool.overflow(), 0)))
+
+# 同期ルートを動かすスレッドプール（anyio の既定リミッター）。イベントループの外からは読めない
+def threadpool_gauge(read):
+  def collect():
+    try:
+      limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:
+      return []
+    return [((), read(limiter))]
+  return collect
+
+metrics_registry.callback("threadpool_threads_busy", "Worker threads running sync endpoints and dependencies.", "gauge", (), threadpool_gauge(lambda limiter: limiter.borrowed_tokens))
+metrics_registry.callback("threadpool_threads_max", "Worker thread limit.", "gauge", (), threadpool_gauge(lambda limiter: limiter.total_tokens))
+metrics_registry.callback("threadpool_tasks_waiting", "Tasks waiting for a free worker thread.", "gauge", (), threadpool_gauge(lambda limiter: limiter.statistics().tasks_waiting))
+
+metrics_registry.callback("token_cache_hits_total", "ID token cache hits.", "counter", (), lambda: [((), token_cache.hits)])
+metrics_registry.callback("token_cache_misses_total", "ID token cache misses.", "counter", (), lambda: [((), token_cache.misses)])
+metrics_registry.callback("token_cache_evictions_total", "ID token cache evictions.", "counter", (), lambda: [((), token_cache.evictions)])
+metrics_registry.callback("response_cache_hits_total", "Response cache hits.", "counter", (), lambda: [((), response_cache.hits)])
+metrics_registry.callback("response_cache_misses_total", "Response cache misses.", "counter", (), lambda: [((), response_cache.misses)])
+metrics_registry.callback("response_cache_invalidations_total", "Per-user response cache invalidations.", "counter", (), lambda: [((), response_cache.invalidations)])
+
+def compression_counter(field: str):
+  def collect():
+    return [(tuple(route.split(" ", 1)), stats[field]) for route, stats in sorted(compression_stats.stats().items())]
+  return collect
+
+metrics_registry.callback("compression_bytes_in_total", "Response bytes before compression (compressed responses only).", "counter", ("method", "route"), compression_counter("bytes_in"))
+metrics_registry.callback("compression_bytes_out_total", "Response bytes after compression (compressed responses only).", "counter", ("method", "route"), compression_counter("bytes_out"))
@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+
+# ルートごとの SQL 件数の上限（クエリバジェット）
+# ルーターの定義で @router.get(...) の内側に付ける:
+#   @router.get("", response_model=SuccessResponse)
+#   @query_budget(2)
+#   def get_memos(...):
+# 件数は認証の区間（measure("auth")：トークンキャッシュのミス時のユーザー取得・初回登録）を除いた、エンドポイント本体の数
+# 行数によって件数が変わらないこと（N+1 がないこと）が前提なので、上限は行数に依存しない定数にする
+# RequestMetricsMiddleware がリクエストの最後に比べ、超えたらログと /metrics に出す
+# テストでは track_query_budgets() でリクエストごとの件数を集め、超えたものがあれば失敗にする
+
+def query_budget(limit: int):
+  def decorate(endpoint):
+    endpoint.query_budget = limit
+    return endpoint
+  return decorate
+
+def route_query_budget(route) -> int | None:
+  return getattr(getattr(route, "endpoint", None), "query_budget", None)
+
+
+# リクエストが終わるたびに呼ばれる（track_query_budgets が登録する）
+budget_listeners: list = []
+
+class QueryBudgetExceeded(AssertionError):
+  pass
+
+
+class QueryBudgetTracker:
+  def __init__(self):
+    self.requests: list[dict] = []
+
+  def record(self, route: str, count: int, budget: int | None, statements: list[dict] | None):
+    self.requests.append({"route": route, "count": count, "budget": budget, "statements": statements or []})
+
+  def counts(self, route: str) -> list[int]:
+    return [r["count"] for r in self.requests if r["route"] == route]
+
+  def exceeded(self) -> list[dict]:
+    return [r for r in self.requests if r["budget"] is not None and r["count"] > r["budget"]]
+
+  def check(self):
+    exceeded = self.exceeded()
+    if not exceeded:
+      return
+    lines = []
+    for r in exceeded:
+      lines.append(f"{r['route']}: {r['count']} queries (budget {r['budget']})")
+      lines.extend(f"  {s['sql']}" for s in r["statements"])
+    raise QueryBudgetExceeded("query budget exceeded\n" + "\n".join(lines))
+
+# with track_query_budgets() as tracker: の中のリクエストを記録し、抜けるときにバジェット超えがあれば失敗する
+# （超えたリクエストの SQL の一覧をメッセージに出す）
+@contextmanager
+def track_query_budgets():
+  tracker = QueryBudgetTracker()
+  budget_listeners.append(tracker.record)
+  try:
+    yield tracker
+  finally:
+    budget_listeners.remove(tracker.record)
+  tracker.check()
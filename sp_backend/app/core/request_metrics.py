@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.compression import route_key
+from app.core.metrics import http_db_statements, http_query_budget_exceeded, http_request_duration, http_responses
+from app.core.query_budget import budget_listeners, route_query_budget
+
+# リクエスト単位の計測（SQL の件数と時間・認証・シリアライズ）
+# - RequestMetricsMiddleware がリクエストごとに RequestMetrics を contextvar に置く
+#   （同期ルートのスレッドプールにも、asyncpg の greenlet にも同じオブジェクトが引き継がれる）
+# - instrument_engine で付けたイベントで SQL を数え、measure("auth") などで区間を足し込む
+# - Server-Timing ヘッダーに載せ、レスポンスの最後に 1 行の JSON ログを出す（ルートごとの集計は /metrics にも足す）
+# REQUEST_METRICS_STATEMENT_SAMPLE_RATE の割合のリクエストでは、実行した SQL の一覧もログに出す（パラメーターは出さない）
+
+REQUEST_METRICS_LOG = os.getenv("REQUEST_METRICS_LOG", "1") == "1"
+REQUEST_METRICS_STATEMENT_SAMPLE_RATE = float(os.getenv("REQUEST_METRICS_STATEMENT_SAMPLE_RATE", "0"))
+
+# stockypocky.* のロガー（slow_query など）はここで付けたハンドラーに流れる
+app_logger = logging.getLogger("stockypocky")
+if not app_logger.handlers:
+  handler = logging.StreamHandler()
+  handler.setFormatter(logging.Formatter("%(message)s"))
+  app_logger.addHandler(handler)
+  app_logger.setLevel(logging.INFO)
+
+logger = logging.getLogger("stockypocky.request")
+
+
+class RequestMetrics:
+  def __init__(self, scope=None, record_statements: bool = False):
+    self.scope = scope
+    self.started = time.perf_counter()
+    self.db_count = 0
+    self.db_seconds = 0.0
+    self.auth_seconds = 0.0
+    self.serialize_seconds = 0.0
+    # measure() の区間内で実行された SQL の件数（db_count の内数）
+    self.auth_db_count = 0
+    self.serialize_db_count = 0
+    self.statements: list[dict] | None = [] if record_statements else None
+
+  def add_statement(self, statement: str, seconds: float):
+    self.db_count += 1
+    self.db_seconds += seconds
+    if self.statements is not None:
+      self.statements.append({"sql": statement, "ms": round(seconds * 1000, 3)})
+
+  # ルーティングが済んでいれば "GET /api/v1/items/{item_id}" の形
+  def route(self) -> str | None:
+    return route_key(self.scope) if self.scope is not None else None
+
+  # クエリバジェットと比べる件数（認証中の SQL は除く）
+  def endpoint_db_count(self) -> int:
+    return self.db_count - self.auth_db_count
+
+  def elapsed(self) -> float:
+    return time.perf_counter() - self.started
+
+  # 例: db;dur=3.2;desc="4 queries", auth;dur=0.1, serialize;dur=0.5, total;dur=12.0
+  def server_timing(self) -> str:
+    return ", ".join([
+      f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_count} queries"',
+      f"auth;dur={self.auth_seconds * 1000:.2f}",
+      f"serialize;dur={self.serialize_seconds * 1000:.2f}",
+      f"total;dur={self.elapsed() * 1000:.2f}",
+    ])
+
+
+current_request_metrics: ContextVar[RequestMetrics | None] = ContextVar("current_request_metrics", default=None)
+
+# with measure("auth"): ... の区間の時間と SQL の件数を今のリクエストに足す（リクエスト外では何もしない）
+@contextmanager
+def measure(name: str):
+  metrics = current_request_metrics.get()
+  if metrics is None:
+    yield
+    return
+  started = time.perf_counter()
+  started_count = metrics.db_count
+  try:
+    yield
+  finally:
+    seconds, count = f"{name}_seconds", f"{name}_db_count"
+    setattr(metrics, seconds, getattr(metrics, seconds) + time.perf_counter() - started)
+    setattr(metrics, count, getattr(metrics, count) + metrics.db_count - started_count)
+
+# 同期エンジンに付ける。非同期エンジンは async_engine.sync_engine を渡す
+def instrument_engine(engine: Engine):
+  event.listen(engine, "before_cursor_execute", __private_before_cursor_execute)
+  event.listen(engine, "after_cursor_execute", __private_after_cursor_execute)
+
+
+class RequestMetricsMiddleware:
+  def __init__(self, app, sample_rate: float = REQUEST_METRICS_STATEMENT_SAMPLE_RATE, log: bool = REQUEST_METRICS_LOG):
+    self.app = app
+    self.sample_rate = sample_rate
+    self.log = log
+
+  async def __call__(self, scope, receive, send):
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    # バジェットを見ているテストの間は SQL の一覧も取る
+    metrics = RequestMetrics(scope, record_statements=bool(budget_listeners) or random.random() < self.sample_rate)
+    token = current_request_metrics.set(metrics)
+    status = None
+
+    async def send_with_timing(message):
+      nonlocal status
+      if message["type"] == "http.response.start":
+        status = message["status"]
+        headers = list(message.get("headers", []))
+        headers.append((b"server-timing", metrics.server_timing().encode("latin-1")))
+        message = {**message, "headers": headers}
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_with_timing)
+    finally:
+      current_request_metrics.reset(token)
+      self.__record(scope, status, metrics)
+      budget = route_query_budget(scope.get("route"))
+      self.__check_budget(scope, metrics, budget)
+      if self.log:
+        logger.info(json.dumps(self.__log_line(scope, status, metrics, budget), ensure_ascii=False))
+
+  # /metrics 用（ロックなしのカウンター）
+  def __record(self, scope, status: int | None, metrics: RequestMetrics):
+    method, route = route_key(scope).split(" ", 1)
+    http_request_duration.observe(metrics.elapsed(), (method, route))
+    http_responses.inc((method, route, str(status or 500)))
+    http_db_statements.inc((method, route), metrics.db_count)
+
+  def __check_budget(self, scope, metrics: RequestMetrics, budget: int | None):
+    if budget is not None and metrics.endpoint_db_count() > budget:
+      http_query_budget_exceeded.inc(tuple(route_key(scope).split(" ", 1)))
+    for listener in list(budget_listeners):
+      listener(route_key(scope), metrics.endpoint_db_count(), budget, metrics.statements)
+
+  def __log_line(self, scope, status: int | None, metrics: RequestMetrics, budget: int | None) -> dict:
+    line = {
+      "event": "request",
+      "route": route_key(scope),
+      "path": scope["path"],
+      "status": status,
+      "total_ms": round(metrics.elapsed() * 1000, 3),
+      "db_count": metrics.db_count,
+      "db_ms": round(metrics.db_seconds * 1000, 3),
+      "auth_db_count": metrics.auth_db_count,
+      "auth_ms": round(metrics.auth_seconds * 1000, 3),
+      "serialize_ms": round(metrics.serialize_seconds * 1000, 3),
+    }
+    if budget is not None and metrics.endpoint_db_count() > budget:
+      line["query_budget_exceeded"] = budget
+    if metrics.statements is not None:
+      line["statements"] = metrics.statements
+    return line
+
+# private
+
+def __private_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  if current_request_metrics.get() is not None:
+    conn.info.setdefault("request_metrics_started", []).append(time.perf_counter())
+
+def __private_after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  metrics = current_request_metrics.get()
+  started = conn.info.get("request_metrics_started")
+  if metrics is None or not started:
+    return
+  metrics.add_statement(statement, time.perf_counter() - started.pop())
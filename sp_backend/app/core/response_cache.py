@@ -0,0 +1,218 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# GET レスポンス（シリアライズ済みバイト列）のユーザー単位キャッシュ
+# キーにユーザーごとのバージョンを含め、書き込みがあればバージョンを上げて古いキーを参照されなくする
+# 古いエントリは TTL と LRU で自然に消える
+
+class CacheBackend(Protocol):
+  def get(self, key: str) -> bytes | None: ...
+  def set(self, key: str, value: bytes, ttl: float): ...
+  def incr(self, key: str) -> int: ...
+  def get_counter(self, key: str) -> int: ...
+  def stats(self) -> dict: ...
+
+
+# プロセス内 LRU + TTL（デフォルト）。上限は値のバイト数で決める
+class InProcessBackend:
+  def __init__(self, max_bytes: int):
+    self.max_bytes = max_bytes
+    self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+    self._counters: dict[str, int] = {}
+    self._bytes = 0
+    self._lock = threading.Lock()
+    self.evictions = 0
+
+  def get(self, key: str) -> bytes | None:
+    now = time.monotonic()
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      expires_at, value = entry
+      if expires_at <= now:
+        self.__remove(key)
+        return None
+      self._entries.move_to_end(key)
+      return value
+
+  def set(self, key: str, value: bytes, ttl: float):
+    size = len(key) + len(value)
+    if size > self.max_bytes:
+      return
+    with self._lock:
+      if key in self._entries:
+        self.__remove(key)
+      self._entries[key] = (time.monotonic() + ttl, value)
+      self._bytes += size
+      while self._bytes > self.max_bytes:
+        oldest = next(iter(self._entries))
+        self.__remove(oldest)
+        self.evictions += 1
+
+  def incr(self, key: str) -> int:
+    with self._lock:
+      self._counters[key] = self._counters.get(key, 0) + 1
+      return self._counters[key]
+
+  def get_counter(self, key: str) -> int:
+    return self._counters.get(key, 0)
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "backend": "memory",
+        "entries": len(self._entries),
+        "bytes": self._bytes,
+        "max_bytes": self.max_bytes,
+        "evictions": self.evictions,
+      }
+
+  # private
+
+  def __remove(self, key: str):
+    _, value = self._entries.pop(key)
+    self._bytes -= len(key) + len(value)
+
+
+# Redis などの共有ストア向けアダプタ。client は get / set(ex=) / incr を持っていればよい
+class SharedStoreBackend:
+  def __init__(self, client, prefix: str = "sp:"):
+    self.client = client
+    self.prefix = prefix
+
+  def get(self, key: str) -> bytes | None:
+    return self.client.get(self.prefix + key)
+
+  def set(self, key: str, value: bytes, ttl: float):
+    self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+  def incr(self, key: str) -> int:
+    return int(self.client.incr(self.prefix + key))
+
+  def get_counter(self, key: str) -> int:
+    value = self.client.get(self.prefix + key)
+    return int(value) if value is not None else 0
+
+  def stats(self) -> dict:
+    stats = {"backend": "shared"}
+    if hasattr(self.client, "stats"):
+      stats.update(self.client.stats())
+    return stats
+
+
+# 共有ストアのローカル代替（開発・テスト用）。Redis の get / set / incr と同じ振る舞い
+class LocalSharedStore:
+  def __init__(self):
+    self._data: dict[str, tuple[float | None, bytes]] = {}
+    self._lock = threading.Lock()
+
+  def get(self, key: str) -> bytes | None:
+    with self._lock:
+      entry = self._data.get(key)
+      if entry is None:
+        return None
+      expires_at, value = entry
+      if expires_at is not None and expires_at <= time.monotonic():
+        del self._data[key]
+        return None
+      return value
+
+  def set(self, key: str, value: bytes, ex: int | None = None):
+    with self._lock:
+      self._data[key] = (time.monotonic() + ex if ex else None, value)
+
+  def incr(self, key: str) -> int:
+    with self._lock:
+      _, value = self._data.get(key, (None, b"0"))
+      value = str(int(value) + 1).encode()
+      self._data[key] = (None, value)
+      return int(value)
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "entries": len(self._data),
+        "bytes": sum(len(k) + len(v) for k, (_, v) in self._data.items()),
+      }
+
+
+class ResponseCache:
+  def __init__(self, backend, ttl: float):
+    self.backend = backend
+    self.ttl = ttl
+    self.enabled = ttl > 0
+    self.hits = 0
+    self.misses = 0
+    self.invalidations = 0
+
+  def version(self, user_id) -> int:
+    return self.backend.get_counter(f"ver:{user_id}")
+
+  # version は DB を読む前に取得しておくこと（読んでいる間に書き込みがあっても古い版のキーに入るだけ）
+  def key(self, user_id, version: int, resource: str, params: str) -> str:
+    return f"resp:{user_id}:{version}:{resource}:{params}"
+
+  def get(self, key: str) -> bytes | None:
+    value = self.backend.get(key)
+    if value is None:
+      self.misses += 1
+    else:
+      self.hits += 1
+    return value
+
+  def put(self, key: str, body: bytes):
+    self.backend.set(key, body, self.ttl)
+
+  def invalidate_user(self, user_id):
+    self.backend.incr(f"ver:{user_id}")
+    self.invalidations += 1
+
+  def stats(self) -> dict:
+    lookups = self.hits + self.misses
+    return {
+      "hits": self.hits,
+      "misses": self.misses,
+      "hit_ratio": self.hits / lookups if lookups else 0.0,
+      "invalidations": self.invalidations,
+      "ttl": self.ttl,
+      **self.backend.stats(),
+    }
+
+
+def build_response_cache() -> ResponseCache:
+  ttl = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+  backend_name = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+  if backend_name == "memory":
+    backend = InProcessBackend(int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
+  elif backend_name == "local-shared":
+    backend = SharedStoreBackend(LocalSharedStore())
+  else:
+    raise ValueError(f"unknown RESPONSE_CACHE_BACKEND: {backend_name}")
+  return ResponseCache(backend, ttl)
+
+
+response_cache = build_response_cache()
+
+
+# 書き込みのあったユーザーをセッションに記録し、commit 後にまとめてバージョンを上げる
+# commit 前に上げると、commit までの間に古いデータが新しい版でキャッシュされてしまう
+def mark_user_changed(db, user_id):
+  session = getattr(db, "sync_session", db)
+  session.info.setdefault("changed_users", set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def __after_commit(session):
+  for user_id in session.info.pop("changed_users", ()):
+    response_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def __after_rollback(session):
+  session.info.pop("changed_users", None)
@@ -0,0 +1,194 @@
+import asyncio
+import contextvars
+import itertools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.request_metrics import current_request_metrics
+
+# 遅いクエリの記録（リングバッファ）
+# - SLOW_QUERY_THRESHOLD_MS 以上かかった SQL を、パラメーターの形（型と長さ。値は残さない）・時間・ルートと一緒に残す
+# - SLOW_QUERY_EXPLAIN_SAMPLE_RATE の割合で、同じ SQL とパラメーターで EXPLAIN (ANALYZE, BUFFERS) を別の接続で取る
+#   同期エンジンはワーカースレッド、非同期エンジンはイベントループのタスクで実行する（リクエストは待たせない）
+#   ANALYZE は実際に実行するので SELECT だけにし、トランザクションは必ずロールバックする
+# - /api/v1/slow-queries で見られる（ADMIN_TOKEN が必要）。終了時には SLOW_QUERY_DUMP_PATH（なければログ）に書き出す
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_BUFFER_SIZE = int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "200"))
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "5000"))
+SLOW_QUERY_DUMP_PATH = os.getenv("SLOW_QUERY_DUMP_PATH")
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+# データを書き換える可能性のある文は EXPLAIN ANALYZE しない（CTE 内の INSERT や FOR UPDATE も含めて弾く）
+WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE)\b", re.IGNORECASE)
+# 副作用のある関数も弾く（advisory lock は別接続の EXPLAIN ANALYZE が元の接続のロック待ちで止まる）
+SIDE_EFFECT_FUNCTIONS = re.compile(r"\b(pg_advisory\w*|pg_try_advisory\w*|nextval|setval)\s*\(", re.IGNORECASE)
+
+logger = logging.getLogger("stockypocky.slow_query")
+
+
+# パラメーターの値は残さず、型（文字列・配列は長さも）だけにする
+def parameter_shape(parameters):
+  if isinstance(parameters, dict):
+    return {key: value_shape(value) for key, value in parameters.items()}
+  if isinstance(parameters, (list, tuple)):
+    return [value_shape(value) for value in parameters]
+  return type(parameters).__name__
+
+def value_shape(value) -> str:
+  name = type(value).__name__
+  if isinstance(value, (str, bytes, list, tuple)):
+    return f"{name}[{len(value)}]"
+  return name
+
+def explainable(statement: str) -> bool:
+  return (
+    statement.lstrip().upper().startswith(("SELECT", "WITH"))
+    and not WRITE_KEYWORDS.search(statement)
+    and not SIDE_EFFECT_FUNCTIONS.search(statement)
+  )
+
+
+class SlowQueryLog:
+  def __init__(
+    self,
+    threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+    size: int = SLOW_QUERY_BUFFER_SIZE,
+    explain_sample_rate: float = SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    explain_timeout_ms: int = SLOW_QUERY_EXPLAIN_TIMEOUT_MS,
+  ):
+    self.threshold = threshold_ms / 1000
+    self.explain_sample_rate = explain_sample_rate
+    self.explain_timeout_ms = explain_timeout_ms
+    self._entries: deque[dict] = deque(maxlen=size)
+    self._ids = itertools.count(1)
+    self._lock = threading.Lock()
+    # 同期エンジンの EXPLAIN 待ち。あふれた分は取らない
+    self._explain_queue: queue.Queue = queue.Queue(maxsize=16)
+    self._worker = None
+    # 非同期エンジンの EXPLAIN は同時に 1 件だけ（タスクは参照を持っておかないと GC で消えることがある）
+    self._explain_task = None
+
+  # 非同期エンジンは async_engine.sync_engine を渡す
+  def instrument(self, engine: Engine):
+    event.listen(engine, "before_cursor_execute", self.__before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", self.__after_cursor_execute)
+
+  # 新しい順
+  def entries(self, limit: int | None = None) -> list[dict]:
+    with self._lock:
+      entries = [dict(entry) for entry in reversed(self._entries)]
+    return entries[:limit] if limit is not None else entries
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def dump(self, path: str | None = SLOW_QUERY_DUMP_PATH):
+    entries = self.entries()
+    if not entries:
+      return
+    if path:
+      with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, default=str, indent=1)
+      return
+    for entry in reversed(entries):
+      logger.warning(json.dumps({"event": "slow_query", **entry}, ensure_ascii=False, default=str))
+
+  def __before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+  def __after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("slow_query_started")
+    if not started:
+      return
+    elapsed = time.perf_counter() - started.pop()
+    if elapsed < self.threshold or not context.execution_options.get("slow_query_log", True):
+      return
+
+    metrics = current_request_metrics.get()
+    entry = {
+      "id": next(self._ids),
+      "at": datetime.now(timezone.utc).isoformat(),
+      "duration_ms": round(elapsed * 1000, 3),
+      "route": metrics.route() if metrics is not None else None,
+      "sql": statement,
+      "parameters": {"rows": len(parameters), "first": parameter_shape(parameters[0])} if executemany else parameter_shape(parameters),
+      "explain": None,
+    }
+    with self._lock:
+      self._entries.append(entry)
+
+    # slow_query_explain=False を付けた文は記録だけして EXPLAIN しない
+    if executemany or not explainable(statement) or not context.execution_options.get("slow_query_explain", True):
+      return
+    if random.random() >= self.explain_sample_rate:
+      return
+    entry["explain"] = {"status": "pending"}
+    if conn.dialect.is_async:
+      self.__explain_on_loop(conn.engine, entry, statement, parameters)
+    else:
+      self.__explain_in_worker(conn.engine, entry, statement, parameters)
+
+  def __explain_in_worker(self, engine: Engine, entry: dict, statement: str, parameters):
+    try:
+      self._explain_queue.put_nowait((engine, entry, statement, parameters))
+    except queue.Full:
+      entry["explain"] = {"status": "skipped"}
+      return
+    with self._lock:
+      if self._worker is None:
+        self._worker = threading.Thread(target=self.__run_worker, name="slow-query-explain", daemon=True)
+        self._worker.start()
+
+  def __run_worker(self):
+    while True:
+      engine, entry, statement, parameters = self._explain_queue.get()
+      try:
+        with engine.connect() as conn:
+          conn.execution_options(slow_query_log=False)
+          conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+          plan = conn.exec_driver_sql(EXPLAIN_PREFIX + statement, parameters).scalar_one()
+          # 閉じるときにロールバックされる
+        entry["explain"] = self.__plan(plan)
+      except Exception as e:
+        entry["explain"] = {"status": "error", "error": repr(e)}
+
+  # greenlet の中でもイベントループのスレッドにいるので、そのループにタスクを積む
+  # リクエストの計測に混ざらないよう空のコンテキストで動かす
+  def __explain_on_loop(self, sync_engine: Engine, entry: dict, statement: str, parameters):
+    if self._explain_task is not None and not self._explain_task.done():
+      entry["explain"] = {"status": "skipped"}
+      return
+    coro = self.__explain_async(AsyncEngine(sync_engine), entry, statement, parameters)
+    self._explain_task = asyncio.get_running_loop().create_task(coro, context=contextvars.Context())
+
+  async def __explain_async(self, engine: AsyncEngine, entry: dict, statement: str, parameters):
+    try:
+      async with engine.connect() as conn:
+        await conn.execution_options(slow_query_log=False)
+        await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+        result = await conn.exec_driver_sql(EXPLAIN_PREFIX + statement, parameters)
+        entry["explain"] = self.__plan(result.scalar_one())
+    except Exception as e:
+      entry["explain"] = {"status": "error", "error": repr(e)}
+
+  # asyncpg は json 型を文字列で返す
+  def __plan(self, plan) -> dict:
+    if isinstance(plan, str):
+      plan = json.loads(plan)
+    return {"status": "done", "plan": plan}
+
+
+slow_query_log = SlowQueryLog()
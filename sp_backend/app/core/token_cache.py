@@ -0,0 +1,72 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# 検証済み ID トークンのキャッシュ。トークン本体は保持せずハッシュをキーにする
+class TokenCache:
+  def __init__(self, max_size: int):
+    self.max_size = max_size
+    self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def get(self, token: str) -> dict | None:
+    key = self.__key(token)
+    now = time.time()
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self.misses += 1
+        return None
+      exp, identity = entry
+      if exp <= now:
+        del self._entries[key]
+        self.misses += 1
+        return None
+      self._entries.move_to_end(key)
+      self.hits += 1
+      return identity
+
+  def put(self, token: str, identity: dict, exp: float):
+    if self.max_size <= 0 or exp <= time.time():
+      return
+    key = self.__key(token)
+    with self._lock:
+      self._entries[key] = (exp, identity)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_size:
+        self._entries.popitem(last=False)
+        self.evictions += 1
+
+  def evict_user(self, user_id):
+    with self._lock:
+      keys = [k for k, (_, identity) in self._entries.items() if identity["id"] == user_id]
+      for k in keys:
+        del self._entries[k]
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+        "size": len(self._entries),
+        "max_size": self.max_size,
+      }
+
+  # private
+
+  @staticmethod
+  def __key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+token_cache = TokenCache(int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024")))
@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.request
+from functools import lru_cache
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from jwt.algorithms import RSAAlgorithm
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+
+logger = logging.getLogger("stockypocky.token_verifier")
+
+# firebase_admin にそのまま委譲する（従来の挙動）
+class FirebaseAdminVerifier:
+  # 証明書の取得でネットワーク待ちが発生しうる
+  blocking = True
+
+  def start(self):
+    from firebase import init_firebase
+    init_firebase()
+
+  def verify(self, token: str) -> dict:
+    from firebase_admin import auth
+    return auth.verify_id_token(token)
+
+
+class UnknownKeyError(Exception):
+  pass
+
+
+# 署名鍵セットをメモリに保持し、RS256 をローカルで検証する
+# 鍵はアプリの起動時（lifespan）に start() で読み込む。verify() は鍵を取りに行かない（イベントループを止めない）
+class LocalKeySetVerifier:
+  blocking = False
+
+  def __init__(self, project_id: str, keys_file: str | None = None, keys_url: str = GOOGLE_CERTS_URL, refresh_margin: float = 300, file_poll_interval: float = 60):
+    self.project_id = project_id
+    self.issuer = f"https://securetoken.google.com/{project_id}"
+    self.keys_file = keys_file
+    self.keys_url = keys_url
+    self.refresh_margin = refresh_margin
+    self.file_poll_interval = file_poll_interval
+    self._keys: dict = {}
+    self._expires_at = 0.0
+    self._file_mtime = None
+    self._wakeup = threading.Event()
+    self._thread = None
+    self._lock = threading.Lock()
+
+  def start(self):
+    with self._lock:
+      if self._thread:
+        return
+      self.refresh()
+      self._thread = threading.Thread(target=self.__private_refresh_loop, name="token-keyset-refresh", daemon=True)
+      self._thread.start()
+
+  def verify(self, token: str) -> dict:
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = self._keys.get(kid)
+    if key is None:
+      # 鍵のローテーション直後かもしれないので、次の更新を前倒しする
+      self._wakeup.set()
+      raise UnknownKeyError(f"unknown kid: {kid}")
+
+    decoded = jwt.decode(
+      token,
+      key,
+      algorithms=["RS256"],
+      audience=self.project_id,
+      issuer=self.issuer,
+      options={"require": ["exp", "iat", "sub", "aud", "iss"]},
+    )
+    sub = decoded["sub"]
+    if not isinstance(sub, str) or not sub or len(sub) > 128:
+      raise jwt.InvalidTokenError("invalid sub claim")
+    decoded["uid"] = sub
+    return decoded
+
+  def refresh(self):
+    if self.keys_file:
+      mtime = os.path.getmtime(self.keys_file)
+      if mtime == self._file_mtime:
+        return
+      with open(self.keys_file) as f:
+        raw = json.load(f)
+      self._keys = parse_key_set(raw)
+      self._file_mtime = mtime
+      self._expires_at = time.time() + self.file_poll_interval
+    else:
+      with urllib.request.urlopen(self.keys_url, timeout=10) as res:
+        raw = json.loads(res.read())
+        max_age = self.__private_max_age(res.headers.get("Cache-Control", ""))
+      self._keys = parse_key_set(raw)
+      self._expires_at = time.time() + max_age
+
+  # private
+
+  def __private_refresh_loop(self):
+    while True:
+      if self.keys_file:
+        wait = self.file_poll_interval
+      else:
+        wait = max(self._expires_at - time.time() - self.refresh_margin, 1)
+      self._wakeup.wait(wait)
+      self._wakeup.clear()
+      try:
+        self.refresh()
+      except Exception as e:
+        # 取得に失敗しても手元の鍵で検証を続け、少し待って再試行する
+        logger.warning(json.dumps({"event": "keyset_refresh_error", "error": repr(e)}))
+        self._wakeup.wait(30)
+
+  @staticmethod
+  def __private_max_age(cache_control: str) -> float:
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return float(match.group(1)) if match else 3600
+
+
+def parse_key_set(raw: dict) -> dict:
+  # JWKS（{"keys": [...]}）と Google の x509 形式（{kid: PEM}）の両方を受け付ける
+  if "keys" in raw:
+    return {jwk["kid"]: RSAAlgorithm.from_jwk(jwk) for jwk in raw["keys"]}
+
+  keys = {}
+  for kid, pem in raw.items():
+    data = pem.encode()
+    if b"BEGIN CERTIFICATE" in data:
+      keys[kid] = x509.load_pem_x509_certificate(data).public_key()
+    else:
+      keys[kid] = load_pem_public_key(data)
+  return keys
+
+
+@lru_cache
+def get_token_verifier():
+  if os.getenv("AUTH_VERIFIER", "firebase") == "local":
+    return LocalKeySetVerifier(
+      project_id=os.environ["FIREBASE_PROJECT_ID"],
+      keys_file=os.getenv("AUTH_KEYS_FILE"),
+    )
+  return FirebaseAdminVerifier()
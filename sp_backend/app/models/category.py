@@ -1,8 +1,11 @@
-from sqlalchemy import UUID, BigInteger, Column, ForeignKey, Text
+from sqlalchemy import UUID, BigInteger, Column, ForeignKey, Index, Text
 from database import Base
 
 class Category(Base):
   __tablename__ = "categories"
+  __table_args__ = (
+    Index("ix_categories_user_id_id", "user_id", "id"),
+  )
 
   id = Column(BigInteger, primary_key=True, index=True)
   name = Column(Text, nullable=False)
@@ -1,9 +1,14 @@
-from sqlalchemy import UUID, BigInteger, Boolean, Column, ForeignKey, Numeric, Text
+from sqlalchemy import UUID, BigInteger, Boolean, Column, ForeignKey, Index, Numeric, Text
 from database import Base
 from sqlalchemy.orm import relationship
 
 class Item(Base):
   __tablename__ = "items"
+  __table_args__ = (
+    Index("ix_items_user_id_category_id", "user_id", "category_id"),
+    Index("ix_items_user_id_is_favorite", "user_id", "is_favorite"),
+    Index("ix_items_user_id_id", "user_id", "id"),
+  )
 
   id = Column(BigInteger, primary_key=True, index=True)
   name = Column(Text, nullable=False)
@@ -16,7 +21,9 @@ class Item(Base):
   user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
   category_id = Column(BigInteger, ForeignKey("categories.id"), nullable=False)
   
-  stocks = relationship("Stock",back_populates="item",cascade="all, delete-orphan")
-  stock_history = relationship("StockHistory",back_populates="item",cascade="all, delete-orphan")
-  shopping_list = relationship("ShoppingList",back_populates="item",cascade="all, delete-orphan")
-  shopping_records = relationship("ShoppingRecord",back_populates="item",cascade="all, delete-orphan")
+  category = relationship("Category")
+  # 子の削除は DB の ON DELETE CASCADE に任せる（未ロードの子を SELECT して 1 件ずつ DELETE しない）
+  stocks = relationship("Stock",back_populates="item",cascade="all, delete-orphan",passive_deletes=True)
+  stock_history = relationship("StockHistory",back_populates="item",cascade="all, delete-orphan",passive_deletes=True)
+  shopping_list = relationship("ShoppingList",back_populates="item",cascade="all, delete-orphan",passive_deletes=True)
+  shopping_records = relationship("ShoppingRecord",back_populates="item",cascade="all, delete-orphan",passive_deletes=True)
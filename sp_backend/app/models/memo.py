@@ -1,8 +1,11 @@
-from sqlalchemy import ARRAY, UUID, BigInteger, Column, ForeignKey, Text, Boolean
+from sqlalchemy import ARRAY, UUID, BigInteger, Column, ForeignKey, Index, Text, Boolean
 from database import Base
 
 class Memo(Base):
   __tablename__ = "memos"
+  __table_args__ = (
+    Index("ix_memos_user_id_id", "user_id", "id"),
+  )
 
   id = Column(BigInteger, primary_key=True, index=True)
   title = Column(Text, nullable=False)
@@ -1,9 +1,14 @@
-from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Numeric, Boolean, func
+from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Index, Numeric, Boolean, func
 from database import Base
 from sqlalchemy.orm import relationship
 
 class ShoppingList(Base):
   __tablename__ = "shopping_list"
+  __table_args__ = (
+    Index("ux_shopping_list_user_id_item_id", "user_id", "item_id", unique=True),
+    Index("ix_shopping_list_user_id_added_at_id", "user_id", "added_at", "id"),
+    Index("ix_shopping_list_item_id", "item_id"),
+  )
 
   id = Column(BigInteger, primary_key=True, index=True)
   quantity = Column(Numeric, nullable=False)
@@ -1,9 +1,14 @@
-from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Numeric, Text
+from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Index, Numeric, Text
 from database import Base
 from sqlalchemy.orm import relationship
 
 class ShoppingRecord(Base):
   __tablename__ = "shopping_records"
+  __table_args__ = (
+    Index("ix_shopping_records_user_id_bought_at_id", "user_id", "bought_at", "id"),
+    Index("ix_shopping_records_user_id_item_id_store", "user_id", "item_id", "store", "bought_at", "id"),
+    Index("ix_shopping_records_item_id", "item_id"),
+  )
 
   id = Column(BigInteger, primary_key=True, index=True)
   quantity = Column(Numeric, nullable=False)
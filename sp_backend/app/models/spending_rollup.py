@@ -0,0 +1,18 @@
+from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Index, Numeric
+from database import Base
+
+# 月 × アイテム単位の支出集計。shopping_records の追加・更新・削除と同じトランザクションで更新する
+# category_id はアイテムの現在のカテゴリ（カテゴリ変更時に付け替える）
+class SpendingRollup(Base):
+  __tablename__ = "spending_rollups"
+  __table_args__ = (
+    Index("ix_spending_rollups_user_id_category_id", "user_id", "category_id"),
+    Index("ix_spending_rollups_item_id", "item_id"),
+  )
+
+  user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+  month = Column(DateTime, primary_key=True)
+  item_id = Column(BigInteger, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True)
+  category_id = Column(BigInteger, ForeignKey("categories.id"), nullable=False)
+  total_amount = Column(Numeric, nullable=False)
+  record_count = Column(BigInteger, nullable=False)
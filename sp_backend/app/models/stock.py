@@ -1,9 +1,14 @@
-from sqlalchemy import UUID, BigInteger, Column, ForeignKey, Numeric, Text
+from sqlalchemy import UUID, BigInteger, Column, ForeignKey, Index, Numeric, Text
 from database import Base
 from sqlalchemy.orm import relationship
 
 class Stock(Base):
   __tablename__ = "stocks"
+  __table_args__ = (
+    Index("ux_stocks_user_id_item_id", "user_id", "item_id", unique=True),
+    Index("ix_stocks_user_id_id", "user_id", "id"),
+    Index("ix_stocks_item_id", "item_id"),
+  )
 
   id = Column(BigInteger, primary_key=True, index=True)
   quantity = Column(Numeric, nullable=False)
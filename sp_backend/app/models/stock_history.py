@@ -1,9 +1,13 @@
-from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Numeric, Text, func
+from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Index, Numeric, Text, func, text
 from database import Base
 from sqlalchemy.orm import relationship
 
 class StockHistory(Base):
   __tablename__ = "stock_history"
+  __table_args__ = (
+    Index("ix_stock_history_item_id_created_at_id", "item_id", "created_at", "id"),
+    Index("ix_stock_history_user_id_consumption", "user_id", "item_id", "created_at", "id", postgresql_where=text("change < 0")),
+  )
 
   id = Column(BigInteger, primary_key=True, index=True)
   change = Column(Numeric, nullable=False)
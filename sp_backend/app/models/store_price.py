@@ -0,0 +1,17 @@
+from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Index, Numeric, Text
+from database import Base
+
+# アイテム × 店舗ごとの直近の単価・購入回数・最終購入日（店舗のおすすめ用）
+# shopping_records の追加・更新・削除と同じトランザクションで、該当するキーだけ作り直す
+class StorePrice(Base):
+  __tablename__ = "store_prices"
+  __table_args__ = (
+    Index("ix_store_prices_item_id", "item_id"),
+  )
+
+  user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+  item_id = Column(BigInteger, ForeignKey("items.id", ondelete="CASCADE"), primary_key=True)
+  store = Column(Text, primary_key=True)
+  recent_unit_price = Column(Numeric, nullable=False)
+  purchase_count = Column(BigInteger, nullable=False)
+  last_bought_at = Column(DateTime, nullable=False)
@@ -7,4 +7,4 @@ class User(Base):
   id = Column(UUID(as_uuid=True), primary_key=True, index=True, server_default="gen_random_uuid()")
   name = Column(Text)
   email = Column(Text, unique=True, nullable=False)
-  firebase_uid = Column(Text)
\ No newline at end of file
+  firebase_uid = Column(Text, index=True)
\ No newline at end of file
@@ -0,0 +1,33 @@
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.category import Category
+from app.repositories.categories_repo import categories_query
+from app.utils.pagination import PageParams
+
+async def get_categories(user_id: UUID, db: AsyncSession, page: PageParams | None = None):
+  result = await db.execute(categories_query(user_id, page))
+  return result.all()
+
+async def get_category_by_id(category_id: int, db: AsyncSession):
+  result = await db.execute(select(Category).where(Category.id == category_id))
+  return result.scalars().first()
+
+async def create_category(request: Category, db: AsyncSession):
+  db.add(request)
+  await __private_db_change(request, db)
+  return request
+
+async def update_category(request: Category, db: AsyncSession):
+  await __private_db_change(request, db)
+  return request
+
+async def delete_category(request: Category, db: AsyncSession):
+  await db.delete(request)
+  await db.flush()
+  return request
+
+# private
+
+async def __private_db_change(data: Category, db: AsyncSession):
+  await db.flush()
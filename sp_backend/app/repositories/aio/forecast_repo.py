@@ -0,0 +1,12 @@
+from uuid import UUID
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.forecast_repo import consumption_history_query, rows_to_array, stock_levels_query
+
+async def get_consumption_history(user_id: UUID, db: AsyncSession, item_id: int | None = None) -> np.ndarray:
+  result = await db.execute(consumption_history_query(user_id, item_id))
+  return rows_to_array(result.all(), 3)
+
+async def get_stock_levels(user_id: UUID, db: AsyncSession) -> np.ndarray:
+  result = await db.execute(stock_levels_query(user_id))
+  return rows_to_array(result.all(), 2)
@@ -0,0 +1,53 @@
+from uuid import UUID
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.item import Item
+from app.repositories.items_repo import ITEM_PAGE_KEYS, item_load_options, item_rows_query
+from app.repositories.spending_rollups_repo import move_item_category_statement
+from app.utils.pagination import PageParams, apply_keyset
+
+async def get_items(user_id: UUID, category_id: int, is_favorite: bool, db: AsyncSession, include: tuple[str, ...] = (), page: PageParams | None = None):
+  query = select(Item).options(*item_load_options(include))
+  if category_id is not None:
+    query = query.where(Item.category_id == category_id)
+  if is_favorite is not None:
+    query = query.where(Item.is_favorite == is_favorite)
+  query = query.where(Item.user_id == user_id)
+  result = await db.execute(apply_keyset(query, ITEM_PAGE_KEYS, page))
+  return result.scalars().all()
+
+async def get_item_rows(user_id: UUID, category_id: int, is_favorite: bool, db: AsyncSession, page: PageParams | None = None):
+  result = await db.execute(item_rows_query(user_id, category_id, is_favorite, page))
+  return result.all()
+
+async def get_item_by_category(category_id: int, db: AsyncSession):
+  result = await db.execute(select(Item).where(Item.category_id == category_id))
+  return result.scalars().first()
+
+async def get_items_by_id(item_id: int, db: AsyncSession, include: tuple[str, ...] = ()):
+  result = await db.execute(select(Item).options(*item_load_options(include)).where(Item.id == item_id))
+  return result.scalars().first()
+
+async def create_item(request: Item, db: AsyncSession):
+  db.add(request)
+  await __private_db_change(request, db)
+  return request
+
+async def update_item(request: Item, db: AsyncSession):
+  category_changed = inspect(request).attrs.category_id.history.has_changes()
+  await __private_db_change(request, db)
+  if category_changed:
+    # 支出の集計はアイテムの現在のカテゴリで数える
+    await db.execute(move_item_category_statement(request.id, request.category_id))
+  return request
+
+# 子テーブルは ON DELETE CASCADE で消える（items_repo.delete_item と同じ）
+async def delete_item(request: Item, db: AsyncSession):
+  await db.delete(request)
+  await db.flush()
+  return request
+
+# private
+
+async def __private_db_change(data: Item, db: AsyncSession):
+  await db.flush()
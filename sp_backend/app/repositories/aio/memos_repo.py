@@ -0,0 +1,33 @@
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.memo import Memo
+from app.repositories.memos_repo import memos_query
+from app.utils.pagination import PageParams
+
+async def get_memos(user_id: UUID, db: AsyncSession, page: PageParams | None = None):
+  result = await db.execute(memos_query(user_id, page))
+  return result.all()
+
+async def get_memo_by_id(memo_id: int, db: AsyncSession):
+  result = await db.execute(select(Memo).where(Memo.id == memo_id))
+  return result.scalars().first()
+
+async def create_memo(request: Memo, db: AsyncSession):
+  db.add(request)
+  await __private_db_change(request, db)
+  return request
+
+async def update_memo(request: Memo, db: AsyncSession):
+  await __private_db_change(request, db)
+  return request
+
+async def delete_memo(request: Memo, db: AsyncSession):
+  await db.delete(request)
+  await db.flush()
+  return request
+
+# private
+
+async def __private_db_change(data: Memo, db: AsyncSession):
+  await db.flush()
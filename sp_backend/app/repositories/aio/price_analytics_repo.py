@@ -0,0 +1,11 @@
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.price_analytics_repo import price_history_query, price_summary_query
+
+async def get_price_history(user_id: UUID, item_id: int, window: int, db: AsyncSession):
+  result = await db.execute(price_history_query(user_id, item_id, window))
+  return result.all()
+
+async def get_price_summary(user_id: UUID, window: int, db: AsyncSession):
+  result = await db.execute(price_summary_query(user_id, window))
+  return result.all()
@@ -0,0 +1,41 @@
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.shopping_list import ShoppingList
+from app.repositories.shopping_list_repo import increment_shopping_list_statement, shopping_lists_query
+from app.utils.pagination import PageParams
+
+async def get_shopping_lists(user_id: UUID, db: AsyncSession, page: PageParams | None = None):
+  result = await db.execute(shopping_lists_query(user_id, page))
+  return result.all()
+
+async def get_shopping_list_by_id(shopping_list_id: int, db: AsyncSession):
+  result = await db.execute(select(ShoppingList).where(ShoppingList.id == shopping_list_id))
+  return result.scalars().first()
+
+async def get_shopping_list_by_item(user_id: UUID, item_id: int, db: AsyncSession):
+  result = await db.execute(select(ShoppingList).where(ShoppingList.user_id == user_id, ShoppingList.item_id == item_id))
+  return result.scalars().first()
+
+async def create_shopping_list(request: ShoppingList, db: AsyncSession):
+  db.add(request)
+  await __private_db_change(request, db)
+  return request
+
+async def update_shopping_list(request: ShoppingList, db: AsyncSession):
+  await __private_db_change(request, db)
+  return request
+
+async def increment_shopping_list(user_id: UUID, item_id: int, db: AsyncSession):
+  result = await db.execute(increment_shopping_list_statement(user_id, item_id))
+  return result.scalars().first()
+
+async def delete_shopping_list(request: ShoppingList, db: AsyncSession):
+  await db.delete(request)
+  await db.flush()
+  return request
+
+# private
+
+async def __private_db_change(data: ShoppingList, db: AsyncSession):
+  await db.flush()
@@ -0,0 +1,59 @@
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.shopping_record import ShoppingRecord
+from app.repositories.aio.spending_rollups_repo import apply_spending_statements
+from app.repositories.shopping_records_repo import shopping_record_export_query, shopping_records_query, spending_by_category_query, spending_by_item_query, spending_timeline_query
+from app.repositories.spending_rollups_repo import record_created_statements, record_deleted_statements, record_updated_statements
+from app.repositories.store_prices_repo import record_created_store_statements, record_deleted_store_statements, record_updated_store_statements
+from app.utils.pagination import PageParams
+from app.utils.period import SummaryPeriod
+
+async def get_shopping_records(user_id: UUID, db: AsyncSession, page: PageParams | None = None):
+  result = await db.execute(shopping_records_query(user_id, page))
+  return result.all()
+
+async def stream_shopping_records(user_id: UUID, db: AsyncSession, period: SummaryPeriod | None = None):
+  result = await db.stream(shopping_record_export_query(user_id, period))
+  async for rows in result.partitions():
+    yield rows
+
+async def get_shopping_record_by_id(shopping_record_id: int, db: AsyncSession):
+  result = await db.execute(select(ShoppingRecord).where(ShoppingRecord.id == shopping_record_id))
+  return result.scalars().first()
+
+async def create_shopping_record(request: ShoppingRecord, db: AsyncSession):
+  db.add(request)
+  await __private_db_change(request, db)
+  await apply_spending_statements(record_created_statements(request) + record_created_store_statements(request), db)
+  return request
+
+# previous は書き換え前に record_snapshot で取った値
+async def update_shopping_record(request: ShoppingRecord, previous: tuple, db: AsyncSession):
+  await __private_db_change(request, db)
+  spending_previous, store_previous = previous
+  await apply_spending_statements(record_updated_statements(spending_previous, request) + record_updated_store_statements(store_previous, request), db)
+  return request
+
+async def delete_shopping_record(request: ShoppingRecord, db: AsyncSession):
+  await db.delete(request)
+  await db.flush()
+  await apply_spending_statements(record_deleted_statements(request) + record_deleted_store_statements(request), db)
+  return request
+
+async def get_monthly_spending(user_id: UUID, db: AsyncSession, period: SummaryPeriod | None = None):
+  result = await db.execute(spending_timeline_query(user_id, period))
+  return result.all()
+
+async def get_spending_by_item(user_id: UUID, db: AsyncSession, period: SummaryPeriod | None = None):
+  result = await db.execute(spending_by_item_query(user_id, period))
+  return result.all()
+
+async def get_spending_by_category(user_id: UUID, db: AsyncSession, period: SummaryPeriod | None = None):
+  result = await db.execute(spending_by_category_query(user_id, period))
+  return result.all()
+
+# private
+
+async def __private_db_change(data: ShoppingRecord, db: AsyncSession):
+  await db.flush()
@@ -0,0 +1,5 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+async def apply_spending_statements(statements: list, db: AsyncSession):
+  for statement in statements:
+    await db.execute(statement)
@@ -0,0 +1,24 @@
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.stock_history import StockHistory
+from app.repositories.stock_history_repo import stock_history_export_query, stock_history_query
+from app.utils.pagination import PageParams
+
+async def get_stock_history_by_item_id(item_id: int, db: AsyncSession, page: PageParams | None = None):
+  result = await db.execute(stock_history_query(item_id, page))
+  return result.all()
+
+async def stream_stock_history(item_id: int, user_id: UUID, db: AsyncSession):
+  result = await db.stream(stock_history_export_query(item_id, user_id))
+  async for rows in result.partitions():
+    yield rows
+
+async def create_stock_history(request: StockHistory, db: AsyncSession):
+  db.add(request)
+  await __private_db_change(request, db)
+  return request
+
+# private
+
+async def __private_db_change(data: StockHistory, db: AsyncSession):
+  await db.flush()
@@ -0,0 +1,32 @@
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.stock import Stock
+from app.repositories.stocks_repo import adjust_stock_statement, stocks_query
+from app.utils.pagination import PageParams
+
+async def get_stocks(user_id: UUID, db: AsyncSession, page: PageParams | None = None):
+  result = await db.execute(stocks_query(user_id, page))
+  return result.all()
+
+async def get_stock_by_item_id(item_id: int, db: AsyncSession):
+  result = await db.execute(select(Stock).where(Stock.item_id == item_id))
+  return result.scalars().first()
+
+async def create_stock(request: Stock, db: AsyncSession):
+  db.add(request)
+  await __private_db_change(request, db)
+  return request
+
+async def update_stock(request: Stock, db: AsyncSession):
+  await __private_db_change(request, db)
+  return request
+
+async def adjust_stock(item_id: int, action: str, quantity: int, threshold: int, location: str, db: AsyncSession):
+  result = await db.execute(adjust_stock_statement(item_id, action, quantity, threshold, location))
+  return result.one_or_none()
+
+# private
+
+async def __private_db_change(data: Stock, db: AsyncSession):
+  await db.flush()
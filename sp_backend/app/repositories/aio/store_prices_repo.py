@@ -0,0 +1,8 @@
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.store_prices_repo import store_recommendation_query
+
+async def get_store_recommendation(user_id: UUID, since: datetime | None, db: AsyncSession):
+  result = await db.execute(store_recommendation_query(user_id, since))
+  return result.all()
@@ -1,9 +1,20 @@
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.category import Category
+from app.utils.pagination import PageParams, apply_keyset
 
-def get_categories(user_id: UUID, db: Session):
-  return db.query(Category).filter(Category.user_id == user_id).all()
+CATEGORY_PAGE_KEYS = (Category.id,)
+
+# 一覧用。CategoryResponse の列だけを読む
+CATEGORY_LIST_COLUMNS = (Category.id, Category.name, Category.icon, Category.user_id)
+
+def categories_query(user_id: UUID, page: PageParams | None = None):
+  query = select(*CATEGORY_LIST_COLUMNS).where(Category.user_id == user_id)
+  return apply_keyset(query, CATEGORY_PAGE_KEYS, page)
+
+def get_categories(user_id: UUID, db: Session, page: PageParams | None = None):
+  return db.execute(categories_query(user_id, page)).all()
 
 def get_category_by_id(category_id: int, db: Session):
   return db.query(Category).filter(Category.id == category_id).first()
@@ -19,11 +30,10 @@ def update_category(request: Category, db: Session):
 
 def delete_category(request: Category, db: Session):
   db.delete(request)
-  db.commit()
+  db.flush()
   return request
 
 # private
 
 def __private_db_change(data: Category, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
\ No newline at end of file
@@ -0,0 +1,38 @@
+from uuid import UUID
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+from app.models.category import Category
+from app.models.item import Item
+from app.models.memo import Memo
+from app.models.shopping_list import ShoppingList
+from app.models.stock import Stock
+
+# アイテム + カテゴリ名 + 在庫を 1 クエリで取得する
+def get_item_overview(user_id: UUID, db: Session):
+  query = (
+    select(Item, Category.name.label("category_name"), Stock)
+    .outerjoin(Category, Item.category_id == Category.id)
+    .outerjoin(Stock, and_(Stock.item_id == Item.id, Stock.user_id == Item.user_id))
+    .where(Item.user_id == user_id)
+    .order_by(Item.id)
+  )
+  return db.execute(query).all()
+
+def get_open_shopping_list(user_id: UUID, limit: int | None, db: Session):
+  query = (
+    select(ShoppingList, Item.name, Item.image_url, Item.notes)
+    .join(Item, ShoppingList.item_id == Item.id)
+    .where(ShoppingList.user_id == user_id, ShoppingList.checked.is_(False))
+    .order_by(ShoppingList.added_at.desc(), ShoppingList.id.desc())
+    .limit(limit)
+  )
+  return db.execute(query).all()
+
+def get_recent_memos(user_id: UUID, limit: int | None, db: Session):
+  query = (
+    select(Memo)
+    .where(Memo.user_id == user_id)
+    .order_by(Memo.id.desc())
+    .limit(limit)
+  )
+  return db.scalars(query).all()
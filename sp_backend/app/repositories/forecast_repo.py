@@ -0,0 +1,37 @@
+from uuid import UUID
+import numpy as np
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session
+from app.models.stock import Stock
+from app.models.stock_history import StockHistory
+
+# 予測の入力。ユーザーの全アイテム分を 1 クエリずつで読み、そのまま NumPy 配列にする
+def consumption_history_query(user_id: UUID, item_id: int | None = None):
+  query = (
+    select(
+      StockHistory.item_id,
+      cast(func.extract("epoch", StockHistory.created_at), Float),
+      cast(-StockHistory.change, Float)
+    )
+    .where(StockHistory.user_id == user_id, StockHistory.change < 0)
+    .order_by(StockHistory.item_id, StockHistory.created_at, StockHistory.id)
+  )
+  if item_id is not None:
+    query = query.where(StockHistory.item_id == item_id)
+  return query
+
+def stock_levels_query(user_id: UUID):
+  return (
+    select(Stock.item_id, cast(Stock.quantity, Float))
+    .where(Stock.user_id == user_id)
+    .order_by(Stock.item_id)
+  )
+
+def rows_to_array(rows, columns: int) -> np.ndarray:
+  return np.array(rows, dtype=np.float64).reshape(-1, columns)
+
+def get_consumption_history(user_id: UUID, db: Session, item_id: int | None = None) -> np.ndarray:
+  return rows_to_array(db.execute(consumption_history_query(user_id, item_id)).all(), 3)
+
+def get_stock_levels(user_id: UUID, db: Session) -> np.ndarray:
+  return rows_to_array(db.execute(stock_levels_query(user_id)).all(), 2)
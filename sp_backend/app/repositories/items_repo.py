@@ -1,20 +1,52 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 from app.models.item import Item
+from app.repositories.spending_rollups_repo import move_item_category_statement
+from app.utils.pagination import PageParams, apply_keyset
 
-def get_items(user_id: UUID, category_id: int, is_favorite: bool, db: Session):
-  query = db.query(Item)
+# include 指定に応じた eager load。アイテム数に関係なくクエリ数は固定
+ITEM_INCLUDES = ("stock", "category", "shopping_list")
+ITEM_PAGE_KEYS = (Item.id,)
+
+def item_load_options(include: tuple[str, ...]):
+  options = []
+  if "category" in include:
+    options.append(joinedload(Item.category))
+  if "stock" in include:
+    options.append(selectinload(Item.stocks))
+  if "shopping_list" in include:
+    options.append(selectinload(Item.shopping_list))
+  return options
+
+def get_items(user_id: UUID, category_id: int, is_favorite: bool, db: Session, include: tuple[str, ...] = (), page: PageParams | None = None):
+  query = db.query(Item).options(*item_load_options(include))
   if category_id is not None:
     query = query.filter(Item.category_id == category_id)
   if is_favorite is not None:
     query = query.filter(Item.is_favorite == is_favorite)
-  return query.filter(Item.user_id == user_id).all()
+  query = query.filter(Item.user_id == user_id)
+  return apply_keyset(query, ITEM_PAGE_KEYS, page).all()
+
+# include なしの一覧用。ItemResponse の列だけを読む
+ITEM_LIST_COLUMNS = (Item.id, Item.name, Item.brand, Item.unit, Item.image_url, Item.default_quantity, Item.notes, Item.is_favorite, Item.user_id, Item.category_id)
+
+def item_rows_query(user_id: UUID, category_id: int, is_favorite: bool, page: PageParams | None = None):
+  query = select(*ITEM_LIST_COLUMNS).where(Item.user_id == user_id)
+  if category_id is not None:
+    query = query.where(Item.category_id == category_id)
+  if is_favorite is not None:
+    query = query.where(Item.is_favorite == is_favorite)
+  return apply_keyset(query, ITEM_PAGE_KEYS, page)
+
+def get_item_rows(user_id: UUID, category_id: int, is_favorite: bool, db: Session, page: PageParams | None = None):
+  return db.execute(item_rows_query(user_id, category_id, is_favorite, page)).all()
 
 def get_item_by_category(category_id: int, db: Session):
   return db.query(Item).filter(Item.category_id == category_id).first()
 
-def get_items_by_id(item_id: int, db: Session):
-  return db.query(Item).filter(Item.id == item_id).first()
+def get_items_by_id(item_id: int, db: Session, include: tuple[str, ...] = ()):
+  return db.query(Item).options(*item_load_options(include)).filter(Item.id == item_id).first()
 
 def create_item(request: Item, db: Session):
   db.add(request)
@@ -22,16 +54,21 @@ def create_item(request: Item, db: Session):
   return request
 
 def update_item(request: Item, db: Session):
+  category_changed = inspect(request).attrs.category_id.history.has_changes()
   __private_db_change(request, db)
+  if category_changed:
+    # 支出の集計はアイテムの現在のカテゴリで数える
+    db.execute(move_item_category_statement(request.id, request.category_id))
   return request
 
+# 子テーブル（在庫・履歴・買い物リスト・記録・集計）は ON DELETE CASCADE で消える
+# 発行するのは items への DELETE 1 文だけ
 def delete_item(request: Item, db: Session):
   db.delete(request)
-  db.commit()
+  db.flush()
   return request
 
 # private
 
 def __private_db_change(data: Item, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
\ No newline at end of file
@@ -1,9 +1,20 @@
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.memo import Memo
+from app.utils.pagination import PageParams, apply_keyset
 
-def get_memos(user_id: UUID, db: Session):
-  return db.query(Memo).filter(Memo.user_id == user_id).all()
+MEMO_PAGE_KEYS = (Memo.id,)
+
+# 一覧用。MemoResponse の列だけを読む
+MEMO_LIST_COLUMNS = (Memo.id, Memo.title, Memo.content, Memo.type, Memo.is_done, Memo.tags, Memo.user_id)
+
+def memos_query(user_id: UUID, page: PageParams | None = None):
+  query = select(*MEMO_LIST_COLUMNS).where(Memo.user_id == user_id)
+  return apply_keyset(query, MEMO_PAGE_KEYS, page)
+
+def get_memos(user_id: UUID, db: Session, page: PageParams | None = None):
+  return db.execute(memos_query(user_id, page)).all()
 
 def get_memo_by_id(memo_id: int, db: Session):
   return db.query(Memo).filter(Memo.id == memo_id).first()
@@ -19,11 +30,10 @@ def update_memo(request: Memo, db: Session):
 
 def delete_memo(request: Memo, db: Session):
   db.delete(request)
-  db.commit()
+  db.flush()
   return request
 
 # private
 
 def __private_db_change(data: Memo, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
\ No newline at end of file
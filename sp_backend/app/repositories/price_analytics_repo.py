@@ -0,0 +1,65 @@
+from uuid import UUID
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.item import Item
+from app.models.shopping_record import ShoppingRecord
+
+DEFAULT_PRICE_WINDOW = 5
+
+# 記録 1 件ごとの単価と、ウィンドウ関数で求めた集計値を 1 回の走査で出す
+# - rolling_avg: 同じアイテムの直近 window 件の平均単価
+# - item_rn / store_rn: アイテム内・店舗内で新しい順の番号（1 が最後に買った記録）
+# - store_* / item_*: 店舗ごと・アイテムごとの最安・最高・件数
+def price_window_query(user_id: UUID, window: int, item_id: int | None = None):
+  r = ShoppingRecord
+  unit_price = r.price / r.quantity
+  by_item = (r.item_id,)
+  by_store = (r.item_id, r.store)
+  oldest_first = (r.bought_at, r.id)
+  newest_first = (r.bought_at.desc(), r.id.desc())
+
+  query = (
+    select(
+      r.id,
+      r.item_id,
+      r.bought_at,
+      r.store,
+      r.quantity,
+      r.price,
+      func.round(unit_price, 2).label("unit_price"),
+      func.round(func.avg(unit_price).over(partition_by=by_item, order_by=oldest_first, rows=(-(window - 1), 0)), 2).label("rolling_avg"),
+      func.row_number().over(partition_by=by_item, order_by=newest_first).label("item_rn"),
+      func.row_number().over(partition_by=by_store, order_by=newest_first).label("store_rn"),
+      func.round(func.min(unit_price).over(partition_by=by_store), 2).label("store_min"),
+      func.round(func.max(unit_price).over(partition_by=by_store), 2).label("store_max"),
+      func.count().over(partition_by=by_store).label("store_count"),
+      func.round(func.min(unit_price).over(partition_by=by_item), 2).label("item_min"),
+      func.round(func.max(unit_price).over(partition_by=by_item), 2).label("item_max"),
+      func.count().over(partition_by=by_item).label("item_count"),
+    )
+    .where(r.user_id == user_id, r.quantity > 0)
+  )
+  if item_id is not None:
+    query = query.where(r.item_id == item_id)
+  return query
+
+# アイテムの全記録（古い順）
+def price_history_query(user_id: UUID, item_id: int, window: int):
+  rows = price_window_query(user_id, window, item_id).subquery()
+  return select(rows).order_by(rows.c.bought_at, rows.c.id)
+
+# アイテム × 店舗ごとの最新の記録だけを残す（item_rn = 1 の行もこの中に含まれる）
+def price_summary_query(user_id: UUID, window: int):
+  rows = price_window_query(user_id, window).subquery()
+  return (
+    select(rows, Item.name)
+    .join(Item, rows.c.item_id == Item.id)
+    .where(rows.c.store_rn == 1)
+    .order_by(rows.c.item_id, rows.c.store)
+  )
+
+def get_price_history(user_id: UUID, item_id: int, window: int, db: Session):
+  return db.execute(price_history_query(user_id, item_id, window)).all()
+
+def get_price_summary(user_id: UUID, window: int, db: Session):
+  return db.execute(price_summary_query(user_id, window)).all()
@@ -1,9 +1,21 @@
 from uuid import UUID
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from app.models.shopping_list import ShoppingList
+from app.utils.pagination import PageParams, apply_keyset
 
-def get_shopping_lists(user_id: UUID, db: Session):
-  return db.query(ShoppingList).filter(ShoppingList.user_id == user_id).all()
+# 新しく追加したものから
+SHOPPING_LIST_PAGE_KEYS = (ShoppingList.added_at, ShoppingList.id)
+
+# 一覧用。ShoppingListResponse の列だけを読む
+SHOPPING_LIST_COLUMNS = (ShoppingList.id, ShoppingList.quantity, ShoppingList.checked, ShoppingList.user_id, ShoppingList.item_id, ShoppingList.added_at)
+
+def shopping_lists_query(user_id: UUID, page: PageParams | None = None):
+  query = select(*SHOPPING_LIST_COLUMNS).where(ShoppingList.user_id == user_id)
+  return apply_keyset(query, SHOPPING_LIST_PAGE_KEYS, page, descending=True)
+
+def get_shopping_lists(user_id: UUID, db: Session, page: PageParams | None = None):
+  return db.execute(shopping_lists_query(user_id, page)).all()
 
 def get_shopping_list_by_id(shopping_list_id: int, db: Session):
   return db.query(ShoppingList).filter(ShoppingList.id == shopping_list_id).first()
@@ -20,13 +32,26 @@ def update_shopping_list(request: ShoppingList, db: Session):
   __private_db_change(request, db)
   return request
 
+def increment_shopping_list(user_id: UUID, item_id: int, db: Session):
+  stmt = increment_shopping_list_statement(user_id, item_id)
+  return db.execute(stmt).scalars().first()
+
+# 非同期リポジトリと共有する
+def increment_shopping_list_statement(user_id: UUID, item_id: int):
+  return (
+    update(ShoppingList)
+    .where(ShoppingList.user_id == user_id, ShoppingList.item_id == item_id)
+    .values(quantity=ShoppingList.quantity + 1)
+    .returning(ShoppingList)
+    .execution_options(synchronize_session=False)
+  )
+
 def delete_shopping_list(request: ShoppingList, db: Session):
   db.delete(request)
-  db.commit()
+  db.flush()
   return request
 
 # private
 
 def __private_db_change(data: ShoppingList, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
\ No newline at end of file
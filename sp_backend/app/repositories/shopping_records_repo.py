@@ -1,73 +1,179 @@
+from datetime import datetime
 from uuid import UUID
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.models.category import Category
 from app.models.item import Item
 from app.models.shopping_record import ShoppingRecord
+from app.models.spending_rollup import SpendingRollup
+from app.repositories.spending_rollups_repo import apply_spending_statements, record_created_statements, record_deleted_statements, record_updated_statements, spending_entry
+from app.repositories.store_prices_repo import record_created_store_statements, record_deleted_store_statements, record_updated_store_statements, store_price_key
+from app.utils.export import EXPORT_BATCH_SIZE
+from app.utils.pagination import PageParams, apply_keyset
+from app.utils.period import UTC_ZONES, SummaryPeriod
 
-def get_shopping_records(user_id: UUID, db: Session):
-  return db.query(ShoppingRecord).filter(ShoppingRecord.user_id == user_id).all()
+# 新しく買ったものから
+SHOPPING_RECORD_PAGE_KEYS = (ShoppingRecord.bought_at, ShoppingRecord.id)
+
+# 一覧用。ShoppingRecordResponse の列だけを読む
+SHOPPING_RECORD_LIST_COLUMNS = (ShoppingRecord.id, ShoppingRecord.quantity, ShoppingRecord.price, ShoppingRecord.store, ShoppingRecord.bought_at, ShoppingRecord.user_id, ShoppingRecord.item_id)
+
+def shopping_records_query(user_id: UUID, page: PageParams | None = None):
+  query = select(*SHOPPING_RECORD_LIST_COLUMNS).where(ShoppingRecord.user_id == user_id)
+  return apply_keyset(query, SHOPPING_RECORD_PAGE_KEYS, page, descending=True)
+
+def get_shopping_records(user_id: UUID, db: Session, page: PageParams | None = None):
+  return db.execute(shopping_records_query(user_id, page)).all()
+
+# エクスポートは古い順。サーバーサイドカーソルで EXPORT_BATCH_SIZE 行ずつ読む
+SHOPPING_RECORD_EXPORT_COLUMNS = ("id", "bought_at", "item_id", "item_name", "store", "quantity", "price")
+
+def shopping_record_export_query(user_id: UUID, period: SummaryPeriod | None = None):
+  query = (
+    select(
+      ShoppingRecord.id,
+      ShoppingRecord.bought_at,
+      ShoppingRecord.item_id,
+      Item.name.label("item_name"),
+      ShoppingRecord.store,
+      ShoppingRecord.quantity,
+      ShoppingRecord.price
+    )
+    .join(Item, ShoppingRecord.item_id == Item.id)
+    .where(ShoppingRecord.user_id == user_id)
+    .order_by(ShoppingRecord.bought_at, ShoppingRecord.id)
+    .execution_options(yield_per=EXPORT_BATCH_SIZE)
+  )
+  if period and period.start is not None:
+    query = query.where(ShoppingRecord.bought_at >= period.start)
+  if period and period.end is not None:
+    query = query.where(ShoppingRecord.bought_at < period.end)
+  return query
+
+# ジェネレーターなので、クエリはレスポンスの送信が始まってから（commit 後に）実行される
+def stream_shopping_records(user_id: UUID, db: Session, period: SummaryPeriod | None = None):
+  result = db.execute(shopping_record_export_query(user_id, period))
+  yield from result.partitions()
 
 def get_shopping_record_by_id(shopping_record_id: int, db: Session):
   return db.query(ShoppingRecord).filter(ShoppingRecord.id == shopping_record_id).first()
 
+# 更新前の値。集計テーブル（spending_rollups / store_prices）の差分更新に使う
+def record_snapshot(record: ShoppingRecord) -> tuple:
+  return spending_entry(record), store_price_key(record)
+
 def create_shopping_record(request: ShoppingRecord, db: Session):
   db.add(request)
   __private_db_change(request, db)
+  apply_spending_statements(record_created_statements(request) + record_created_store_statements(request), db)
   return request
 
-def update_shopping_record(request: ShoppingRecord, db: Session):
+# previous は書き換え前に record_snapshot で取った値
+def update_shopping_record(request: ShoppingRecord, previous: tuple, db: Session):
   __private_db_change(request, db)
+  spending_previous, store_previous = previous
+  apply_spending_statements(record_updated_statements(spending_previous, request) + record_updated_store_statements(store_previous, request), db)
   return request
 
 def delete_shopping_record(request: ShoppingRecord, db: Session):
   db.delete(request)
-  db.commit()
+  db.flush()
+  apply_spending_statements(record_deleted_statements(request) + record_deleted_store_statements(request), db)
   return request
 
-def get_monthly_spending(user_id: UUID, db: Session):
-  query = (
-    db.query(
-      func.date_trunc('month', ShoppingRecord.bought_at).label('month'),
-      func.sum(ShoppingRecord.price * ShoppingRecord.quantity).label('total_amount')
+# サマリーの集計元
+# 全期間か UTC の月境界で区切れる範囲なら spending_rollups、それ以外は shopping_records を
+# (user_id, bought_at) のインデックスで範囲スキャンする
+def uses_spending_rollups(period: SummaryPeriod | None, bucketed: bool = False) -> bool:
+  if period is None:
+    return True
+  if not all(__private_is_month_start(v) for v in (period.start, period.end) if v is not None):
+    return False
+  return not bucketed or (period.tz in UTC_ZONES and period.granularity in ("month", "year"))
+
+# 期間（granularity）ごとの合計。期間は tz の暦で区切り、列名は granularity（month など）
+def spending_timeline_query(user_id: UUID, period: SummaryPeriod | None):
+  granularity = period.granularity if period else "month"
+  rollups = uses_spending_rollups(period, bucketed=True)
+  if rollups:
+    bucket = SpendingRollup.month if granularity == "month" else func.date_trunc(granularity, SpendingRollup.month)
+  else:
+    bought_at = ShoppingRecord.bought_at
+    if period.tz not in UTC_ZONES:
+      bought_at = func.timezone(period.tz, func.timezone("UTC", bought_at))
+    bucket = func.date_trunc(granularity, bought_at)
+
+  rows = __private_spending_rows(user_id, period, bucket.label("bucket"), rollups).subquery()
+  return (
+    select(
+      rows.c.bucket.label(granularity),
+      func.sum(rows.c.amount).label("total_amount")
     )
-    .filter(ShoppingRecord.user_id == user_id)
-    .group_by(func.date_trunc('month', ShoppingRecord.bought_at))
-    .order_by(func.date_trunc('month', ShoppingRecord.bought_at).desc())
+    .group_by(rows.c.bucket)
+    .order_by(rows.c.bucket.desc())
   )
-  return query.all()
 
-def get_spending_by_item(user_id: UUID, db: Session):
-  query = (
-    db.query(
+def spending_by_item_query(user_id: UUID, period: SummaryPeriod | None):
+  rollups = uses_spending_rollups(period)
+  source = SpendingRollup if rollups else ShoppingRecord
+  rows = __private_spending_rows(user_id, period, source.item_id.label("item_id"), rollups).subquery()
+  return (
+    select(
       Item.id,
       Item.name,
-      func.sum(ShoppingRecord.price * ShoppingRecord.quantity).label("total_amount")
+      func.sum(rows.c.amount).label("total_amount")
     )
-    .join(Item, ShoppingRecord.item_id == Item.id)
-    .filter(ShoppingRecord.user_id == user_id)
+    .join(Item, rows.c.item_id == Item.id)
     .group_by(Item.id, Item.name)
-    .order_by(func.sum(ShoppingRecord.price * ShoppingRecord.quantity).desc())
+    .order_by(func.sum(rows.c.amount).desc())
   )
-  return query.all()
 
-def get_spending_by_category(user_id: UUID, db: Session):
-  query = (
-    db.query(
+# 記録はアイテムの現在のカテゴリで集計する（spending_rollups と同じ）
+def spending_by_category_query(user_id: UUID, period: SummaryPeriod | None):
+  rollups = uses_spending_rollups(period)
+  if rollups:
+    category_id = SpendingRollup.category_id
+  else:
+    category_id = select(Item.category_id).where(Item.id == ShoppingRecord.item_id).scalar_subquery()
+  rows = __private_spending_rows(user_id, period, category_id.label("category_id"), rollups).subquery()
+  return (
+    select(
       Category.id,
       Category.name,
-      func.sum(ShoppingRecord.price * ShoppingRecord.quantity).label("total_amount")
+      func.sum(rows.c.amount).label("total_amount")
     )
-    .join(Item, ShoppingRecord.item_id == Item.id)
-    .join(Category, Item.category_id == Category.id)
-    .filter(ShoppingRecord.user_id == user_id)
+    .join(Category, rows.c.category_id == Category.id)
     .group_by(Category.id, Category.name)
-    .order_by(func.sum(ShoppingRecord.price * ShoppingRecord.quantity).desc())
+    .order_by(func.sum(rows.c.amount).desc())
   )
-  return query.all()
+
+def get_monthly_spending(user_id: UUID, db: Session, period: SummaryPeriod | None = None):
+  return db.execute(spending_timeline_query(user_id, period)).all()
+
+def get_spending_by_item(user_id: UUID, db: Session, period: SummaryPeriod | None = None):
+  return db.execute(spending_by_item_query(user_id, period)).all()
+
+def get_spending_by_category(user_id: UUID, db: Session, period: SummaryPeriod | None = None):
+  return db.execute(spending_by_category_query(user_id, period)).all()
 
 # private
 
 def __private_db_change(data: ShoppingRecord, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
+
+# 集計元（spending_rollups か shopping_records）から範囲内の行を金額と key 列で取り出す
+def __private_spending_rows(user_id: UUID, period: SummaryPeriod | None, key, rollups: bool):
+  if rollups:
+    source, at, amount = SpendingRollup, SpendingRollup.month, SpendingRollup.total_amount
+  else:
+    source, at, amount = ShoppingRecord, ShoppingRecord.bought_at, ShoppingRecord.price * ShoppingRecord.quantity
+
+  query = select(key, amount.label("amount")).where(source.user_id == user_id)
+  if period and period.start is not None:
+    query = query.where(at >= period.start)
+  if period and period.end is not None:
+    query = query.where(at < period.end)
+  return query
+
+def __private_is_month_start(value: datetime) -> bool:
+  return value == datetime(value.year, value.month, 1)
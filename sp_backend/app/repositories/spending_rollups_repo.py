@@ -0,0 +1,138 @@
+from decimal import Decimal
+from uuid import UUID
+from sqlalchemy import DateTime, and_, cast, delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.item import Item
+from app.models.shopping_record import ShoppingRecord
+from app.models.spending_rollup import SpendingRollup
+
+# 記録 1 件分の集計キーと金額
+# 更新時は属性を書き換える前に取っておく
+# API が読み込んだ記録に新しい値を代入してからリポジトリに渡し、リポジトリは明示的に flush するので、
+# リポジトリからは変更前の値が分からない（セッションは同期・非同期とも autoflush=False）
+def spending_entry(record: ShoppingRecord) -> tuple:
+  key = (record.user_id, record.item_id, record.bought_at)
+  return key, Decimal(str(record.price)) * Decimal(str(record.quantity))
+
+# 差分を加算する INSERT ... ON CONFLICT DO UPDATE と、件数が 0 になった行の掃除
+def spending_delta_statements(key: tuple, amount: Decimal, count: int) -> list:
+  user_id, item_id, bought_at = key
+  month = func.date_trunc("month", cast(bought_at, DateTime))
+  category_id = select(Item.category_id).where(Item.id == item_id).scalar_subquery()
+
+  upsert = insert(SpendingRollup).values(
+    user_id=user_id,
+    month=month,
+    item_id=item_id,
+    category_id=category_id,
+    total_amount=amount,
+    record_count=count,
+  )
+  upsert = upsert.on_conflict_do_update(
+    index_elements=[SpendingRollup.user_id, SpendingRollup.month, SpendingRollup.item_id],
+    set_={
+      "total_amount": SpendingRollup.total_amount + upsert.excluded.total_amount,
+      "record_count": SpendingRollup.record_count + upsert.excluded.record_count,
+      "category_id": upsert.excluded.category_id,
+    },
+  )
+  if count >= 0:
+    return [upsert]
+
+  cleanup = delete(SpendingRollup).where(
+    SpendingRollup.user_id == user_id,
+    SpendingRollup.month == month,
+    SpendingRollup.item_id == item_id,
+    SpendingRollup.record_count <= 0,
+  )
+  return [upsert, cleanup]
+
+# 追加・削除・更新それぞれで流す文
+def record_created_statements(record: ShoppingRecord) -> list:
+  key, amount = spending_entry(record)
+  return spending_delta_statements(key, amount, 1)
+
+def record_deleted_statements(record: ShoppingRecord) -> list:
+  key, amount = spending_entry(record)
+  return spending_delta_statements(key, -amount, -1)
+
+def record_updated_statements(previous: tuple, record: ShoppingRecord) -> list:
+  old_key, old_amount = previous
+  new_key, new_amount = spending_entry(record)
+  if old_key == new_key:
+    if old_amount == new_amount:
+      return []
+    return spending_delta_statements(new_key, new_amount - old_amount, 0)
+  return spending_delta_statements(old_key, -old_amount, -1) + spending_delta_statements(new_key, new_amount, 1)
+
+def move_item_category_statement(item_id: int, category_id: int):
+  return update(SpendingRollup).where(SpendingRollup.item_id == item_id).values(category_id=category_id)
+
+def apply_spending_statements(statements: list, db: Session):
+  for statement in statements:
+    db.execute(statement)
+
+# 生の shopping_records から集計し直す（user_id なしなら全ユーザー）
+def rebuild_spending_rollups(user_id: UUID | None, db: Session):
+  clear = delete(SpendingRollup)
+  source = __private_raw_rollups()
+  if user_id is not None:
+    clear = clear.where(SpendingRollup.user_id == user_id)
+    source = source.where(ShoppingRecord.user_id == user_id)
+  db.execute(clear)
+  columns = ["user_id", "month", "item_id", "category_id", "total_amount", "record_count"]
+  result = db.execute(insert(SpendingRollup).from_select(columns, source))
+  return result.rowcount
+
+# 集計テーブルと生データの集計が食い違っている行を返す
+def check_spending_rollups(user_id: UUID | None, db: Session):
+  raw = __private_raw_rollups()
+  if user_id is not None:
+    raw = raw.where(ShoppingRecord.user_id == user_id)
+  raw = raw.subquery()
+  rollup = select(SpendingRollup)
+  if user_id is not None:
+    rollup = rollup.where(SpendingRollup.user_id == user_id)
+  rollup = rollup.subquery()
+
+  on = and_(raw.c.user_id == rollup.c.user_id, raw.c.month == rollup.c.month, raw.c.item_id == rollup.c.item_id)
+  query = (
+    select(
+      func.coalesce(raw.c.user_id, rollup.c.user_id).label("user_id"),
+      func.coalesce(raw.c.month, rollup.c.month).label("month"),
+      func.coalesce(raw.c.item_id, rollup.c.item_id).label("item_id"),
+      raw.c.category_id.label("expected_category_id"),
+      rollup.c.category_id.label("actual_category_id"),
+      raw.c.total_amount.label("expected_total_amount"),
+      rollup.c.total_amount.label("actual_total_amount"),
+      raw.c.record_count.label("expected_record_count"),
+      rollup.c.record_count.label("actual_record_count"),
+    )
+    .select_from(raw.join(rollup, on, full=True))
+    .where(or_(
+      raw.c.user_id.is_(None),
+      rollup.c.user_id.is_(None),
+      raw.c.category_id.is_distinct_from(rollup.c.category_id),
+      raw.c.total_amount.is_distinct_from(rollup.c.total_amount),
+      raw.c.record_count.is_distinct_from(rollup.c.record_count),
+    ))
+  )
+  return db.execute(query).all()
+
+# private
+
+def __private_raw_rollups():
+  month = func.date_trunc("month", ShoppingRecord.bought_at)
+  return (
+    select(
+      ShoppingRecord.user_id,
+      month.label("month"),
+      ShoppingRecord.item_id,
+      Item.category_id,
+      func.sum(ShoppingRecord.price * ShoppingRecord.quantity).label("total_amount"),
+      func.count().label("record_count"),
+    )
+    .join(Item, ShoppingRecord.item_id == Item.id)
+    .group_by(ShoppingRecord.user_id, month, ShoppingRecord.item_id, Item.category_id)
+  )
@@ -1,8 +1,45 @@
+from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.stock_history import StockHistory
+from app.utils.export import EXPORT_BATCH_SIZE
+from app.utils.pagination import PageParams, apply_keyset
 
-def get_stock_history_by_item_id(item_id: int, db: Session):
-  return db.query(StockHistory).filter(StockHistory.item_id == item_id).all()
+# 新しい履歴から
+STOCK_HISTORY_PAGE_KEYS = (StockHistory.created_at, StockHistory.id)
+
+# 一覧用。StockHistoryResponse の列だけを読む
+STOCK_HISTORY_LIST_COLUMNS = (StockHistory.id, StockHistory.change, StockHistory.reason, StockHistory.memo, StockHistory.user_id, StockHistory.item_id, StockHistory.created_at)
+
+def stock_history_query(item_id: int, page: PageParams | None = None):
+  query = select(*STOCK_HISTORY_LIST_COLUMNS).where(StockHistory.item_id == item_id)
+  return apply_keyset(query, STOCK_HISTORY_PAGE_KEYS, page, descending=True)
+
+def get_stock_history_by_item_id(item_id: int, db: Session, page: PageParams | None = None):
+  return db.execute(stock_history_query(item_id, page)).all()
+
+# エクスポートは古い順。サーバーサイドカーソルで EXPORT_BATCH_SIZE 行ずつ読む
+STOCK_HISTORY_EXPORT_COLUMNS = ("id", "created_at", "item_id", "change", "reason", "memo")
+
+def stock_history_export_query(item_id: int, user_id: UUID):
+  return (
+    select(
+      StockHistory.id,
+      StockHistory.created_at,
+      StockHistory.item_id,
+      StockHistory.change,
+      StockHistory.reason,
+      StockHistory.memo
+    )
+    .where(StockHistory.item_id == item_id, StockHistory.user_id == user_id)
+    .order_by(StockHistory.created_at, StockHistory.id)
+    .execution_options(yield_per=EXPORT_BATCH_SIZE)
+  )
+
+# ジェネレーターなので、クエリはレスポンスの送信が始まってから（commit 後に）実行される
+def stream_stock_history(item_id: int, user_id: UUID, db: Session):
+  result = db.execute(stock_history_export_query(item_id, user_id))
+  yield from result.partitions()
 
 def create_stock_history(request: StockHistory, db: Session):
   db.add(request)
@@ -12,5 +49,4 @@ def create_stock_history(request: StockHistory, db: Session):
 # private
 
 def __private_db_change(data: StockHistory, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
\ No newline at end of file
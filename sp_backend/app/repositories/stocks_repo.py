@@ -1,9 +1,20 @@
 from uuid import UUID
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from app.models.stock import Stock
+from app.utils.pagination import PageParams, apply_keyset
 
-def get_stocks(user_id: UUID, db: Session):
-  return db.query(Stock).filter(Stock.user_id == user_id).all()
+STOCK_PAGE_KEYS = (Stock.id,)
+
+# 一覧用。StockResponse の列だけを読む
+STOCK_LIST_COLUMNS = (Stock.id, Stock.quantity, Stock.threshold, Stock.location, Stock.user_id, Stock.item_id)
+
+def stocks_query(user_id: UUID, page: PageParams | None = None):
+  query = select(*STOCK_LIST_COLUMNS).where(Stock.user_id == user_id)
+  return apply_keyset(query, STOCK_PAGE_KEYS, page)
+
+def get_stocks(user_id: UUID, db: Session, page: PageParams | None = None):
+  return db.execute(stocks_query(user_id, page)).all()
 
 def get_stock_by_item_id(item_id: int, db: Session):
   return db.query(Stock).filter(Stock.item_id == item_id).first()
@@ -17,8 +28,47 @@ def update_stock(request: Stock, db: Session):
   __private_db_change(request, db)
   return request
 
+def adjust_stock(item_id: int, action: str, quantity: int, threshold: int, location: str, db: Session):
+  stmt = adjust_stock_statement(item_id, action, quantity, threshold, location)
+  return db.execute(stmt).one_or_none()
+
+# 非同期リポジトリと共有する
+def adjust_stock_statement(item_id: int, action: str, quantity: int, threshold: int, location: str):
+  # 変更前の数量を行ロック付きで取り、UPDATE ... RETURNING の 1 文で在庫を更新する
+  current = (
+    select(Stock.id, Stock.quantity.label("old_quantity"))
+    .where(Stock.item_id == item_id)
+    .limit(1)
+    .with_for_update()
+    .subquery()
+  )
+  stmt = update(Stock).where(Stock.id == current.c.id)
+
+  values = {}
+  if quantity:
+    if action == "increase":
+      values["quantity"] = Stock.quantity + quantity
+    elif action == "decrease":
+      values["quantity"] = Stock.quantity - quantity
+      # 在庫不足の判定は述語に含める（該当行なしで返る）
+      stmt = stmt.where(Stock.quantity >= quantity)
+    elif action == "manual":
+      values["quantity"] = quantity
+  if threshold:
+    values["threshold"] = threshold
+  if location:
+    values["location"] = location
+  if not values:
+    values["quantity"] = Stock.quantity
+
+  # 呼び出し側が同じ在庫を読み込み済みでも RETURNING の値で上書きする
+  return (
+    stmt.values(**values)
+    .returning(Stock, current.c.old_quantity)
+    .execution_options(synchronize_session=False, populate_existing=True)
+  )
+
 # private
 
 def __private_db_change(data: Stock, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
\ No newline at end of file
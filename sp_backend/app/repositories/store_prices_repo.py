@@ -0,0 +1,169 @@
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import Numeric, and_, delete, exists, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert
+from sqlalchemy.orm import Session
+from app.models.item import Item
+from app.models.shopping_list import ShoppingList
+from app.models.shopping_record import ShoppingRecord
+from app.models.store_price import StorePrice
+
+STORE_PRICE_COLUMNS = ["user_id", "item_id", "store", "recent_unit_price", "purchase_count", "last_bought_at"]
+# pg_advisory_xact_lock(classid, objid) の classid（store_prices のキー用）
+STORE_PRICE_LOCK_CLASS = 1016
+
+# 記録 1 件が属するキー
+# 更新時は属性を書き換える前に取っておく（spending_entry と同じ理由）
+def store_price_key(record: ShoppingRecord) -> tuple:
+  return (record.user_id, record.item_id, record.store)
+
+# キー 1 つ分を shopping_records から作り直す
+# (user_id, item_id, store, bought_at, id) のインデックスでそのキーの記録だけを読む
+# 直近単価は差分で足せないので作り直すが、READ COMMITTED では同じキーに同時に書いた 2 つのトランザクションが
+# お互いの記録を見ないまま作り直し、後に書いた方の古い値が残りうる
+# 先にキーごとの advisory lock を取ってトランザクションの終わりまで直列にする（ロック後の文は先に commit した側の記録も見える）
+def refresh_store_price_statements(key: tuple) -> list:
+  user_id, item_id, store = key
+  lock = (
+    select(func.pg_advisory_xact_lock(STORE_PRICE_LOCK_CLASS, func.hashtext(f"{user_id}:{item_id}:{store}")))
+    .execution_options(slow_query_explain=False)
+  )
+  source = __private_raw_store_prices().where(
+    ShoppingRecord.user_id == user_id,
+    ShoppingRecord.item_id == item_id,
+    ShoppingRecord.store == store,
+  )
+  upsert = insert(StorePrice).from_select(STORE_PRICE_COLUMNS, source)
+  upsert = upsert.on_conflict_do_update(
+    index_elements=[StorePrice.user_id, StorePrice.item_id, StorePrice.store],
+    set_={
+      "recent_unit_price": upsert.excluded.recent_unit_price,
+      "purchase_count": upsert.excluded.purchase_count,
+      "last_bought_at": upsert.excluded.last_bought_at,
+    },
+  )
+  # 記録が残っていなければ消す
+  cleanup = delete(StorePrice).where(
+    StorePrice.user_id == user_id,
+    StorePrice.item_id == item_id,
+    StorePrice.store == store,
+    ~exists().where(
+      ShoppingRecord.user_id == user_id,
+      ShoppingRecord.item_id == item_id,
+      ShoppingRecord.store == store,
+      ShoppingRecord.quantity > 0,
+    ),
+  )
+  return [lock, upsert, cleanup]
+
+def record_created_store_statements(record: ShoppingRecord) -> list:
+  return refresh_store_price_statements(store_price_key(record))
+
+def record_deleted_store_statements(record: ShoppingRecord) -> list:
+  return refresh_store_price_statements(store_price_key(record))
+
+# キーが変わったときは 2 つのロックを取るので、デッドロックしないよう順番をそろえる
+def record_updated_store_statements(previous_key: tuple, record: ShoppingRecord) -> list:
+  keys = sorted({previous_key, store_price_key(record)}, key=repr)
+  return [statement for key in keys for statement in refresh_store_price_statements(key)]
+
+# 買い物リスト（未チェック）の各アイテムについて、記録のある店舗ごとの直近単価と
+# 店舗ごとのかご合計（その店舗で買えるアイテム分）を 1 クエリで出す
+# - item_rank: アイテム内で安い順（1 が一番安い店舗）
+# - basket_total / basket_items: 店舗ごとの合計金額とアイテム数
+def store_recommendation_query(user_id: UUID, since: datetime | None):
+  line_total = StorePrice.recent_unit_price * ShoppingList.quantity
+  query = (
+    select(
+      ShoppingList.id.label("shopping_list_id"),
+      ShoppingList.item_id,
+      ShoppingList.quantity,
+      Item.name,
+      StorePrice.store,
+      StorePrice.recent_unit_price,
+      StorePrice.purchase_count,
+      StorePrice.last_bought_at,
+      func.row_number().over(
+        partition_by=ShoppingList.item_id,
+        order_by=(StorePrice.recent_unit_price, StorePrice.last_bought_at.desc(), StorePrice.store),
+      ).label("item_rank"),
+      func.sum(line_total).over(partition_by=StorePrice.store).label("basket_total"),
+      func.count().over(partition_by=StorePrice.store).label("basket_items"),
+    )
+    .join(Item, ShoppingList.item_id == Item.id)
+    .outerjoin(StorePrice, and_(
+      StorePrice.user_id == ShoppingList.user_id,
+      StorePrice.item_id == ShoppingList.item_id,
+      *([StorePrice.last_bought_at >= since] if since is not None else []),
+    ))
+    .where(ShoppingList.user_id == user_id, ShoppingList.checked.is_(False))
+    .order_by(ShoppingList.added_at.desc(), ShoppingList.id.desc(), StorePrice.recent_unit_price)
+  )
+  return query
+
+def get_store_recommendation(user_id: UUID, since: datetime | None, db: Session):
+  return db.execute(store_recommendation_query(user_id, since)).all()
+
+# 生の shopping_records から作り直す（user_id なしなら全ユーザー）
+def rebuild_store_prices(user_id: UUID | None, db: Session):
+  clear = delete(StorePrice)
+  source = __private_raw_store_prices()
+  if user_id is not None:
+    clear = clear.where(StorePrice.user_id == user_id)
+    source = source.where(ShoppingRecord.user_id == user_id)
+  db.execute(clear)
+  result = db.execute(insert(StorePrice).from_select(STORE_PRICE_COLUMNS, source))
+  return result.rowcount
+
+# インデックステーブルと生データが食い違っている行を返す
+def check_store_prices(user_id: UUID | None, db: Session):
+  raw = __private_raw_store_prices()
+  if user_id is not None:
+    raw = raw.where(ShoppingRecord.user_id == user_id)
+  raw = raw.subquery()
+  index = select(StorePrice)
+  if user_id is not None:
+    index = index.where(StorePrice.user_id == user_id)
+  index = index.subquery()
+
+  on = and_(raw.c.user_id == index.c.user_id, raw.c.item_id == index.c.item_id, raw.c.store == index.c.store)
+  query = (
+    select(
+      func.coalesce(raw.c.user_id, index.c.user_id).label("user_id"),
+      func.coalesce(raw.c.item_id, index.c.item_id).label("item_id"),
+      func.coalesce(raw.c.store, index.c.store).label("store"),
+      raw.c.recent_unit_price.label("expected_recent_unit_price"),
+      index.c.recent_unit_price.label("actual_recent_unit_price"),
+      raw.c.purchase_count.label("expected_purchase_count"),
+      index.c.purchase_count.label("actual_purchase_count"),
+      raw.c.last_bought_at.label("expected_last_bought_at"),
+      index.c.last_bought_at.label("actual_last_bought_at"),
+    )
+    .select_from(raw.join(index, on, full=True))
+    .where(or_(
+      raw.c.user_id.is_(None),
+      index.c.user_id.is_(None),
+      raw.c.recent_unit_price.is_distinct_from(index.c.recent_unit_price),
+      raw.c.purchase_count.is_distinct_from(index.c.purchase_count),
+      raw.c.last_bought_at.is_distinct_from(index.c.last_bought_at),
+    ))
+  )
+  return db.execute(query).all()
+
+# private
+
+def __private_raw_store_prices():
+  unit_price = ShoppingRecord.price / ShoppingRecord.quantity
+  latest_first = aggregate_order_by(unit_price, ShoppingRecord.bought_at.desc(), ShoppingRecord.id.desc())
+  return (
+    select(
+      ShoppingRecord.user_id,
+      ShoppingRecord.item_id,
+      ShoppingRecord.store,
+      func.array_agg(latest_first, type_=ARRAY(Numeric))[1].label("recent_unit_price"),
+      func.count().label("purchase_count"),
+      func.max(ShoppingRecord.bought_at).label("last_bought_at"),
+    )
+    .where(ShoppingRecord.quantity > 0)
+    .group_by(ShoppingRecord.user_id, ShoppingRecord.item_id, ShoppingRecord.store)
+  )
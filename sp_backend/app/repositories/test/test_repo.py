@@ -10,5 +10,4 @@ def test_create_stock(request: Stock, db: Session):
 # Private
 
 def __private_db_change(data: Stock, db: Session):
-  db.commit()
-  db.refresh(data)
\ No newline at end of file
+  db.flush()
\ No newline at end of file
@@ -0,0 +1,38 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends
+from app.api.v1.aio.categories_api import create_category_api, delete_category_api, get_categories_api, get_category_api, update_category_api
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.schemas.category import CreateCategoryRequest
+from app.schemas.response import SuccessResponse
+from app.utils.auth import get_current_user_async
+from app.utils.pagination import PageParams, page_params
+from database import get_async_db, async_unit_of_work
+
+
+router = APIRouter(prefix="/categories", tags=["categories"], dependencies=[Depends(get_current_user_async), Depends(async_unit_of_work, scope="function")])
+
+@router.get("", response_model=SuccessResponse)
+@query_budget(1)
+async def get_categories(page: PageParams | None = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_categories_api(page, db, current_user)
+
+@router.get("/{category_id}", response_model=SuccessResponse)
+@query_budget(1)
+async def get_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await get_category_api(category_id, db)
+
+@router.post("", response_model=SuccessResponse)
+@query_budget(1)
+async def create_category(request: CreateCategoryRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await create_category_api(request, db, current_user)
+
+@router.put("/{category_id}", response_model=SuccessResponse)
+@query_budget(2)
+async def update_category(category_id: int, request: CreateCategoryRequest, db: AsyncSession = Depends(get_async_db)):
+  return await update_category_api(category_id, request, db)
+
+@router.delete("/{category_id}", response_model=SuccessResponse)
+@query_budget(3)
+async def delete_category(category_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await delete_category_api(category_id, db)
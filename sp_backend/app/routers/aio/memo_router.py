@@ -0,0 +1,38 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends
+from app.api.v1.aio.memo_api import create_memo_api, delete_memo_api, get_memo_api, get_memos_api, update_memo_api
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.schemas.memo import CreateMemoRequest
+from app.schemas.response import SuccessResponse
+from app.utils.auth import get_current_user_async
+from app.utils.pagination import PageParams, page_params
+from database import get_async_db, async_unit_of_work
+
+
+router = APIRouter(prefix="/memos", tags=["memos"], dependencies=[Depends(get_current_user_async), Depends(async_unit_of_work, scope="function")])
+
+@router.get("", response_model=SuccessResponse)
+@query_budget(1)
+async def get_memos(page: PageParams | None = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_memos_api(page, db, current_user)
+
+@router.get("/{memo_id}", response_model=SuccessResponse)
+@query_budget(1)
+async def get_memo(memo_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await get_memo_api(memo_id, db)
+
+@router.post("", response_model=SuccessResponse)
+@query_budget(1)
+async def create_memo(request: CreateMemoRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await create_memo_api(request, db, current_user)
+
+@router.put("/{memo_id}", response_model=SuccessResponse)
+@query_budget(2)
+async def update_memo(memo_id: int, request: CreateMemoRequest, db: AsyncSession = Depends(get_async_db)):
+  return await update_memo_api(memo_id, request, db)
+
+@router.delete("/{memo_id}", response_model=SuccessResponse)
+@query_budget(2)
+async def delete_memo(memo_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await delete_memo_api(memo_id, db)
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.aio.shopping_list_api import create_shopping_list_api, delete_shopping_list_api, get_shopping_list_api, get_shopping_lists_api, get_store_recommendation_api, update_shopping_list_api
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.schemas.response import SuccessResponse
+from app.schemas.shopping_list import ShoppingListCheckRequest, ShoppingListRequest
+from app.utils.auth import get_current_user_async
+from app.utils.pagination import PageParams, page_params
+from database import get_async_db, async_unit_of_work
+
+router = APIRouter(prefix="/shopping-list", tags=["shopping-list"], dependencies=[Depends(get_current_user_async), Depends(async_unit_of_work, scope="function")])
+
+@router.get("", response_model=SuccessResponse)
+@query_budget(1)
+async def get_shopping_lists(page: PageParams | None = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_shopping_lists_api(page, db, current_user)
+
+# 未チェックのアイテムごとの一番安い店舗と、店舗ごとのかご合計
+# recent_days 日以内に買った店舗だけを候補にする（省略時は 180 日）
+@router.get("/store-recommendation", response_model=SuccessResponse)
+@query_budget(1)
+async def get_store_recommendation(recent_days: int | None = Query(180, ge=1), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_store_recommendation_api(recent_days, db, current_user)
+
+@router.get("/{shopping_list_id}", response_model=SuccessResponse)
+@query_budget(1)
+async def get_shopping_list(shopping_list_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await get_shopping_list_api(shopping_list_id, db)
+
+@router.post("", response_model=SuccessResponse)
+@query_budget(2)
+async def create_shopping_list(request: ShoppingListRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await create_shopping_list_api(request, db, current_user)
+
+@router.put("/{shopping_list_id}", response_model=SuccessResponse)
+@query_budget(2)
+async def update_shopping_list(shopping_list_id: int, request: ShoppingListCheckRequest, db: AsyncSession = Depends(get_async_db)):
+  return await update_shopping_list_api(shopping_list_id, request, db)
+
+@router.delete("/{shopping_list_id}", response_model=SuccessResponse)
+@query_budget(2)
+async def delete_shopping_list(shopping_list_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await delete_shopping_list_api(shopping_list_id, db)
\ No newline at end of file
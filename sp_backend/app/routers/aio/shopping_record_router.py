@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.aio.shopping_records_api import create_shopping_record_api, delete_shopping_record_api, export_shopping_records_api, get_monthly_spending_api, get_shopping_record_api, get_shopping_records_api, get_spending_by_category_api, get_spending_by_item_api, update_shopping_record_api
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.schemas.response import SuccessResponse
+from app.schemas.shopping_record import ShoppingRecordRequest, ShoppingRecordUpdateRequest
+from app.utils.auth import get_current_user_async
+from app.utils.export import ExportFormat
+from app.utils.pagination import PageParams, page_params
+from app.utils.period import SummaryPeriod, summary_period, summary_range
+from database import get_async_db, async_unit_of_work
+
+router = APIRouter(prefix="/shopping-records", tags=["shopping-records"], dependencies=[Depends(get_current_user_async), Depends(async_unit_of_work, scope="function")])
+
+@router.get("", response_model=SuccessResponse)
+@query_budget(1)
+async def get_shopping_records(page: PageParams | None = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_shopping_records_api(page, db, current_user)
+
+# format=csv|ndjson。/{shopping_record_id} より先に宣言する
+@router.get("/export")
+@query_budget(1)
+async def export_shopping_records(format: ExportFormat = "csv", period: SummaryPeriod = Depends(summary_range), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await export_shopping_records_api(format, period, db, current_user)
+
+@router.get("/{shopping_record_id}", response_model=SuccessResponse)
+@query_budget(1)
+async def get_shopping_record(shopping_record_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await get_shopping_record_api(shopping_record_id, db)
+
+@router.post("", response_model=SuccessResponse)
+@query_budget(12)
+async def create_shopping_record(request: ShoppingRecordRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await create_shopping_record_api(request, db, current_user)
+
+@router.put("/{shopping_record_id}", response_model=SuccessResponse)
+@query_budget(17)
+async def update_shopping_record(shopping_record_id: int, request: ShoppingRecordUpdateRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await update_shopping_record_api(shopping_record_id, request, db, current_user)
+
+@router.delete("/{shopping_record_id}", response_model=SuccessResponse)
+@query_budget(7)
+async def delete_shopping_record(shopping_record_id: int, db: AsyncSession = Depends(get_async_db)):
+  return await delete_shopping_record_api(shopping_record_id, db)
+
+# from / to（to は含まない）で範囲を絞り、granularity=day|week|month|year ごとに tz の暦で集計する
+@router.get("/summary/monthly")
+@query_budget(1)
+async def monthly_summary(period: SummaryPeriod = Depends(summary_period), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_monthly_spending_api(period, db, current_user)
+
+@router.get("/summary/items")
+@query_budget(1)
+async def item_summary(period: SummaryPeriod = Depends(summary_range), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_spending_by_item_api(period, db, current_user)
+
+@router.get("/summary/categories")
+@query_budget(1)
+async def category_summary(period: SummaryPeriod = Depends(summary_range), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_spending_by_category_api(period, db, current_user)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.aio.stock_api import create_stock_api, get_stock_forecast_api, get_stocks_api
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.schemas.response import SuccessResponse
+from app.schemas.stock import StockOnlyRequest
+from app.utils.auth import get_current_user_async
+from app.utils.pagination import PageParams, page_params
+from database import get_async_db, async_unit_of_work
+
+
+router = APIRouter(prefix="/stocks", tags=["stocks"], dependencies=[Depends(get_current_user_async), Depends(async_unit_of_work, scope="function")])
+
+@router.get("", response_model=SuccessResponse)
+@query_budget(1)
+async def get_stocks(page: PageParams | None = Depends(page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_stocks_api(page, db, current_user)
+
+# 在庫履歴の減り方から 1 日あたりの消費量と在庫が尽きる日を予測する
+@router.get("/forecast", response_model=SuccessResponse)
+@query_budget(2)
+async def get_stock_forecast(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await get_stock_forecast_api(db, current_user)
+
+@router.post("", response_model=SuccessResponse)
+@query_budget(1)
+async def create_stoc(request: StockOnlyRequest, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+  return await create_stock_api(request, db, current_user)
\ No newline at end of file
@@ -0,0 +1,39 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.query_budget import query_budget
+from app.core.response_cache import mark_user_changed
+from app.core.token_cache import token_cache
+from app.models.user import User
+from app.schemas.response import SuccessResponse
+from app.schemas.user import UpdateMeRequest
+from app.utils.auth import get_current_user_async
+from app.utils.response import success
+from database import get_async_db, async_unit_of_work
+
+router = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(get_current_user_async), Depends(async_unit_of_work, scope="function")])
+
+@router.get("/me", response_model=SuccessResponse)
+@query_budget(2)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+  return success({
+    "name": current_user.name,
+    "email": current_user.email,
+  })
+
+@router.put("/me")
+@query_budget(1)
+async def update_me(
+    body: UpdateMeRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    current_user.name = body.name
+    await db.flush()
+    token_cache.evict_user(current_user.id)
+    mark_user_changed(db, current_user.id)
+
+    return success({
+    "name": current_user.name,
+    "email": current_user.email,
+  })
@@ -0,0 +1,21 @@
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from app.api.v1.analytics_api import get_price_analytics_api
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.repositories.price_analytics_repo import DEFAULT_PRICE_WINDOW
+from app.schemas.response import SuccessResponse
+from app.utils.auth import get_current_user
+from database import get_db, unit_of_work
+
+router = APIRouter(prefix="/analytics", tags=["analytics"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
+
+# アイテムごとの最終購入単価・移動平均（直近 window 件）・店舗別の最安 / 最高
+@router.get("/prices", response_model=SuccessResponse)
+@query_budget(1)
+def get_price_analytics(
+  window: int = Query(DEFAULT_PRICE_WINDOW, ge=1, le=100),
+  db: Session = Depends(get_db),
+  current_user: User = Depends(get_current_user),
+):
+  return get_price_analytics_api(window, db, current_user)
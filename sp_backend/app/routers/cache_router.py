@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from app.core.query_budget import query_budget
+from app.core.response_cache import response_cache
+from app.core.token_cache import token_cache
+from app.schemas.response import SuccessResponse
+from app.utils.auth import require_admin
+from app.utils.response import success
+
+router = APIRouter(prefix="/cache", tags=["cache"], dependencies=[Depends(require_admin)])
+
+# レスポンスキャッシュと ID トークンキャッシュのヒット率など（プロセス単位。ADMIN_TOKEN が必要）
+@router.get("/stats", response_model=SuccessResponse)
+@query_budget(0)
+def get_cache_stats():
+  return success({
+    "response": response_cache.stats(),
+    "token": token_cache.stats(),
+  })
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from app.core.compression import compression_stats
+from app.core.query_budget import query_budget
+from app.schemas.response import SuccessResponse
+from app.utils.auth import require_admin
+from app.utils.response import success
+
+router = APIRouter(prefix="/compression", tags=["compression"], dependencies=[Depends(require_admin)])
+
+# ルートごとの圧縮率（圧縮後 / 圧縮前）と圧縮にかかった CPU 時間（プロセス単位。ADMIN_TOKEN が必要）
+@router.get("/stats", response_model=SuccessResponse)
+@query_budget(0)
+def get_compression_stats():
+  return success(compression_stats.stats())
@@ -0,0 +1,22 @@
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from app.api.v1.dashboard_api import get_dashboard_api
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.schemas.response import SuccessResponse
+from app.utils.auth import get_current_user
+from database import get_db, unit_of_work
+
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
+
+# sections はカンマ区切り（例: low_stock,shopping_list）。省略時は全セクション
+@router.get("", response_model=SuccessResponse)
+@query_budget(3)
+def get_dashboard(
+  sections: str | None = None,
+  limit: int | None = Query(None, ge=1, le=100),
+  db: Session = Depends(get_db),
+  current_user: User = Depends(get_current_user),
+):
+  return get_dashboard_api(sections, limit, db, current_user)
@@ -1,43 +1,66 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.api.v1.items_api import create_item_api, delete_item_api, get_item_api, get_items_api, get_stock_by_item_id_api, get_stock_history_by_item_id_api, update_item_api, update_stock_api
+from app.api.v1.items_api import create_item_api, delete_item_api, export_stock_history_api, get_item_api, get_items_api, get_price_history_api, get_stock_by_item_id_api, get_stock_history_by_item_id_api, update_item_api, update_stock_api
+from app.core.query_budget import query_budget
 from app.models.user import User
+from app.repositories.price_analytics_repo import DEFAULT_PRICE_WINDOW
 from app.schemas.item import ItemRequest
 from app.schemas.response import SuccessResponse
 from app.schemas.stock import StockRequest
 from app.utils.auth import get_current_user
-from database import get_db
+from app.utils.export import ExportFormat
+from app.utils.pagination import PageParams, page_params
+from database import get_db, unit_of_work
 
-router = APIRouter(prefix="/items", tags=["items"], dependencies=[Depends(get_current_user)])
+router = APIRouter(prefix="/items", tags=["items"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
 
 @router.get("", response_model=SuccessResponse)
-def get_items(category_id: int | None = None, is_favorite: bool | None = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_items_api(category_id, is_favorite, db, current_user)
+@query_budget(3)
+def get_items(category_id: int | None = None, is_favorite: bool | None = None, include: str | None = None, page: PageParams | None = Depends(page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_items_api(category_id, is_favorite, include, page, db, current_user)
 
 @router.get("/{item_id}", response_model=SuccessResponse)
-def get_item(item_id: int, db: Session = Depends(get_db)):
-  return get_item_api(item_id, db)
+@query_budget(3)
+def get_item(item_id: int, include: str | None = None, db: Session = Depends(get_db)):
+  return get_item_api(item_id, include, db)
 
 @router.post("", response_model=SuccessResponse)
+@query_budget(1)
 def create_item(request: ItemRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return create_item_api(request, db, current_user)
 
 @router.put("/{item_id}", response_model=SuccessResponse)
+@query_budget(3)
 def update_item(item_id: int, request: ItemRequest, db: Session = Depends(get_db)):
   return update_item_api(item_id, request, db)
 
 @router.delete("/{item_id}", response_model=SuccessResponse)
+@query_budget(2)
 def delete_item(item_id: int, db: Session = Depends(get_db)):
   return delete_item_api(item_id, db)
 
 @router.get("/{item_id}/stock", response_model=SuccessResponse)
+@query_budget(1)
 def get_stock_by_item_id(item_id: int, db: Session = Depends(get_db)):
   return get_stock_by_item_id_api(item_id, db)
 
 @router.put("/{item_id}/stock", response_model=SuccessResponse)
+@query_budget(5)
 def update_stock(item_id: int, request: StockRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return update_stock_api(item_id, request, db, current_user)
 
 @router.get("/{item_id}/stock-history", response_model=SuccessResponse)
-def get_stock_history_by_item_id(item_id: int, db: Session = Depends(get_db)):
-  return get_stock_history_by_item_id_api(item_id, db)
+@query_budget(1)
+def get_stock_history_by_item_id(item_id: int, page: PageParams | None = Depends(page_params), db: Session = Depends(get_db)):
+  return get_stock_history_by_item_id_api(item_id, page, db)
+
+@router.get("/{item_id}/stock-history/export")
+@query_budget(2)
+def export_stock_history(item_id: int, format: ExportFormat = "csv", db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return export_stock_history_api(item_id, format, db, current_user)
+
+# 単価の推移。rolling_avg は直近 window 件の移動平均
+@router.get("/{item_id}/price-history", response_model=SuccessResponse)
+@query_budget(2)
+def get_price_history(item_id: int, window: int = Query(DEFAULT_PRICE_WINDOW, ge=1, le=100), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_price_history_api(item_id, window, db, current_user)
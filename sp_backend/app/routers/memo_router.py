@@ -1,31 +1,38 @@
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends
 from app.api.v1.memo_api import create_memo_api, delete_memo_api, get_memo_api, get_memos_api, update_memo_api
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.schemas.memo import CreateMemoRequest
 from app.schemas.response import SuccessResponse
 from app.utils.auth import get_current_user
-from database import get_db
+from app.utils.pagination import PageParams, page_params
+from database import get_db, unit_of_work
 
 
-router = APIRouter(prefix="/memos", tags=["memos"], dependencies=[Depends(get_current_user)])
+router = APIRouter(prefix="/memos", tags=["memos"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
 
 @router.get("", response_model=SuccessResponse)
-def get_memos(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_memos_api(db, current_user)
+@query_budget(1)
+def get_memos(page: PageParams | None = Depends(page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_memos_api(page, db, current_user)
 
 @router.get("/{memo_id}", response_model=SuccessResponse)
+@query_budget(1)
 def get_memo(memo_id: int, db: Session = Depends(get_db)):
   return get_memo_api(memo_id, db)
 
 @router.post("", response_model=SuccessResponse)
+@query_budget(1)
 def create_memo(request: CreateMemoRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return create_memo_api(request, db, current_user)
 
 @router.put("/{memo_id}", response_model=SuccessResponse)
+@query_budget(2)
 def update_memo(memo_id: int, request: CreateMemoRequest, db: Session = Depends(get_db)):
   return update_memo_api(memo_id, request, db)
 
 @router.delete("/{memo_id}", response_model=SuccessResponse)
+@query_budget(2)
 def delete_memo(memo_id: int, db: Session = Depends(get_db)):
   return delete_memo_api(memo_id, db)
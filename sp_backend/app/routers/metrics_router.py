@@ -0,0 +1,21 @@
+import os
+import secrets
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics_registry
+from app.core.query_budget import query_budget
+from app.utils.response import error
+
+# Prometheus のテキスト形式。スクレイパー向けなので /api/v1 の外に置き、Firebase の認証は通さない
+# METRICS_TOKEN を設定したときは Authorization: Bearer <METRICS_TOKEN> を要求する
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter(tags=["metrics"])
+
+# async def にしておく（スレッドプールの使用状況はイベントループ上でしか読めない）
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+@query_budget(0)
+async def get_metrics(request: Request):
+  if METRICS_TOKEN and not secrets.compare_digest(request.headers.get("authorization", "").encode(), f"Bearer {METRICS_TOKEN}".encode()):
+    return error("Invalid metrics token", 401)
+  return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
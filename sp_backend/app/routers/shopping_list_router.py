@@ -1,30 +1,44 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app.api.v1.shopping_list_api import create_shopping_list_api, delete_shopping_list_api, get_shopping_list_api, get_shopping_lists_api, update_shopping_list_api
+from app.api.v1.shopping_list_api import create_shopping_list_api, delete_shopping_list_api, get_shopping_list_api, get_shopping_lists_api, get_store_recommendation_api, update_shopping_list_api
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.schemas.response import SuccessResponse
 from app.schemas.shopping_list import ShoppingListCheckRequest, ShoppingListRequest
 from app.utils.auth import get_current_user
-from database import get_db
+from app.utils.pagination import PageParams, page_params
+from database import get_db, unit_of_work
 
-router = APIRouter(prefix="/shopping-list", tags=["shopping-list"], dependencies=[Depends(get_current_user)])
+router = APIRouter(prefix="/shopping-list", tags=["shopping-list"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
 
 @router.get("", response_model=SuccessResponse)
-def get_shopping_lists(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_shopping_lists_api(db, current_user)
+@query_budget(1)
+def get_shopping_lists(page: PageParams | None = Depends(page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_shopping_lists_api(page, db, current_user)
+
+# 未チェックのアイテムごとの一番安い店舗と、店舗ごとのかご合計
+# recent_days 日以内に買った店舗だけを候補にする（省略時は 180 日）
+@router.get("/store-recommendation", response_model=SuccessResponse)
+@query_budget(1)
+def get_store_recommendation(recent_days: int | None = Query(180, ge=1), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_store_recommendation_api(recent_days, db, current_user)
 
 @router.get("/{shopping_list_id}", response_model=SuccessResponse)
+@query_budget(1)
 def get_shopping_list(shopping_list_id: int, db: Session = Depends(get_db)):
   return get_shopping_list_api(shopping_list_id, db)
 
 @router.post("", response_model=SuccessResponse)
+@query_budget(2)
 def create_shopping_list(request: ShoppingListRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return create_shopping_list_api(request, db, current_user)
 
 @router.put("/{shopping_list_id}", response_model=SuccessResponse)
+@query_budget(2)
 def update_shopping_list(shopping_list_id: int, request: ShoppingListCheckRequest, db: Session = Depends(get_db)):
   return update_shopping_list_api(shopping_list_id, request, db)
 
 @router.delete("/{shopping_list_id}", response_model=SuccessResponse)
+@query_budget(2)
 def delete_shopping_list(shopping_list_id: int, db: Session = Depends(get_db)):
   return delete_shopping_list_api(shopping_list_id, db)
\ No newline at end of file
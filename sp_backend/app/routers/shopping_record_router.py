@@ -1,42 +1,61 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.api.v1.shopping_records_api import create_shopping_record_api, delete_shopping_record_api, get_monthly_spending_api, get_shopping_record_api, get_shopping_records_api, get_spending_by_category_api, get_spending_by_item_api, update_shopping_record_api
+from app.api.v1.shopping_records_api import create_shopping_record_api, delete_shopping_record_api, export_shopping_records_api, get_monthly_spending_api, get_shopping_record_api, get_shopping_records_api, get_spending_by_category_api, get_spending_by_item_api, update_shopping_record_api
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.schemas.response import SuccessResponse
 from app.schemas.shopping_record import ShoppingRecordRequest, ShoppingRecordUpdateRequest
 from app.utils.auth import get_current_user
-from database import get_db
+from app.utils.export import ExportFormat
+from app.utils.pagination import PageParams, page_params
+from app.utils.period import SummaryPeriod, summary_period, summary_range
+from database import get_db, unit_of_work
 
-router = APIRouter(prefix="/shopping-records", tags=["shopping-records"], dependencies=[Depends(get_current_user)])
+router = APIRouter(prefix="/shopping-records", tags=["shopping-records"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
 
 @router.get("", response_model=SuccessResponse)
-def get_shopping_records(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_shopping_records_api(db, current_user)
+@query_budget(1)
+def get_shopping_records(page: PageParams | None = Depends(page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_shopping_records_api(page, db, current_user)
+
+# format=csv|ndjson。/{shopping_record_id} より先に宣言する
+@router.get("/export")
+@query_budget(1)
+def export_shopping_records(format: ExportFormat = "csv", period: SummaryPeriod = Depends(summary_range), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return export_shopping_records_api(format, period, db, current_user)
 
 @router.get("/{shopping_record_id}", response_model=SuccessResponse)
+@query_budget(1)
 def get_shopping_record(shopping_record_id: int, db: Session = Depends(get_db)):
   return get_shopping_record_api(shopping_record_id, db)
 
 @router.post("", response_model=SuccessResponse)
+@query_budget(12)
 def create_shopping_record(request: ShoppingRecordRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return create_shopping_record_api(request, db, current_user)
 
 @router.put("/{shopping_record_id}", response_model=SuccessResponse)
+@query_budget(17)
 def update_shopping_record(shopping_record_id: int, request: ShoppingRecordUpdateRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return update_shopping_record_api(shopping_record_id, request, db, current_user)
 
 @router.delete("/{shopping_record_id}", response_model=SuccessResponse)
+@query_budget(7)
 def delete_shopping_record(shopping_record_id: int, db: Session = Depends(get_db)):
   return delete_shopping_record_api(shopping_record_id, db)
 
+# from / to（to は含まない）で範囲を絞り、granularity=day|week|month|year ごとに tz の暦で集計する
 @router.get("/summary/monthly")
-def monthly_summary(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_monthly_spending_api(db, current_user)
+@query_budget(1)
+def monthly_summary(period: SummaryPeriod = Depends(summary_period), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_monthly_spending_api(period, db, current_user)
 
 @router.get("/summary/items")
-def item_summary(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_spending_by_item_api(db, current_user)
+@query_budget(1)
+def item_summary(period: SummaryPeriod = Depends(summary_range), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_spending_by_item_api(period, db, current_user)
 
 @router.get("/summary/categories")
-def category_summary(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_spending_by_category_api(db, current_user)
+@query_budget(1)
+def category_summary(period: SummaryPeriod = Depends(summary_range), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_spending_by_category_api(period, db, current_user)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.query_budget import query_budget
+from app.core.slow_query_log import slow_query_log
+from app.schemas.response import SuccessResponse
+from app.utils.auth import require_admin
+from app.utils.response import success
+
+router = APIRouter(prefix="/slow-queries", tags=["slow-queries"], dependencies=[Depends(require_admin)])
+
+# しきい値を超えた SQL（新しい順、プロセス単位）。explain は取れたものだけ plan が入る
+# 他のユーザーのリクエストの SQL も含むので ADMIN_TOKEN を要求する
+@router.get("", response_model=SuccessResponse)
+@query_budget(0)
+def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+  return success(slow_query_log.entries(limit))
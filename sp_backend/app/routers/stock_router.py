@@ -1,19 +1,29 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.api.v1.stock_api import create_stock_api, get_stocks_api
+from app.api.v1.stock_api import create_stock_api, get_stock_forecast_api, get_stocks_api
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.schemas.response import SuccessResponse
 from app.schemas.stock import StockOnlyRequest
 from app.utils.auth import get_current_user
-from database import get_db
+from app.utils.pagination import PageParams, page_params
+from database import get_db, unit_of_work
 
 
-router = APIRouter(prefix="/stocks", tags=["stocks"], dependencies=[Depends(get_current_user)])
+router = APIRouter(prefix="/stocks", tags=["stocks"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
 
 @router.get("", response_model=SuccessResponse)
-def get_stocks(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-  return get_stocks_api(db, current_user)
+@query_budget(1)
+def get_stocks(page: PageParams | None = Depends(page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_stocks_api(page, db, current_user)
+
+# 在庫履歴の減り方から 1 日あたりの消費量と在庫が尽きる日を予測する
+@router.get("/forecast", response_model=SuccessResponse)
+@query_budget(2)
+def get_stock_forecast(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+  return get_stock_forecast_api(db, current_user)
 
 @router.post("", response_model=SuccessResponse)
+@query_budget(1)
 def create_stoc(request: StockOnlyRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return create_stock_api(request, db, current_user)
\ No newline at end of file
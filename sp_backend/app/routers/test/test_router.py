@@ -2,14 +2,16 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.api.test.test_api import create_stock_test_api
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.schemas.response import SuccessResponse
 from app.schemas.stock import StockTestRequest
 from app.utils.auth import get_current_user
-from database import get_db
+from database import get_db, unit_of_work
 
-router = APIRouter(prefix="/test", tags=["test"], dependencies=[Depends(get_current_user)])
+router = APIRouter(prefix="/test", tags=["test"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
 
 @router.post("/{item_id}", response_model=SuccessResponse)
+@query_budget(1)
 def create_stock_test(item_id, request: StockTestRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
   return create_stock_test_api(item_id, request, db, current_user)
\ No newline at end of file
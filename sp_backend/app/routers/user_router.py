@@ -1,16 +1,20 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
+from app.core.query_budget import query_budget
+from app.core.response_cache import mark_user_changed
+from app.core.token_cache import token_cache
 from app.models.user import User
 from app.schemas.response import SuccessResponse
 from app.schemas.user import UpdateMeRequest
 from app.utils.auth import get_current_user
 from app.utils.response import success
-from database import get_db
+from database import get_db, unit_of_work
 
-router = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(get_current_user)])
+router = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(get_current_user), Depends(unit_of_work, scope="function")])
 
 @router.get("/me", response_model=SuccessResponse)
+@query_budget(2)
 def get_me(current_user: User = Depends(get_current_user)):
   return success({
     "name": current_user.name,
@@ -18,14 +22,16 @@ def get_me(current_user: User = Depends(get_current_user)):
   })
 
 @router.put("/me")
+@query_budget(1)
 def update_me(
     body: UpdateMeRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     current_user.name = body.name
-    db.commit()
-    db.refresh(current_user)
+    db.flush()
+    token_cache.evict_user(current_user.id)
+    mark_user_changed(db, current_user.id)
 
     return success({
     "name": current_user.name,
@@ -0,0 +1,13 @@
+from typing import Optional
+from app.schemas.item import ItemResponse
+from app.schemas.shopping_list import ShoppingListResponse
+from app.schemas.stock import StockResponse
+
+class DashboardItemResponse(ItemResponse):
+  category_name: Optional[str] = None
+  stock: Optional[StockResponse] = None
+
+class DashboardShoppingListResponse(ShoppingListResponse):
+  name: str
+  image_url: Optional[str] = None
+  notes: Optional[str] = None
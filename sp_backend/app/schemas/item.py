@@ -1,6 +1,9 @@
 from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel, field_validator
+from app.schemas.category import CategoryResponse
+from app.schemas.shopping_list import ShoppingListResponse
+from app.schemas.stock import StockResponse
 
 class ItemResponse(BaseModel):
   id: int
@@ -18,6 +21,12 @@ class ItemResponse(BaseModel):
     "from_attributes": True
   }
 
+# include で指定された関連だけがレスポンスに含まれる
+class ItemDetailResponse(ItemResponse):
+  stock: Optional[StockResponse] = None
+  category: Optional[CategoryResponse] = None
+  shopping_list: Optional[list[ShoppingListResponse]] = None
+
 class ItemRequest(BaseModel):
   name: str
   brand: Optional[str] = None
@@ -0,0 +1,40 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+class PricePointResponse(BaseModel):
+  id: int
+  bought_at: datetime
+  store: str
+  quantity: int
+  price: int
+  unit_price: float
+  rolling_avg: float
+
+  model_config = {
+    "from_attributes": True
+  }
+
+class StorePriceResponse(BaseModel):
+  store: str
+  last_unit_price: float
+  min_unit_price: float
+  max_unit_price: float
+  count: int
+
+class ItemPriceSummaryResponse(BaseModel):
+  item_id: int
+  name: Optional[str] = None
+  last_unit_price: float
+  last_store: str
+  last_bought_at: datetime
+  rolling_avg: float
+  min_unit_price: float
+  max_unit_price: float
+  count: int
+  stores: list[StorePriceResponse]
+
+class PriceHistoryResponse(BaseModel):
+  item_id: int
+  summary: Optional[ItemPriceSummaryResponse] = None
+  points: list[PricePointResponse]
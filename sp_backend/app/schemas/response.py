@@ -1,9 +1,11 @@
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, Optional
 
 class SuccessResponse(BaseModel):
   success: bool = True
   data: Any
+  # ページネーション時のみ。続きがなければ null
+  next_cursor: Optional[str] = None
 
 class ErrorResponse(BaseModel):
   success: bool = False
@@ -1,4 +1,5 @@
-from typing import Literal
+from datetime import datetime
+from typing import Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel, field_validator
 from app.schemas.stock_history import StockHistoryRequest
@@ -15,6 +16,15 @@ class StockResponse(BaseModel):
     "from_attributes": True
   }
 
+# rate_per_day / days_of_supply / run_out_at は履歴が足りないと None
+class StockForecastResponse(BaseModel):
+  item_id: int
+  quantity: float
+  rate_per_day: Optional[float] = None
+  days_of_supply: Optional[float] = None
+  run_out_at: Optional[datetime] = None
+  samples: int
+
 class StockRequest(StockHistoryRequest):
   action: Literal["increase", "decrease", "manual"]
   quantity: int
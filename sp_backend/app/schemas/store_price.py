@@ -0,0 +1,29 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+class StoreOfferResponse(BaseModel):
+  store: str
+  unit_price: float
+  purchase_count: int
+  last_bought_at: datetime
+
+class StoreRecommendationItemResponse(BaseModel):
+  shopping_list_id: int
+  item_id: int
+  name: str
+  quantity: int
+  # 記録のある店舗のうち直近単価が一番安いもの。記録がなければ None
+  cheapest: Optional[StoreOfferResponse] = None
+  store_count: int
+
+class StoreBasketResponse(BaseModel):
+  store: str
+  basket_total: float
+  item_count: int
+  # この店舗で買った記録のないアイテム数
+  missing_item_count: int
+
+class StoreRecommendationResponse(BaseModel):
+  items: list[StoreRecommendationItemResponse]
+  stores: list[StoreBasketResponse]
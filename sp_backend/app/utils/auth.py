@@ -1,41 +1,132 @@
+import os
+import secrets
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from firebase_admin import auth
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.metrics import auth_verify_duration, auth_verify_failures
+from app.core.request_metrics import measure
+from app.core.token_cache import token_cache
+from app.core.token_verifier import get_token_verifier
 from app.models.user import User
-from database import get_db
+from database import get_async_db, get_db
 
 security = HTTPBearer()
 
+# 運用向けのエンドポイント（プロセス全体の統計・他のユーザーのリクエストの SQL が見える）は
+# Firebase のトークンではなく Authorization: Bearer <ADMIN_TOKEN> を要求する。未設定なら誰も使えない
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# 認証にかかった時間と、その間の SQL（ユーザーの取得・初回作成）は measure("auth") にまとめる
+# （SQL はクエリバジェットの件数に含めない）
 def get_current_user(
     cred: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
 ) -> User:
-    try:
-      decoded = auth.verify_id_token(cred.credentials)
-    except Exception as e:
-      print("VERIFY ERROR >>>", repr(e))
-      raise HTTPException(status_code=401, detail="Invalid token")
-
-    firebase_uid = decoded["uid"]
-    email = decoded.get("email")
-
-    user = db.query(User).filter(
-      User.firebase_uid == firebase_uid
-    ).first()
-
-    if user:
-      return user
-
-    # 🔽 初回ログイン時のみ作成
-    user = User(
-      email=email,
-      name=email.split("@")[0],
-      firebase_uid=firebase_uid,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    return user
\ No newline at end of file
+    with measure("auth"):
+      return __private_resolve_user(cred.credentials, db)
+
+async def get_current_user_async(
+    cred: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    with measure("auth"):
+      return await __private_resolve_user_async(cred.credentials, db)
+
+def require_admin(cred: HTTPAuthorizationCredentials = Depends(security)):
+  if not ADMIN_TOKEN or not secrets.compare_digest(cred.credentials.encode(), ADMIN_TOKEN.encode()):
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+# private
+
+def __private_identity(user: User) -> dict:
+  return {
+    "id": user.id,
+    "name": user.name,
+    "email": user.email,
+    "firebase_uid": user.firebase_uid,
+  }
+
+def __private_attach_user(identity: dict, db: Session | AsyncSession) -> User:
+  # キャッシュ済みの値から永続化済み User を組み立て、SELECT なしでセッションに載せる
+  user = User(**identity)
+  make_transient_to_detached(user)
+  db.add(user)
+  return user
+
+def __private_resolve_user(token: str, db: Session) -> User:
+  identity = token_cache.get(token)
+  if identity:
+    return __private_attach_user(identity, db)
+
+  try:
+    with auth_verify_duration.time():
+      decoded = get_token_verifier().verify(token)
+  except Exception as e:
+    auth_verify_failures.inc()
+    print("VERIFY ERROR >>>", repr(e))
+    raise HTTPException(status_code=401, detail="Invalid token")
+
+  firebase_uid = decoded["uid"]
+  email = decoded.get("email")
+
+  user = db.query(User).filter(
+    User.firebase_uid == firebase_uid
+  ).first()
+
+  if user:
+    token_cache.put(token, __private_identity(user), decoded["exp"])
+    return user
+
+  # 🔽 初回ログイン時のみ作成
+  # commit はリクエスト終了時なので、作成直後はキャッシュしない
+  user = User(
+    email=email,
+    name=email.split("@")[0],
+    firebase_uid=firebase_uid,
+  )
+  db.add(user)
+  db.flush()
+
+  return user
+
+async def __private_resolve_user_async(token: str, db: AsyncSession) -> User:
+  identity = token_cache.get(token)
+  if identity:
+    return __private_attach_user(identity, db)
+
+  verifier = get_token_verifier()
+  try:
+    with auth_verify_duration.time():
+      if verifier.blocking:
+        decoded = await run_in_threadpool(verifier.verify, token)
+      else:
+        decoded = verifier.verify(token)
+  except Exception as e:
+    auth_verify_failures.inc()
+    print("VERIFY ERROR >>>", repr(e))
+    raise HTTPException(status_code=401, detail="Invalid token")
+
+  firebase_uid = decoded["uid"]
+  email = decoded.get("email")
+
+  result = await db.execute(select(User).where(User.firebase_uid == firebase_uid))
+  user = result.scalars().first()
+
+  if user:
+    token_cache.put(token, __private_identity(user), decoded["exp"])
+    return user
+
+  # 🔽 初回ログイン時のみ作成
+  user = User(
+    email=email,
+    name=email.split("@")[0],
+    firebase_uid=firebase_uid,
+  )
+  db.add(user)
+  await db.flush()
+
+  return user
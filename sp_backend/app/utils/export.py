@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Literal
+from uuid import UUID
+from fastapi.responses import StreamingResponse
+
+# エクスポートはサーバーサイドカーソルから EXPORT_BATCH_SIZE 行ずつ読み、そのまま書き出す
+# 全件をメモリに載せないので、件数が増えてもワーカーのメモリ使用量は一定
+EXPORT_BATCH_SIZE = 1000
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_MEDIA_TYPES = {
+  "csv": "text/csv; charset=utf-8",
+  "ndjson": "application/x-ndjson",
+}
+
+def export_response(chunks, format: ExportFormat, filename: str) -> StreamingResponse:
+  return StreamingResponse(
+    chunks,
+    media_type=EXPORT_MEDIA_TYPES[format],
+    headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+  )
+
+# partitions は行のまとまり（Result.partitions()）を返すイテレータ
+def export_chunks(partitions, columns: tuple[str, ...], format: ExportFormat):
+  if format == "csv":
+    yield render_csv_header(columns)
+  for rows in partitions:
+    yield render_rows(rows, columns, format)
+
+async def export_chunks_async(partitions, columns: tuple[str, ...], format: ExportFormat):
+  if format == "csv":
+    yield render_csv_header(columns)
+  async for rows in partitions:
+    yield render_rows(rows, columns, format)
+
+def render_csv_header(columns: tuple[str, ...]) -> bytes:
+  # Excel で文字化けしないよう BOM を付ける
+  return "\ufeff".encode() + __private_csv_lines([columns])
+
+def render_rows(rows, columns: tuple[str, ...], format: ExportFormat) -> bytes:
+  if format == "csv":
+    return __private_csv_lines([[__private_csv_value(v) for v in row] for row in rows])
+  lines = [json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=__private_json_value) for row in rows]
+  return ("\n".join(lines) + "\n").encode() if lines else b""
+
+# private
+
+def __private_csv_lines(rows) -> bytes:
+  buffer = io.StringIO()
+  csv.writer(buffer, lineterminator="\n").writerows(rows)
+  return buffer.getvalue().encode()
+
+def __private_csv_value(value):
+  if isinstance(value, (datetime, date)):
+    return value.isoformat()
+  return value
+
+def __private_json_value(value):
+  if isinstance(value, (datetime, date)):
+    return value.isoformat()
+  if isinstance(value, Decimal):
+    return int(value) if value == value.to_integral_value() else float(value)
+  if isinstance(value, UUID):
+    return str(value)
+  raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import literal, tuple_
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+# キーセットページネーション
+# カーソルは直前ページ最後の行のソートキーを base64 にしたもの。中身はクライアントに意味を持たせない
+class PageParams(NamedTuple):
+  limit: int
+  after: list | None
+
+def page_params(
+  limit: int | None = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+  cursor: str | None = None,
+) -> PageParams | None:
+  # どちらも指定がなければ従来どおり全件返す
+  if limit is None and cursor is None:
+    return None
+  after = decode_cursor(cursor) if cursor else None
+  return PageParams(limit or DEFAULT_PAGE_LIMIT, after)
+
+def encode_cursor(values: list) -> str:
+  raw = json.dumps([__private_encode_value(v) for v in values], separators=(",", ":"))
+  return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> list:
+  try:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    values = json.loads(raw)
+    if not isinstance(values, list) or not values:
+      raise ValueError(cursor)
+    return [__private_decode_value(v) for v in values]
+  except ValueError:
+    raise __private_invalid_cursor()
+
+# keys の順で並べ、カーソルより後ろの行だけを limit + 1 件取る（+1 は次ページの有無の判定用）
+# (a, b) > (x, y) の行値比較にすることで (user_id, a, b) の複合インデックスをそのまま辿れる
+def apply_keyset(query, keys: tuple, page: PageParams | None, descending: bool = False):
+  if page is None:
+    return query
+  query = query.order_by(*[k.desc() if descending else k.asc() for k in keys])
+  if page.after is not None:
+    if len(page.after) != len(keys):
+      raise __private_invalid_cursor()
+    row = tuple_(*keys)
+    after = tuple_(*[literal(v, k.type) for k, v in zip(keys, page.after)])
+    query = query.filter(row < after if descending else row > after)
+  return query.limit(page.limit + 1)
+
+# apply_keyset で取った行を 1 ページ分に切り詰め、続きがあれば次のカーソルを返す
+def split_page(rows, keys: tuple, page: PageParams | None):
+  rows = list(rows)
+  if page is None or len(rows) <= page.limit:
+    return rows, None
+  rows = rows[:page.limit]
+  return rows, encode_cursor([getattr(rows[-1], k.key) for k in keys])
+
+# private
+
+def __private_encode_value(value):
+  if isinstance(value, datetime):
+    return {"dt": value.isoformat()}
+  return value
+
+def __private_decode_value(value):
+  if isinstance(value, dict) and "dt" in value:
+    return datetime.fromisoformat(value["dt"])
+  if isinstance(value, (int, str)):
+    return value
+  raise ValueError(value)
+
+def __private_invalid_cursor():
+  return RequestValidationError([{"loc": ("query", "cursor"), "msg": "Invalid cursor", "type": "value_error"}])
@@ -0,0 +1,8 @@
+# カンマ区切りのクエリパラメータ（?include=stock,category など）を分解する
+# 戻り値: (指定された値, 許可されていない値)
+def parse_csv_param(value: str | None, allowed: tuple[str, ...]) -> tuple[tuple[str, ...], list[str]]:
+  if not value:
+    return (), []
+  requested = tuple(v.strip() for v in value.split(",") if v.strip())
+  unknown = [v for v in requested if v not in allowed]
+  return requested, unknown
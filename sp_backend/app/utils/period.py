@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from typing import Literal, NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from fastapi import Depends, Query
+from fastapi.exceptions import RequestValidationError
+
+SUMMARY_GRANULARITIES = ("day", "week", "month", "year")
+UTC_ZONES = ("UTC", "Etc/UTC")
+
+# 支出サマリーの集計範囲
+# start / end は bought_at と同じ UTC（tz なし）に直した値。end は含まない
+# granularity / tz は期間ごとの集計（タイムライン）で使う
+class SummaryPeriod(NamedTuple):
+  start: datetime | None
+  end: datetime | None
+  tz: str
+  granularity: str = "month"
+
+# from / to は日付（2025-11-01）か日時。tz なしの値は tz で指定したタイムゾーンの時刻として扱う
+def summary_range(
+  start: datetime | None = Query(None, alias="from"),
+  end: datetime | None = Query(None, alias="to"),
+  tz: str = "UTC",
+) -> SummaryPeriod:
+  try:
+    zone = ZoneInfo(tz)
+  except (ZoneInfoNotFoundError, ValueError):
+    raise __private_invalid("tz", "Unknown time zone")
+
+  start = __private_to_utc(start, zone)
+  end = __private_to_utc(end, zone)
+  if start is not None and end is not None and start >= end:
+    raise __private_invalid("to", "'to' must be after 'from'")
+  return SummaryPeriod(start, end, zone.key)
+
+def summary_period(
+  period: SummaryPeriod = Depends(summary_range),
+  granularity: Literal["day", "week", "month", "year"] = "month",
+) -> SummaryPeriod:
+  return period._replace(granularity=granularity)
+
+# private
+
+def __private_to_utc(value: datetime | None, zone: ZoneInfo) -> datetime | None:
+  if value is None:
+    return None
+  if value.tzinfo is None:
+    value = value.replace(tzinfo=zone)
+  return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def __private_invalid(field: str, message: str):
+  return RequestValidationError([{"loc": ("query", field), "msg": message, "type": "value_error"}])
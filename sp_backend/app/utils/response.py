@@ -1,11 +1,74 @@
+from decimal import Decimal
+from fastapi import Response
 from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+from app.core.request_metrics import measure
+from app.core.response_cache import response_cache
 from app.schemas.response import ErrorResponse
 
-def success(data):
-  return {"success": True, "data": data}
+# 検証済みのモデルをそのまま 1 回でバイト列にする
+# Response を返すので FastAPI の response_model による再検証・jsonable_encoder は通らない
+# （OpenAPI のスキーマはルーターの response_model=SuccessResponse のまま）
+class SuccessJSONResponse(Response):
+  media_type = "application/json"
+
+  def render(self, content) -> bytes:
+    with measure("serialize"):
+      return to_json(content)
+
+def success(data, next_cursor: str | None = None):
+  return SuccessJSONResponse({"success": True, "data": data, "next_cursor": next_cursor})
+
+# 集計クエリの行をそのまま dict で返すとき用
+# 支出サマリーの total_amount などの Decimal は JSON の数値で出す（整数なら int、それ以外は float）
+# to_json や response_model=SuccessResponse にそのまま渡すと "1500" のような文字列になるので、ここで変換する
+def row_data(rows) -> list[dict]:
+  return [{key: __private_plain(value) for key, value in row._mapping.items()} for row in rows]
 
 def error(message: str, status_code: int = 400):
   return JSONResponse(
     status_code=status_code,
     content=ErrorResponse(error=message).model_dump()
   )
+
+# ユーザー単位でレスポンスをキャッシュする。build は success(...) か error(...) を返す関数
+# エラーはキャッシュしない
+def cached(user_id, resource: str, params, build):
+  if not response_cache.enabled:
+    return build()
+  key = response_cache.key(user_id, response_cache.version(user_id), resource, repr(params))
+  body = response_cache.get(key)
+  if body is not None:
+    return __private_cached_response(body, "hit")
+
+  response = build()
+  if not isinstance(response, SuccessJSONResponse):
+    return response
+  body = response.body
+  response_cache.put(key, body)
+  return __private_cached_response(body, "miss")
+
+async def cached_async(user_id, resource: str, params, build):
+  if not response_cache.enabled:
+    return await build()
+  key = response_cache.key(user_id, response_cache.version(user_id), resource, repr(params))
+  body = response_cache.get(key)
+  if body is not None:
+    return __private_cached_response(body, "hit")
+
+  response = await build()
+  if not isinstance(response, SuccessJSONResponse):
+    return response
+  body = response.body
+  response_cache.put(key, body)
+  return __private_cached_response(body, "miss")
+
+# private
+
+def __private_plain(value):
+  if isinstance(value, Decimal):
+    return int(value) if value == value.to_integral_value() else float(value)
+  return value
+
+def __private_cached_response(body: bytes, status: str):
+  return Response(content=body, media_type="application/json", headers={"X-Cache": status})
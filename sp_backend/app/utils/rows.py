@@ -0,0 +1,11 @@
+from functools import lru_cache
+from pydantic import TypeAdapter
+
+# 一覧の変換。リポジトリが返す Core の行（Row）をまとめて 1 回の呼び出しでレスポンスモデルにする
+# ORM オブジェクトの生成・identity map への登録と、行ごとの model_validate 呼び出しがなくなる
+@lru_cache(maxsize=None)
+def list_adapter(model) -> TypeAdapter:
+  return TypeAdapter(list[model])
+
+def validate_rows(model, rows) -> list:
+  return list_adapter(model).validate_python(rows, from_attributes=True)
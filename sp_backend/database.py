@@ -1,18 +1,27 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi import Depends
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from dotenv import load_dotenv
+from app.core.metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# sync: psycopg2 + def ルーター / async: asyncpg + async def ルーター
+DB_MODE = os.getenv("DB_MODE", "sync")
+# ローカルの Postgres では disable にする
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
 
 # Engine 作成
+# プールのチェックアウト時間を /metrics に出すため poolclass を差し替えている（動作は QueuePool と同じ）
 engine = create_engine(
   DATABASE_URL,
+  poolclass=TimedQueuePool,
   pool_pre_ping=True,
   connect_args={
-    "sslmode": "require",
+    "sslmode": DB_SSLMODE,
   },
 )
 
@@ -29,4 +38,54 @@ def get_db():
   try:
     yield db
   finally:
-    db.close()
\ No newline at end of file
+    db.close()
+
+
+# リクエスト単位の Unit of Work
+# リポジトリは flush のみ行い、ここで一度だけ commit する。例外時はまとめて rollback
+# レスポンス送信前に commit したいので Depends(unit_of_work, scope="function") で使う
+def unit_of_work(db: Session = Depends(get_db)):
+  try:
+    yield db
+  except Exception:
+    db.rollback()
+    raise
+  else:
+    db.commit()
+
+
+# 非同期スタック（DB_MODE=async のときだけ作る）
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_MODE == "async":
+  ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or make_url(DATABASE_URL).set(drivername="postgresql+asyncpg", query={})
+
+  async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_pre_ping=True,
+    connect_args={
+      "ssl": DB_SSLMODE,
+    },
+  )
+  AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+  db = AsyncSessionLocal()
+  try:
+    yield db
+  finally:
+    await db.close()
+
+
+# unit_of_work の非同期版
+async def async_unit_of_work(db: AsyncSession = Depends(get_async_db)):
+  try:
+    yield db
+  except Exception:
+    await db.rollback()
+    raise
+  else:
+    await db.commit()
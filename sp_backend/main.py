@@ -1,14 +1,30 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
+from app.core.compression import CompressionMiddleware
 from app.core.exception_handlers import validation_exception_handler
-from app.routers import category_router, item_router, memo_router, shopping_list_router, shopping_record_router, stock_router, user_router
+from app.core.request_metrics import RequestMetricsMiddleware, instrument_engine
+from app.core.slow_query_log import slow_query_log
 from app.routers.test import test_router
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.token_verifier import get_token_verifier
+from app.routers import analytics_router, cache_router, compression_router, dashboard_router, metrics_router, slow_query_router
+from database import DB_MODE, async_engine, engine
 
-from firebase import init_firebase
+if DB_MODE == "async":
+  from app.routers.aio import category_router, item_router, memo_router, shopping_list_router, shopping_record_router, stock_router, user_router
+else:
+  from app.routers import category_router, item_router, memo_router, shopping_list_router, shopping_record_router, stock_router, user_router
 
-app = FastAPI(title="StockyPocky")
-init_firebase()
+# 起動時に ID トークンの検証鍵を読み込み（リクエスト中には取りに行かない）、終了時に遅いクエリの記録を書き出す
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  await run_in_threadpool(get_token_verifier().start)
+  yield
+  slow_query_log.dump()
+
+app = FastAPI(title="StockyPocky", lifespan=lifespan)
 
 origins=[
   "https://stocky-pocky-git-main-naochis-projects-69fd0fc2.vercel.app/",
@@ -26,9 +42,27 @@ app.add_middleware(
   allow_headers=["*"],
 )
 
-routers = [user_router, category_router, item_router, stock_router, shopping_record_router, shopping_list_router, memo_router, test_router]
+# Accept-Encoding に応じて br / gzip で圧縮する（小さいレスポンスと Depends(skip_compression) のルートは除く）
+app.add_middleware(CompressionMiddleware)
+
+# リクエストごとの SQL 件数・DB / 認証 / シリアライズ時間を Server-Timing とログに出す（圧縮も含めて測るので一番外側）
+app.add_middleware(RequestMetricsMiddleware)
+instrument_engine(engine)
+if async_engine is not None:
+  instrument_engine(async_engine.sync_engine)
+
+# SLOW_QUERY_THRESHOLD_MS 以上の SQL を記録し、一部は EXPLAIN (ANALYZE, BUFFERS) も取る（/api/v1/slow-queries）
+slow_query_log.instrument(engine)
+if async_engine is not None:
+  slow_query_log.instrument(async_engine.sync_engine)
+
+# dashboard / analytics / cache / compression / slow-queries は同期スタックのみ（async モードでも同期セッションで動かす）
+routers = [user_router, category_router, item_router, stock_router, shopping_record_router, shopping_list_router, memo_router, dashboard_router, analytics_router, cache_router, compression_router, slow_query_router, test_router]
 
 for r in routers:
   app.include_router(r.router, prefix="/api/v1")
 
+# Prometheus 向け（/metrics、prefix なし）
+app.include_router(metrics_router.router)
+
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
\ No newline at end of file
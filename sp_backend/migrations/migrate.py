@@ -0,0 +1,111 @@
+# バージョン管理された SQL マイグレーションの実行
+#   python -m migrations.migrate status
+#   python -m migrations.migrate upgrade [version]
+#   python -m migrations.migrate downgrade <version>
+import argparse
+import re
+from pathlib import Path
+from sqlalchemy import text
+from database import engine
+
+VERSIONS_DIR = Path(__file__).parent / "versions"
+# 失敗した CREATE INDEX CONCURRENTLY は INVALID なインデックスを残し、再実行しても IF NOT EXISTS で飛ばされる
+# 作る前に、同じ名前の INVALID なインデックスがあれば消す
+CONCURRENT_INDEX = re.compile(r"^CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE)
+
+def load_migrations():
+  migrations = []
+  for path in sorted(VERSIONS_DIR.glob("*.sql")):
+    source = path.read_text()
+    up, _, down = source.partition("-- migrate:down")
+    migrations.append({
+      "version": path.stem.split("_", 1)[0],
+      "name": path.stem,
+      "up": up.split("-- migrate:up", 1)[-1],
+      "down": down,
+      "transactional": "-- migrate:no-transaction" not in source,
+    })
+  return migrations
+
+def applied_versions():
+  with engine.begin() as conn:
+    conn.execute(text(
+      "CREATE TABLE IF NOT EXISTS schema_migrations ("
+      " version TEXT PRIMARY KEY,"
+      " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+def upgrade(target: str | None = None):
+  applied = applied_versions()
+  for migration in load_migrations():
+    if migration["version"] in applied:
+      continue
+    if target and migration["version"] > target:
+      break
+    print(f"upgrade {migration['name']}")
+    __private_run(migration["up"], migration["transactional"])
+    with engine.begin() as conn:
+      conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:v)"), {"v": migration["version"]})
+
+def downgrade(target: str):
+  applied = applied_versions()
+  for migration in reversed(load_migrations()):
+    if migration["version"] <= target:
+      break
+    if migration["version"] not in applied:
+      continue
+    print(f"downgrade {migration['name']}")
+    __private_run(migration["down"], migration["transactional"])
+    with engine.begin() as conn:
+      conn.execute(text("DELETE FROM schema_migrations WHERE version = :v"), {"v": migration["version"]})
+
+def status():
+  applied = applied_versions()
+  for migration in load_migrations():
+    mark = "x" if migration["version"] in applied else " "
+    print(f"[{mark}] {migration['name']}")
+
+# private
+
+def __private_run(sql: str, transactional: bool):
+  if transactional:
+    with engine.begin() as conn:
+      conn.exec_driver_sql(sql)
+    return
+
+  # CREATE INDEX CONCURRENTLY などは 1 文ずつ autocommit で実行する
+  with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+    for statement in __private_split(sql):
+      __private_drop_invalid_index(conn, statement)
+      conn.exec_driver_sql(statement)
+
+def __private_drop_invalid_index(conn, statement: str):
+  match = CONCURRENT_INDEX.match(statement)
+  if not match:
+    return
+  name = match.group(1)
+  invalid = conn.execute(text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}).scalar()
+  if invalid:
+    print(f"  drop invalid index {name}")
+    conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+def __private_split(sql: str):
+  body = "\n".join(line for line in sql.splitlines() if not line.strip().startswith("--"))
+  return [s.strip() for s in re.split(r";\s*(?:\n|$)", body) if s.strip()]
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("command", choices=["status", "upgrade", "downgrade"])
+  parser.add_argument("version", nargs="?")
+  args = parser.parse_args()
+
+  if args.command == "status":
+    status()
+  elif args.command == "upgrade":
+    upgrade(args.version)
+  else:
+    if not args.version:
+      parser.error("downgrade には戻し先の version が必要です（全て戻す場合は 0000）")
+    downgrade(args.version)
@@ -0,0 +1,88 @@
+-- 本番では作成済みの既存テーブルを、ローカルの Postgres でも再現するためのベースライン
+-- migrate:up
+
+CREATE TABLE IF NOT EXISTS users (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  name TEXT,
+  email TEXT NOT NULL UNIQUE,
+  firebase_uid TEXT
+);
+
+CREATE TABLE IF NOT EXISTS categories (
+  id BIGSERIAL PRIMARY KEY,
+  name TEXT NOT NULL,
+  icon TEXT,
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS items (
+  id BIGSERIAL PRIMARY KEY,
+  name TEXT NOT NULL,
+  brand TEXT,
+  unit TEXT,
+  image_url TEXT,
+  default_quantity NUMERIC NOT NULL,
+  notes TEXT,
+  is_favorite BOOLEAN NOT NULL,
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+  category_id BIGINT NOT NULL REFERENCES categories (id)
+);
+
+CREATE TABLE IF NOT EXISTS stocks (
+  id BIGSERIAL PRIMARY KEY,
+  quantity NUMERIC NOT NULL,
+  threshold NUMERIC NOT NULL,
+  location TEXT NOT NULL,
+  item_id BIGINT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS stock_history (
+  id BIGSERIAL PRIMARY KEY,
+  change NUMERIC NOT NULL,
+  reason TEXT,
+  memo TEXT,
+  item_id BIGINT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS shopping_list (
+  id BIGSERIAL PRIMARY KEY,
+  quantity NUMERIC NOT NULL,
+  checked BOOLEAN NOT NULL,
+  item_id BIGINT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+  added_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS shopping_records (
+  id BIGSERIAL PRIMARY KEY,
+  quantity NUMERIC NOT NULL,
+  price NUMERIC NOT NULL,
+  store TEXT NOT NULL,
+  bought_at TIMESTAMP NOT NULL,
+  item_id BIGINT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS memos (
+  id BIGSERIAL PRIMARY KEY,
+  title TEXT NOT NULL,
+  content TEXT,
+  type TEXT,
+  is_done BOOLEAN NOT NULL,
+  tags TEXT[],
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- migrate:down
+
+DROP TABLE IF EXISTS memos;
+DROP TABLE IF EXISTS shopping_records;
+DROP TABLE IF EXISTS shopping_list;
+DROP TABLE IF EXISTS stock_history;
+DROP TABLE IF EXISTS stocks;
+DROP TABLE IF EXISTS items;
+DROP TABLE IF EXISTS categories;
+DROP TABLE IF EXISTS users;
@@ -0,0 +1,56 @@
+-- ユーザー単位のアクセスパターン向け複合インデックス
+-- CONCURRENTLY はトランザクション内で実行できないので 1 文ずつ autocommit で流す
+-- 途中で失敗したら（一意インデックスの作成中に重複が入ったなど）もう一度 upgrade すればよい
+-- 重複をまとめ直し、失敗して残った INVALID なインデックスはランナーが消してから作り直す
+-- migrate:no-transaction
+-- migrate:up
+
+-- 一意インデックスの前に、競合で重複した買い物リストを 1 行にまとめる
+WITH merged AS (
+  SELECT min(id) AS keep_id, user_id, item_id, sum(quantity) AS quantity
+  FROM shopping_list
+  GROUP BY user_id, item_id
+  HAVING count(*) > 1
+), updated AS (
+  UPDATE shopping_list s
+  SET quantity = merged.quantity
+  FROM merged
+  WHERE s.id = merged.keep_id
+)
+DELETE FROM shopping_list s
+USING merged
+WHERE s.user_id = merged.user_id AND s.item_id = merged.item_id AND s.id <> merged.keep_id;
+
+-- 在庫も同じく、重複した行の数量を一番古い行に足して残りを消す（しきい値・場所は残す行のもの）
+WITH merged AS (
+  SELECT min(id) AS keep_id, user_id, item_id, sum(quantity) AS quantity
+  FROM stocks
+  GROUP BY user_id, item_id
+  HAVING count(*) > 1
+), updated AS (
+  UPDATE stocks s
+  SET quantity = merged.quantity
+  FROM merged
+  WHERE s.id = merged.keep_id
+)
+DELETE FROM stocks s
+USING merged
+WHERE s.user_id = merged.user_id AND s.item_id = merged.item_id AND s.id <> merged.keep_id;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_items_user_id_category_id ON items (user_id, category_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_items_user_id_is_favorite ON items (user_id, is_favorite);
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_stocks_user_id_item_id ON stocks (user_id, item_id);
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_shopping_list_user_id_item_id ON shopping_list (user_id, item_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_history_item_id_created_at ON stock_history (item_id, created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shopping_records_user_id_bought_at ON shopping_records (user_id, bought_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_firebase_uid ON users (firebase_uid);
+
+-- migrate:down
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_users_firebase_uid;
+DROP INDEX CONCURRENTLY IF EXISTS ix_shopping_records_user_id_bought_at;
+DROP INDEX CONCURRENTLY IF EXISTS ix_stock_history_item_id_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS ux_shopping_list_user_id_item_id;
+DROP INDEX CONCURRENTLY IF EXISTS ux_stocks_user_id_item_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_items_user_id_is_favorite;
+DROP INDEX CONCURRENTLY IF EXISTS ix_items_user_id_category_id;
@@ -0,0 +1,28 @@
+-- キーセットページネーション用のインデックス
+-- 絞り込み列 + ソートキーの順に並べ、何ページ目でもインデックスの範囲スキャンだけで済むようにする
+-- migrate:no-transaction
+-- migrate:up
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_items_user_id_id ON items (user_id, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_categories_user_id_id ON categories (user_id, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_memos_user_id_id ON memos (user_id, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stocks_user_id_id ON stocks (user_id, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shopping_list_user_id_added_at_id ON shopping_list (user_id, added_at, id);
+
+-- 既存の (…, 日時) インデックスは id を足したものに置き換える
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_history_item_id_created_at_id ON stock_history (item_id, created_at, id);
+DROP INDEX CONCURRENTLY IF EXISTS ix_stock_history_item_id_created_at;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shopping_records_user_id_bought_at_id ON shopping_records (user_id, bought_at, id);
+DROP INDEX CONCURRENTLY IF EXISTS ix_shopping_records_user_id_bought_at;
+
+-- migrate:down
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shopping_records_user_id_bought_at ON shopping_records (user_id, bought_at);
+DROP INDEX CONCURRENTLY IF EXISTS ix_shopping_records_user_id_bought_at_id;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_history_item_id_created_at ON stock_history (item_id, created_at);
+DROP INDEX CONCURRENTLY IF EXISTS ix_stock_history_item_id_created_at_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_shopping_list_user_id_added_at_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_stocks_user_id_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_memos_user_id_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_categories_user_id_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_items_user_id_id;
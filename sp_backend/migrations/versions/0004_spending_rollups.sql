@@ -0,0 +1,27 @@
+-- 支出サマリー用の集計テーブル（月 × アイテム、カテゴリ付き）
+-- migrate:up
+
+CREATE TABLE IF NOT EXISTS spending_rollups (
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+  month TIMESTAMP NOT NULL,
+  item_id BIGINT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+  category_id BIGINT NOT NULL REFERENCES categories (id),
+  total_amount NUMERIC NOT NULL,
+  record_count BIGINT NOT NULL,
+  PRIMARY KEY (user_id, month, item_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_spending_rollups_user_id_category_id ON spending_rollups (user_id, category_id);
+CREATE INDEX IF NOT EXISTS ix_spending_rollups_item_id ON spending_rollups (item_id);
+
+-- 既存の記録から初期値を作る
+INSERT INTO spending_rollups (user_id, month, item_id, category_id, total_amount, record_count)
+SELECT r.user_id, date_trunc('month', r.bought_at), r.item_id, i.category_id, sum(r.price * r.quantity), count(*)
+FROM shopping_records r
+JOIN items i ON i.id = r.item_id
+GROUP BY r.user_id, date_trunc('month', r.bought_at), r.item_id, i.category_id
+ON CONFLICT (user_id, month, item_id) DO NOTHING;
+
+-- migrate:down
+
+DROP TABLE IF EXISTS spending_rollups;
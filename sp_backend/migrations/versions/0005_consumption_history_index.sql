@@ -0,0 +1,9 @@
+-- 消費予測（/stocks/forecast）用。ユーザーの減った記録だけを item_id, created_at 順に読む
+-- migrate:no-transaction
+-- migrate:up
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stock_history_user_id_consumption ON stock_history (user_id, item_id, created_at, id) WHERE change < 0;
+
+-- migrate:down
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_stock_history_user_id_consumption;
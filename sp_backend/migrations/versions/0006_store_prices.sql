@@ -0,0 +1,30 @@
+-- 店舗のおすすめ用のインデックステーブル（アイテム × 店舗ごとの直近単価）
+-- shopping_records 側にはキー単位で作り直すためのインデックスを足す
+-- migrate:no-transaction
+-- migrate:up
+
+CREATE TABLE IF NOT EXISTS store_prices (
+  user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+  item_id BIGINT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+  store TEXT NOT NULL,
+  recent_unit_price NUMERIC NOT NULL,
+  purchase_count BIGINT NOT NULL,
+  last_bought_at TIMESTAMP NOT NULL,
+  PRIMARY KEY (user_id, item_id, store)
+);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_store_prices_item_id ON store_prices (item_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shopping_records_user_id_item_id_store ON shopping_records (user_id, item_id, store, bought_at, id);
+
+-- 既存の記録から初期値を作る
+INSERT INTO store_prices (user_id, item_id, store, recent_unit_price, purchase_count, last_bought_at)
+SELECT user_id, item_id, store, (array_agg(price / quantity ORDER BY bought_at DESC, id DESC))[1], count(*), max(bought_at)
+FROM shopping_records
+WHERE quantity > 0
+GROUP BY user_id, item_id, store
+ON CONFLICT (user_id, item_id, store) DO NOTHING;
+
+-- migrate:down
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_shopping_records_user_id_item_id_store;
+DROP TABLE IF EXISTS store_prices;
@@ -0,0 +1,14 @@
+-- アイテム削除の ON DELETE CASCADE 用。item_id が先頭のインデックスがないと、子テーブルごとに全件走査になる
+-- stock_history / spending_rollups / store_prices は既存のインデックスで足りる
+-- migrate:no-transaction
+-- migrate:up
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shopping_records_item_id ON shopping_records (item_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shopping_list_item_id ON shopping_list (item_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stocks_item_id ON stocks (item_id);
+
+-- migrate:down
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_stocks_item_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_shopping_list_item_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_shopping_records_item_id;
@@ -0,0 +1,74 @@
+# アイテム削除（items_repo.delete_item）のレイテンシ計測
+#   python -m scripts.bench_item_delete [--rows 10000] [--repeat 3]
+# 在庫履歴・買い物記録を rows 件ずつ持つアイテムを作って消す。各回はロールバックするのでデータは残らない
+# 比較用に、子をすべてロードしてから消す場合（passive_deletes なしの ORM カスケード相当）も測る
+import argparse
+import time
+import uuid
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, selectinload
+from app.models.item import Item
+# relationship の解決に必要
+from app.models.category import Category
+from app.models.shopping_list import ShoppingList
+from app.models.shopping_record import ShoppingRecord
+from app.models.stock import Stock
+from app.models.stock_history import StockHistory
+from app.repositories.items_repo import delete_item
+from database import engine
+
+SEED_SQL = """
+WITH u AS (
+  INSERT INTO users (name, email, firebase_uid) VALUES ('bench', :email, :email) RETURNING id
+), c AS (
+  INSERT INTO categories (name, user_id) SELECT 'bench', id FROM u RETURNING id, user_id
+), i AS (
+  INSERT INTO items (name, default_quantity, is_favorite, user_id, category_id)
+  SELECT 'bench', 1, false, user_id, id FROM c RETURNING id, user_id
+), s AS (
+  INSERT INTO stocks (quantity, threshold, location, item_id, user_id) SELECT 1, 0, 'bench', id, user_id FROM i
+), h AS (
+  INSERT INTO stock_history (change, reason, item_id, user_id, created_at)
+  SELECT -1, 'bench', i.id, i.user_id, now() - n * interval '1 hour' FROM i, generate_series(1, :rows) n
+), r AS (
+  INSERT INTO shopping_records (quantity, price, store, bought_at, item_id, user_id)
+  SELECT 1, 100 + n % 50, 'store' || n % 5, now() - n * interval '1 hour', i.id, i.user_id FROM i, generate_series(1, :rows) n
+)
+SELECT id FROM i
+"""
+
+def run(rows: int, load_children: bool) -> tuple[float, int]:
+  with engine.connect() as conn:
+    item_id = conn.execute(text(SEED_SQL), {"email": f"bench-{uuid.uuid4()}", "rows": rows}).scalar_one()
+    statements = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+      statements.append(statement)
+
+    with Session(bind=conn) as db:
+      query = db.query(Item).filter(Item.id == item_id)
+      if load_children:
+        query = query.options(*(selectinload(rel) for rel in (Item.stocks, Item.stock_history, Item.shopping_list, Item.shopping_records)))
+      started = time.perf_counter()
+      event.listen(conn, "before_cursor_execute", before_cursor_execute)
+      item = query.one()
+      delete_item(item, db)
+      elapsed = time.perf_counter() - started
+      event.remove(conn, "before_cursor_execute", before_cursor_execute)
+    conn.rollback()
+  return elapsed, len(statements)
+
+def report(title: str, rows: int, repeat: int, load_children: bool):
+  results = [run(rows, load_children) for _ in range(repeat)]
+  timings = sorted(elapsed for elapsed, _ in results)
+  print(f"{title}: median {timings[len(timings) // 2] * 1000:.1f} ms, min {timings[0] * 1000:.1f} ms, {results[0][1]} statements")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--rows", type=int, default=10000, help="在庫履歴・買い物記録それぞれの件数")
+  parser.add_argument("--repeat", type=int, default=3)
+  args = parser.parse_args()
+
+  print(f"rows={args.rows} (stock_history + shopping_records = {args.rows * 2})")
+  report("delete_item", args.rows, args.repeat, load_children=False)
+  report("delete_item (children loaded)", args.rows, args.repeat, load_children=True)
@@ -0,0 +1,115 @@
+# 一覧レスポンスのシリアライズの比較
+#   python -m scripts.bench_json_response [--rows 1000 5000 10000] [--repeat 5]
+# legacy: dict を返し、response_model=SuccessResponse で検証し直してからシリアライズする（従来の経路）
+# encoder: response_model なしで dict を返す（jsonable_encoder を通る。集計のルートなど）
+# fast: success() が返す SuccessJSONResponse（検証済みモデルを 1 回でバイト列にする）
+# アイテム一覧（include=stock,category）と在庫履歴を対象に、クエリ + model_validate の時間と、
+# そのあとのレスポンス処理（legacy / fast）の時間を分けて出す
+# レスポンス処理の比較では、両方のルートが同じ検証済みのリストを返す
+# シードデータは 1 つのトランザクション内で作り、最後にロールバックする
+import argparse
+import time
+import uuid
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.api.v1.items_api import item_response
+from app.models.item import Item
+# relationship の解決に必要
+from app.models.category import Category
+from app.models.shopping_list import ShoppingList
+from app.models.shopping_record import ShoppingRecord
+from app.models.stock import Stock
+from app.models.stock_history import StockHistory
+from app.repositories.items_repo import get_items
+from app.repositories.stock_history_repo import get_stock_history_by_item_id
+from app.schemas.response import SuccessResponse
+from app.schemas.stock_history import StockHistoryResponse
+from app.utils.response import success
+from database import engine
+
+INCLUDE = ("stock", "category")
+RESOURCES = ("items", "stock-history")
+
+SEED_SQL = """
+WITH u AS (
+  INSERT INTO users (name, email, firebase_uid) VALUES ('bench', :email, :email) RETURNING id
+), c AS (
+  INSERT INTO categories (name, icon, user_id) SELECT 'bench', 'x', id FROM u RETURNING id, user_id
+), i AS (
+  INSERT INTO items (name, brand, unit, default_quantity, notes, is_favorite, user_id, category_id)
+  SELECT 'item ' || n, 'brand', 'pcs', 1, 'note', n % 7 = 0, user_id, id FROM c, generate_series(1, :rows) n
+  RETURNING id, user_id
+), s AS (
+  INSERT INTO stocks (quantity, threshold, location, item_id, user_id) SELECT 5, 1, 'fridge', id, user_id FROM i
+), h AS (
+  INSERT INTO stock_history (change, reason, item_id, user_id, created_at)
+  SELECT -1, 'use', (SELECT min(id) FROM i), (SELECT id FROM u), now() - n * interval '1 hour' FROM generate_series(1, :rows) n
+)
+SELECT (SELECT id FROM u), (SELECT min(id) FROM i)
+"""
+
+def load(db: Session, user_id, item_id: int, resource: str):
+  if resource == "items":
+    return [item_response(item, INCLUDE) for item in get_items(user_id, None, None, db, INCLUDE)]
+  return [StockHistoryResponse.model_validate(h) for h in get_stock_history_by_item_id(item_id, db)]
+
+def build_app(data: dict) -> FastAPI:
+  app = FastAPI()
+
+  @app.get("/legacy/{resource}", response_model=SuccessResponse)
+  def legacy(resource: str):
+    return {"success": True, "data": data[resource]}
+
+  @app.get("/encoder/{resource}")
+  def encoder(resource: str):
+    return {"success": True, "data": data[resource]}
+
+  @app.get("/fast/{resource}", response_model=SuccessResponse)
+  def fast(resource: str):
+    return success(data[resource])
+
+  return app
+
+def median(fn, repeat: int) -> float:
+  timings = []
+  for _ in range(repeat):
+    started = time.perf_counter()
+    fn()
+    timings.append(time.perf_counter() - started)
+  timings.sort()
+  return timings[len(timings) // 2]
+
+def run(rows: int, repeat: int):
+  with engine.connect() as conn:
+    user_id, item_id = conn.execute(text(SEED_SQL), {"email": f"bench-{uuid.uuid4()}", "rows": rows}).one()
+    with Session(bind=conn) as db:
+      data = {}
+      loading = {}
+      for resource in RESOURCES:
+        loading[resource] = median(lambda: data.__setitem__(resource, load(db, user_id, item_id, resource)), 1)
+        db.expunge_all()
+    conn.rollback()
+
+  client = TestClient(build_app(data))
+  for resource in RESOURCES:
+    legacy = median(lambda: client.get(f"/legacy/{resource}"), repeat)
+    encoder = median(lambda: client.get(f"/encoder/{resource}"), repeat)
+    fast = median(lambda: client.get(f"/fast/{resource}"), repeat)
+    expected = client.get(f"/legacy/{resource}")
+    assert expected.json() == client.get(f"/fast/{resource}").json()
+    print(
+      f"{rows:>6} {resource:<14} query+validate {loading[resource] * 1000:7.1f} ms | "
+      f"response legacy {legacy * 1000:7.1f} ms  encoder {encoder * 1000:7.1f} ms  fast {fast * 1000:7.1f} ms  ({len(expected.content)} bytes)"
+    )
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 10000])
+  parser.add_argument("--repeat", type=int, default=5)
+  args = parser.parse_args()
+
+  for rows in args.rows:
+    run(rows, args.repeat)
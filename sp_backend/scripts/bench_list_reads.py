@@ -0,0 +1,108 @@
+# 一覧 API の読み取りと変換の比較（エンドポイントごと）
+#   python -m scripts.bench_list_reads [--rows 5000] [--repeat 5]
+# orm: ORM オブジェクトを読み、行ごとに model_validate する（従来の経路）
+# core: リポジトリの Core の行を validate_rows で一括変換する（今の経路）
+# 各一覧に rows 件のデータを 1 つのトランザクション内で作り、最後にロールバックする
+import argparse
+import time
+import uuid
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.models.category import Category
+from app.models.item import Item
+from app.models.memo import Memo
+from app.models.shopping_list import ShoppingList
+from app.models.shopping_record import ShoppingRecord
+from app.models.stock import Stock
+from app.models.stock_history import StockHistory
+from app.repositories.categories_repo import get_categories
+from app.repositories.items_repo import get_item_rows
+from app.repositories.memos_repo import get_memos
+from app.repositories.shopping_list_repo import get_shopping_lists
+from app.repositories.shopping_records_repo import get_shopping_records
+from app.repositories.stock_history_repo import get_stock_history_by_item_id
+from app.repositories.stocks_repo import get_stocks
+from app.schemas.category import CategoryResponse
+from app.schemas.item import ItemResponse
+from app.schemas.memo import MemoResponse
+from app.schemas.shopping_list import ShoppingListResponse
+from app.schemas.shopping_record import ShoppingRecordResponse
+from app.schemas.stock import StockResponse
+from app.schemas.stock_history import StockHistoryResponse
+from app.utils.rows import validate_rows
+from database import engine
+
+SEED_SQL = """
+WITH u AS (
+  INSERT INTO users (name, email, firebase_uid) VALUES ('bench', :email, :email) RETURNING id
+), c AS (
+  INSERT INTO categories (name, icon, user_id) SELECT 'category ' || n, 'x', id FROM u, generate_series(1, :rows) n RETURNING id, user_id
+), i AS (
+  INSERT INTO items (name, brand, unit, default_quantity, notes, is_favorite, user_id, category_id)
+  SELECT 'item ' || id, 'brand', 'pcs', 1, 'note', id % 7 = 0, user_id, id FROM c
+  RETURNING id, user_id
+), s AS (
+  INSERT INTO stocks (quantity, threshold, location, item_id, user_id) SELECT 5, 1, 'fridge', id, user_id FROM i
+), l AS (
+  INSERT INTO shopping_list (quantity, checked, item_id, user_id) SELECT 2, false, id, user_id FROM i
+), r AS (
+  INSERT INTO shopping_records (quantity, price, store, bought_at, item_id, user_id)
+  SELECT 1, 100, 'store', now() - id * interval '1 hour', id, user_id FROM i
+), h AS (
+  INSERT INTO stock_history (change, reason, item_id, user_id, created_at)
+  SELECT -1, 'use', (SELECT min(id) FROM i), (SELECT id FROM u), now() - n * interval '1 hour' FROM generate_series(1, :rows) n
+), m AS (
+  INSERT INTO memos (title, content, is_done, tags, user_id)
+  SELECT 'memo ' || n, 'content', false, ARRAY['a', 'b'], id FROM u, generate_series(1, :rows) n
+)
+SELECT (SELECT id FROM u), (SELECT min(id) FROM i)
+"""
+
+# (名前, ORM の読み取り, Core の読み取り, レスポンスモデル)
+def endpoints(user_id, item_id: int):
+  return [
+    ("items", lambda db: db.query(Item).filter(Item.user_id == user_id).all(), lambda db: get_item_rows(user_id, None, None, db), ItemResponse),
+    ("categories", lambda db: db.query(Category).filter(Category.user_id == user_id).all(), lambda db: get_categories(user_id, db), CategoryResponse),
+    ("stocks", lambda db: db.query(Stock).filter(Stock.user_id == user_id).all(), lambda db: get_stocks(user_id, db), StockResponse),
+    ("shopping-list", lambda db: db.query(ShoppingList).filter(ShoppingList.user_id == user_id).all(), lambda db: get_shopping_lists(user_id, db), ShoppingListResponse),
+    ("shopping-records", lambda db: db.query(ShoppingRecord).filter(ShoppingRecord.user_id == user_id).all(), lambda db: get_shopping_records(user_id, db), ShoppingRecordResponse),
+    ("stock-history", lambda db: db.query(StockHistory).filter(StockHistory.item_id == item_id).all(), lambda db: get_stock_history_by_item_id(item_id, db), StockHistoryResponse),
+    ("memos", lambda db: db.query(Memo).filter(Memo.user_id == user_id).all(), lambda db: get_memos(user_id, db), MemoResponse),
+  ]
+
+def measure(db: Session, fn, repeat: int) -> tuple[float, float, list]:
+  wall = []
+  cpu = []
+  for _ in range(repeat):
+    db.expunge_all()
+    started, started_cpu = time.perf_counter(), time.process_time()
+    response = fn(db)
+    wall.append(time.perf_counter() - started)
+    cpu.append(time.process_time() - started_cpu)
+  wall.sort()
+  cpu.sort()
+  return wall[len(wall) // 2], cpu[len(cpu) // 2], response
+
+def run(rows: int, repeat: int):
+  with engine.connect() as conn:
+    user_id, item_id = conn.execute(text(SEED_SQL), {"email": f"bench-{uuid.uuid4()}", "rows": rows}).one()
+    with Session(bind=conn) as db:
+      print(f"rows={rows}  (wall / cpu の中央値、rows/s は cpu 基準)")
+      for name, orm_read, core_read, model in endpoints(user_id, item_id):
+        orm, orm_cpu, expected = measure(db, lambda db: [model.model_validate(row) for row in orm_read(db)], repeat)
+        core, core_cpu, actual = measure(db, lambda db: validate_rows(model, core_read(db)), repeat)
+        assert sorted(expected, key=lambda r: r.id) == sorted(actual, key=lambda r: r.id)
+        print(
+          f"{name:<17} orm {orm * 1000:7.1f} / {orm_cpu * 1000:7.1f} ms ({rows / orm_cpu:9.0f} rows/s)  "
+          f"core {core * 1000:7.1f} / {core_cpu * 1000:7.1f} ms ({rows / core_cpu:9.0f} rows/s)  cpu x{orm_cpu / core_cpu:4.1f}"
+        )
+    conn.rollback()
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--rows", type=int, default=5000)
+  parser.add_argument("--repeat", type=int, default=5)
+  args = parser.parse_args()
+
+  run(args.rows, args.repeat)
@@ -0,0 +1,98 @@
+# リポジトリが発行するクエリの実行計画を、マイグレーション適用前後で表示する
+#   python -m scripts.explain_queries [--user-id UUID] [--apply] [--analyze]
+# 小さいテーブルではインデックスがあっても Seq Scan になるので、実データ相当の件数で確認すること
+import argparse
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app.models.item import Item
+# relationship の解決に必要
+from app.models.shopping_list import ShoppingList
+from app.models.shopping_record import ShoppingRecord
+from app.models.stock import Stock
+from app.models.stock_history import StockHistory
+from app.models.user import User
+from app.repositories.items_repo import get_items
+from app.repositories.shopping_list_repo import get_shopping_list_by_item
+from app.repositories.shopping_records_repo import get_monthly_spending, get_shopping_records, get_spending_by_category, get_spending_by_item
+from app.repositories.stock_history_repo import get_stock_history_by_item_id
+from app.repositories.stocks_repo import get_stocks
+from database import engine
+from migrations.migrate import upgrade
+
+def repository_queries(user: User, item: Item):
+  return [
+    ("get_items", lambda db: get_items(user.id, None, None, db)),
+    ("get_items(category_id)", lambda db: get_items(user.id, item.category_id, None, db)),
+    ("get_items(is_favorite)", lambda db: get_items(user.id, None, True, db)),
+    ("get_stocks", lambda db: get_stocks(user.id, db)),
+    ("get_shopping_list_by_item", lambda db: get_shopping_list_by_item(user.id, item.id, db)),
+    ("get_stock_history_by_item_id", lambda db: get_stock_history_by_item_id(item.id, db)),
+    ("get_shopping_records", lambda db: get_shopping_records(user.id, db)),
+    ("get_monthly_spending", lambda db: get_monthly_spending(user.id, db)),
+    ("get_spending_by_item", lambda db: get_spending_by_item(user.id, db)),
+    ("get_spending_by_category", lambda db: get_spending_by_category(user.id, db)),
+    ("get_current_user", lambda db: db.query(User).filter(User.firebase_uid == user.firebase_uid).first()),
+  ]
+
+def capture_statements(fn):
+  statements = []
+  with engine.connect() as conn:
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+      statements.append((statement, parameters))
+    event.listen(conn, "before_cursor_execute", before_cursor_execute)
+    with Session(bind=conn) as db:
+      fn(db)
+    conn.rollback()
+  return statements
+
+def explain(statement: str, parameters, analyze: bool):
+  prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+  with engine.connect() as conn:
+    rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    conn.rollback()
+  return "\n".join(row[0] for row in rows)
+
+def print_plans(title: str, user: User, item: Item, analyze: bool):
+  print(f"\n######## {title} ########")
+  for name, fn in repository_queries(user, item):
+    for statement, parameters in capture_statements(fn):
+      print(f"\n=== {name} ===")
+      print(explain(statement, parameters, analyze))
+
+def pick_user_and_item(user_id: str | None):
+  with Session(engine) as db:
+    if user_id:
+      user = db.get(User, user_id)
+    else:
+      # 記録が一番多いユーザーを代表として使う
+      user = db.scalars(
+        select(User)
+        .join(ShoppingRecord, ShoppingRecord.user_id == User.id)
+        .group_by(User.id)
+        .order_by(func.count(ShoppingRecord.id).desc())
+        .limit(1)
+      ).first() or db.scalars(select(User).limit(1)).first()
+    if not user:
+      raise SystemExit("users テーブルが空です")
+    item = db.scalars(select(Item).where(Item.user_id == user.id).limit(1)).first()
+    if not item:
+      raise SystemExit("対象ユーザーの items が空です")
+    db.expunge_all()
+    return user, item
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--user-id")
+  parser.add_argument("--apply", action="store_true", help="前後の間で未適用のマイグレーションを適用する")
+  parser.add_argument("--analyze", action="store_true", help="EXPLAIN (ANALYZE, BUFFERS) で実測する")
+  args = parser.parse_args()
+
+  user, item = pick_user_and_item(args.user_id)
+  print_plans("before" if args.apply else "current", user, item, args.analyze)
+  if args.apply:
+    upgrade()
+    with engine.connect() as conn:
+      conn.exec_driver_sql("ANALYZE")
+      conn.commit()
+    print_plans("after", user, item, args.analyze)
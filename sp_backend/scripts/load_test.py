@@ -0,0 +1,368 @@
+# 負荷試験（ローカルの Postgres に対してアプリを起動し、混合ワークロードを流す）
+#   python -m scripts.load_test [--concurrency 1 8 32] [--duration 30] [--db-mode sync|async] [--compare load_results/前回.json]
+# - DATABASE_URL はローカルの Postgres を指す（DB_SSLMODE=disable）。マイグレーションを当て、
+#   load-test-* のユーザーとデータを作り直してから uvicorn でアプリを起動する（終わったら消す。--keep で残す）
+# - 認証は AUTH_VERIFIER=local にし、ここで作った鍵ファイルで検証させる（Firebase には出ない）
+# - ワークロード: dashboard（ダッシュボード）/ decrement（在庫を 1 減らす）/ purchase（購入記録）/ summary（支出サマリー 3 種）
+#   --mix dashboard=40,decrement=25,purchase=10,summary=25 の重みで選ぶ。--seed が同じなら同じ順序で選ぶ
+# - 同時実行数ごとに、エンドポイント別のスループットと p50 / p95 / p99（クライアント側と Server-Timing の total）を出し、
+#   コミット・設定と一緒に JSON に書き出す（--compare で前の結果と比べる）
+# RESPONSE_CACHE_TTL / REQUEST_METRICS_LOG などの環境変数はそのままアプリに渡る
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import httpx
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from sqlalchemy import make_url, text
+from sqlalchemy.orm import Session
+# relationship の解決に必要
+from app.models.category import Category
+from app.models.shopping_list import ShoppingList
+from app.models.stock import Stock
+from app.models.stock_history import StockHistory
+from app.repositories.spending_rollups_repo import rebuild_spending_rollups
+from app.repositories.store_prices_repo import rebuild_store_prices
+from database import DATABASE_URL, engine
+from migrations.migrate import upgrade
+
+ROOT = Path(__file__).resolve().parent.parent
+PROJECT_ID = "load-test"
+KEY_ID = "load-test"
+USER_PREFIX = "load-test-"
+LOCAL_HOSTS = (None, "localhost", "127.0.0.1", "::1")
+DEFAULT_MIX = "dashboard=40,decrement=25,purchase=10,summary=25"
+SUMMARY_PATHS = ("monthly", "items", "categories")
+
+SEED_SQL = """
+WITH u AS (
+  INSERT INTO users (name, email, firebase_uid) VALUES (:uid, :uid || '@example.com', :uid) RETURNING id
+), c AS (
+  INSERT INTO categories (name, icon, user_id) SELECT 'category ' || n, 'x', id FROM u, generate_series(1, :categories) n RETURNING id
+), cs AS (
+  SELECT array_agg(id ORDER BY id) ids FROM c
+), i AS (
+  INSERT INTO items (name, brand, unit, default_quantity, notes, is_favorite, user_id, category_id)
+  SELECT 'item ' || n, 'brand', 'pcs', 1, 'note', n % 7 = 0, (SELECT id FROM u), cs.ids[1 + n % array_length(cs.ids, 1)]
+  FROM cs, generate_series(1, :items) n
+  RETURNING id
+), ia AS (
+  SELECT array_agg(id ORDER BY id) ids FROM i
+), s AS (
+  INSERT INTO stocks (quantity, threshold, location, item_id, user_id) SELECT 100000, 1, 'fridge', id, (SELECT id FROM u) FROM i
+), r AS (
+  INSERT INTO shopping_records (quantity, price, store, bought_at, item_id, user_id)
+  SELECT 1 + n % 3, 100 + n % 400, 'store ' || n % 5, now() - (n % 365) * interval '1 day' - (n % 24) * interval '1 hour',
+    ia.ids[1 + n % array_length(ia.ids, 1)], (SELECT id FROM u)
+  FROM ia, generate_series(1, :records) n
+), h AS (
+  INSERT INTO stock_history (change, reason, item_id, user_id, created_at)
+  SELECT -1, 'use', ia.ids[1 + n % array_length(ia.ids, 1)], (SELECT id FROM u), now() - (n % 90) * interval '1 day'
+  FROM ia, generate_series(1, :records) n
+)
+SELECT (SELECT id FROM u), (SELECT ids FROM ia)
+"""
+
+# ===============
+# Setup
+# ===============
+
+# load-test-* のユーザーを作り直す（ユーザーを消せば子テーブルも ON DELETE CASCADE で消える）
+def seed(users: int, items: int, records: int) -> list[dict]:
+  upgrade()
+  cleanup()
+  seeded = []
+  with Session(engine) as db:
+    for n in range(users):
+      uid = f"{USER_PREFIX}{n}"
+      user_id, item_ids = db.execute(text(SEED_SQL), {"uid": uid, "categories": max(items // 10, 1), "items": items, "records": records}).one()
+      rebuild_spending_rollups(user_id, db)
+      rebuild_store_prices(user_id, db)
+      seeded.append({"uid": uid, "item_ids": item_ids})
+    db.commit()
+  return seeded
+
+def cleanup():
+  with engine.begin() as conn:
+    conn.execute(text("DELETE FROM users WHERE firebase_uid LIKE :prefix"), {"prefix": f"{USER_PREFIX}%"})
+
+# AUTH_KEYS_FILE に公開鍵を書き、秘密鍵で各ユーザーの ID トークンを作る
+def issue_tokens(users: list[dict], keys_file: Path):
+  key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+  pem = key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+  keys_file.write_text(json.dumps({KEY_ID: pem.decode()}))
+  now = int(time.time())
+  for user in users:
+    claims = {
+      "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+      "aud": PROJECT_ID,
+      "sub": user["uid"],
+      "email": f"{user['uid']}@example.com",
+      "iat": now,
+      "exp": now + 24 * 3600,
+    }
+    token = jwt.encode(claims, key, algorithm="RS256", headers={"kid": KEY_ID})
+    user["headers"] = {"Authorization": f"Bearer {token}"}
+
+def start_server(args, keys_file: Path, log) -> subprocess.Popen:
+  env = {
+    **os.environ,
+    "AUTH_VERIFIER": "local",
+    "FIREBASE_PROJECT_ID": PROJECT_ID,
+    "AUTH_KEYS_FILE": str(keys_file),
+    "DB_MODE": args.db_mode,
+  }
+  command = [
+    sys.executable, "-m", "uvicorn", "main:app",
+    "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(args.workers),
+    "--no-access-log", "--log-level", "warning",
+  ]
+  return subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout: float = 60):
+  deadline = time.monotonic() + timeout
+  while time.monotonic() < deadline:
+    if server.poll() is not None:
+      raise SystemExit(f"server exited with {server.returncode} (see --server-log)")
+    try:
+      httpx.get(f"{base_url}/metrics", timeout=1)
+      return
+    except httpx.HTTPError:
+      time.sleep(0.2)
+  raise SystemExit(f"server did not start within {timeout:.0f} s")
+
+# ===============
+# Workload
+# ===============
+
+# 各操作は (ルート, メソッド, パス, JSON) を返す。ルートは集計のキー
+def dashboard(user: dict, rng: random.Random):
+  return "GET /api/v1/dashboard", "GET", "/api/v1/dashboard", None
+
+def decrement(user: dict, rng: random.Random):
+  item_id = rng.choice(user["item_ids"])
+  body = {"action": "decrease", "quantity": 1, "threshold": 1, "location": "fridge", "reason": "use"}
+  return "PUT /api/v1/items/{item_id}/stock", "PUT", f"/api/v1/items/{item_id}/stock", body
+
+def purchase(user: dict, rng: random.Random):
+  body = {
+    "item_id": rng.choice(user["item_ids"]),
+    "quantity": rng.randint(1, 3),
+    "price": rng.randint(100, 500),
+    "store": f"store {rng.randrange(5)}",
+    "bought_at": datetime.now().isoformat(timespec="seconds"),
+  }
+  return "POST /api/v1/shopping-records", "POST", "/api/v1/shopping-records", body
+
+def summary(user: dict, rng: random.Random):
+  path = f"/api/v1/shopping-records/summary/{rng.choice(SUMMARY_PATHS)}"
+  return f"GET {path}", "GET", path, None
+
+OPERATIONS = {"dashboard": dashboard, "decrement": decrement, "purchase": purchase, "summary": summary}
+
+def parse_mix(value: str) -> dict[str, float]:
+  mix = {}
+  for part in value.split(","):
+    name, _, weight = part.partition("=")
+    if name not in OPERATIONS:
+      raise argparse.ArgumentTypeError(f"unknown operation: {name} (choose from {', '.join(OPERATIONS)})")
+    mix[name] = float(weight)
+  return mix
+
+# 応答が返ったらすぐ次を投げる（クローズドループ）。サンプルは (ルート, 秒, ステータス, サーバー側の ms)
+async def worker(client: httpx.AsyncClient, users: list[dict], mix: dict, rng: random.Random, stop_at: float, samples: list):
+  names, weights = list(mix), list(mix.values())
+  while time.perf_counter() < stop_at:
+    user = rng.choice(users)
+    route, method, path, body = OPERATIONS[rng.choices(names, weights)[0]](user, rng)
+    started = time.perf_counter()
+    try:
+      response = await client.request(method, path, json=body, headers=user["headers"])
+      status, server_ms = response.status_code, server_total_ms(response.headers.get("server-timing"))
+    except httpx.HTTPError:
+      status, server_ms = None, None
+    samples.append((route, time.perf_counter() - started, status, server_ms))
+
+def server_total_ms(header: str | None) -> float | None:
+  match = re.search(r"total;dur=([\d.]+)", header or "")
+  return float(match.group(1)) if match else None
+
+async def run_level(base_url: str, users: list[dict], mix: dict, concurrency: int, warmup: float, duration: float, seed: int) -> dict:
+  limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+  async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+    if warmup > 0:
+      stop_at = time.perf_counter() + warmup
+      await asyncio.gather(*(worker(client, users, mix, random.Random(f"warmup:{seed}:{concurrency}:{n}"), stop_at, []) for n in range(concurrency)))
+    samples = []
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(client, users, mix, random.Random(f"{seed}:{concurrency}:{n}"), started + duration, samples) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+  return summarize(samples, concurrency, elapsed)
+
+# ===============
+# Results
+# ===============
+
+def percentile(values: list[float], p: float) -> float | None:
+  if not values:
+    return None
+  return values[min(len(values) - 1, max(math.ceil(p / 100 * len(values)) - 1, 0))]
+
+def latency_stats(samples: list, elapsed: float) -> dict:
+  client = sorted(seconds * 1000 for _, seconds, _, _ in samples)
+  server = sorted(ms for _, _, _, ms in samples if ms is not None)
+  statuses = {}
+  for _, _, status, _ in samples:
+    key = str(status) if status is not None else "error"
+    statuses[key] = statuses.get(key, 0) + 1
+  stats = {
+    "requests": len(samples),
+    "errors": sum(1 for _, _, status, _ in samples if status is None or status >= 400),
+    "statuses": dict(sorted(statuses.items())),
+    "throughput_rps": round(len(samples) / elapsed, 2),
+  }
+  for p in (50, 95, 99):
+    stats[f"p{p}_ms"] = round(percentile(client, p), 3) if client else None
+  stats["max_ms"] = round(client[-1], 3) if client else None
+  for p in (50, 95, 99):
+    stats[f"server_p{p}_ms"] = round(percentile(server, p), 3) if server else None
+  return stats
+
+def summarize(samples: list, concurrency: int, elapsed: float) -> dict:
+  by_route = {}
+  for sample in samples:
+    by_route.setdefault(sample[0], []).append(sample)
+  return {
+    "concurrency": concurrency,
+    "duration_s": round(elapsed, 3),
+    **latency_stats(samples, elapsed),
+    "endpoints": {route: latency_stats(rows, elapsed) for route, rows in sorted(by_route.items())},
+  }
+
+def print_level(level: dict):
+  print(
+    f"concurrency={level['concurrency']}  {level['requests']} requests in {level['duration_s']:.1f} s  "
+    f"{level['throughput_rps']:.1f} req/s  errors {level['errors']}"
+  )
+  for route, stats in level["endpoints"].items():
+    print(
+      f"  {route:<48} {stats['requests']:7d} req {stats['throughput_rps']:8.1f} req/s  "
+      f"p50 {stats['p50_ms']:7.1f}  p95 {stats['p95_ms']:7.1f}  p99 {stats['p99_ms']:7.1f} ms  "
+      f"(server p50 {stats['server_p50_ms'] or 0:6.1f})  errors {stats['errors']}"
+    )
+
+# 同じ同時実行数・ルートどうしで、スループットと p50 / p95 / p99 の変化率を出す
+def compare(result: dict, baseline: dict):
+  print(f"compared with {baseline['commit'] or '?'} ({baseline['started_at']})")
+  levels = {level["concurrency"]: level for level in baseline["levels"]}
+  for level in result["levels"]:
+    previous = levels.get(level["concurrency"])
+    if previous is None:
+      continue
+    print(f"concurrency={level['concurrency']}")
+    for route, stats in {"all": level, **level["endpoints"]}.items():
+      before = previous if route == "all" else previous["endpoints"].get(route)
+      if before is None:
+        continue
+      changes = "  ".join(f"{key.removesuffix('_ms')} {change(before[key], stats[key])}" for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"))
+      print(f"  {route:<48} {changes}")
+
+def change(before: float | None, after: float | None) -> str:
+  if not before or after is None:
+    return "    -"
+  return f"{(after - before) / before * 100:+6.1f}%"
+
+def git_revision() -> tuple[str | None, bool]:
+  commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+  status = subprocess.run(["git", "status", "--porcelain"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+  return commit or None, bool(status)
+
+def run(args):
+  if make_url(DATABASE_URL).host not in LOCAL_HOSTS and not args.allow_remote:
+    raise SystemExit("DATABASE_URL is not a local Postgres (pass --allow-remote to run anyway)")
+
+  commit, dirty = git_revision()
+  started_at = datetime.now(timezone.utc)
+  users = seed(args.users, args.items, args.records)
+  base_url = f"http://127.0.0.1:{args.port}"
+  levels = []
+  log = open(args.server_log, "w") if args.server_log else subprocess.DEVNULL
+  try:
+    with tempfile.TemporaryDirectory() as tmp:
+      keys_file = Path(tmp) / "keys.json"
+      issue_tokens(users, keys_file)
+      server = start_server(args, keys_file, log)
+      try:
+        wait_until_ready(base_url, server)
+        for concurrency in args.concurrency:
+          level = asyncio.run(run_level(base_url, users, args.mix, concurrency, args.warmup, args.duration, args.seed))
+          print_level(level)
+          levels.append(level)
+      finally:
+        server.terminate()
+        server.wait(timeout=30)
+  finally:
+    if log is not subprocess.DEVNULL:
+      log.close()
+    if not args.keep:
+      cleanup()
+
+  result = {
+    "commit": commit,
+    "dirty": dirty,
+    "started_at": started_at.isoformat(),
+    "config": {
+      "db_mode": args.db_mode,
+      "workers": args.workers,
+      "users": args.users,
+      "items": args.items,
+      "records": args.records,
+      "mix": args.mix,
+      "warmup_s": args.warmup,
+      "duration_s": args.duration,
+      "seed": args.seed,
+      "env": {name: os.environ[name] for name in sorted(os.environ) if name.startswith(("RESPONSE_CACHE_", "TOKEN_CACHE_", "REQUEST_METRICS_", "SLOW_QUERY_", "RESTOCK_"))},
+    },
+    "levels": levels,
+  }
+  output = Path(args.output) if args.output else ROOT / "load_results" / f"{started_at:%Y%m%dT%H%M%S}-{(commit or 'unknown')[:8]}-{args.db_mode}.json"
+  output.parent.mkdir(parents=True, exist_ok=True)
+  output.write_text(json.dumps(result, ensure_ascii=False, indent=1))
+  print(f"wrote {output}")
+
+  if args.compare:
+    compare(result, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+  parser.add_argument("--duration", type=float, default=30, help="seconds measured per concurrency level")
+  parser.add_argument("--warmup", type=float, default=5, help="seconds before each level that are not measured")
+  parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+  parser.add_argument("--users", type=int, default=20)
+  parser.add_argument("--items", type=int, default=50, help="items per user")
+  parser.add_argument("--records", type=int, default=500, help="shopping records (and stock history rows) per user")
+  parser.add_argument("--db-mode", choices=["sync", "async"], default="sync")
+  parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+  parser.add_argument("--port", type=int, default=8765)
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--output", help="result JSON (default: load_results/<time>-<commit>-<db mode>.json)")
+  parser.add_argument("--compare", help="earlier result JSON to compare with")
+  parser.add_argument("--server-log", help="write the app's stdout / stderr here")
+  parser.add_argument("--keep", action="store_true", help="keep the load-test-* users and their data")
+  parser.add_argument("--allow-remote", action="store_true")
+  args = parser.parse_args()
+
+  run(args)
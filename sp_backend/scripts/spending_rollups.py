@@ -0,0 +1,40 @@
+# 支出の集計テーブル（spending_rollups）の再構築と整合性チェック
+#   python -m scripts.spending_rollups rebuild [--user-id UUID]
+#   python -m scripts.spending_rollups check [--user-id UUID]
+# check は食い違いがあれば一覧を出して終了コード 1 を返す
+import argparse
+import sys
+from sqlalchemy.orm import Session
+# relationship の解決に必要
+from app.models.category import Category
+from app.models.shopping_list import ShoppingList
+from app.models.stock import Stock
+from app.models.stock_history import StockHistory
+from app.repositories.spending_rollups_repo import check_spending_rollups, rebuild_spending_rollups
+from database import engine
+
+def rebuild(user_id: str | None):
+  with Session(engine) as db:
+    count = rebuild_spending_rollups(user_id, db)
+    db.commit()
+  print(f"rebuilt {count} rows")
+
+def check(user_id: str | None) -> bool:
+  with Session(engine) as db:
+    rows = check_spending_rollups(user_id, db)
+  for row in rows:
+    print(dict(row._mapping))
+  print(f"{len(rows)} mismatched rows")
+  return not rows
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser()
+  parser.add_argument("command", choices=["rebuild", "check"])
+  parser.add_argument("--user-id")
+  args = parser.parse_args()
+
+  if args.command == "rebuild":
+    rebuild(args.user_id)
+  elif not check(args.user_id):
+    sys.exit(1)
@@ -51,4 +51,13 @@
 # async def client():
 #   transport = ASGITransport(app=app)
 #   async with AsyncClient(transport=transport, base_url="http://test") as ac:
-#     yield ac
\ No newline at end of file
+#     yield ac
+
+import pytest
+from app.core.query_budget import track_query_budgets
+
+# テスト中のリクエストごとの SQL 件数を集め、ルートの @query_budget を超えたものがあれば失敗にする
+@pytest.fixture
+def query_budget():
+  with track_query_budgets() as tracker:
+    yield tracker
@@ -0,0 +1,64 @@
+# ===============
+# PriceAnalytics
+# ===============
+
+async def test_price_history(auth_client):
+  item = await __create_item_with_records(auth_client)
+  response = await auth_client.get(f"/api/v1/items/{item.json()["data"]["id"]}/price-history?window=2")
+  assert response.status_code == 200
+  data = response.json()["data"]
+  assert [p["unit_price"] for p in data["points"]] == [150, 120, 90]
+  assert [p["rolling_avg"] for p in data["points"]] == [150, 135, 105]
+  assert data["summary"]["last_unit_price"] == 90
+  assert data["summary"]["last_store"] == "A"
+  assert {s["store"]: s["min_unit_price"] for s in data["summary"]["stores"]} == {"A": 90, "B": 120}
+
+async def test_price_history_not_found(auth_client):
+  response = await auth_client.get("/api/v1/items/999999/price-history")
+  assert response.status_code == 404
+
+async def test_price_analytics_follows_records(auth_client):
+  item = await __create_item_with_records(auth_client)
+  response = await auth_client.get("/api/v1/analytics/prices")
+  assert response.status_code == 200
+  assert response.json()["data"][0]["max_unit_price"] == 150
+
+  await auth_client.post("/api/v1/shopping-records", json={
+    "item_id": item.json()["data"]["id"],
+    "quantity": 1,
+    "price": 500,
+    "store": "B",
+    "bought_at": "2025-11-04"
+  })
+  response = await auth_client.get("/api/v1/analytics/prices")
+  data = response.json()["data"][0]
+  assert data["max_unit_price"] == 500
+  assert data["last_store"] == "B"
+
+# Private
+
+async def __create_item_with_records(auth_client):
+  category = await auth_client.post("/api/v1/categories", json={
+    "name": "apple",
+    "icon": "🍎"
+  })
+  item = await auth_client.post("/api/v1/items", json={
+    "name": "testName",
+    "default_quantity": 10,
+    "is_favorite": True,
+    "category_id": category.json()["data"]["id"]
+  })
+  await auth_client.post(f"/api/v1/test/{item.json()["data"]["id"]}", json={
+    "quantity": 10,
+    "threshold": 20,
+    "location": "test"
+  })
+  for quantity, price, store, bought_at in [(2, 300, "A", "2025-11-01"), (1, 120, "B", "2025-11-02"), (3, 270, "A", "2025-11-03")]:
+    await auth_client.post("/api/v1/shopping-records", json={
+      "item_id": item.json()["data"]["id"],
+      "quantity": quantity,
+      "price": price,
+      "store": store,
+      "bought_at": bought_at
+    })
+  return item
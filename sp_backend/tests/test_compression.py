@@ -0,0 +1,105 @@
+import gzip
+import brotli
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionMiddleware, CompressionStats, negotiate_encoding, skip_compression
+from app.routers import compression_router
+from app.utils import auth
+from app.utils.response import success
+
+# ===============
+# Compression
+# ===============
+
+def test_negotiate_encoding():
+  assert negotiate_encoding("gzip, deflate, br") == "br"
+  assert negotiate_encoding("gzip") == "gzip"
+  assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+  assert negotiate_encoding("gzip;q=0, identity") is None
+  assert negotiate_encoding("*") == "br"
+  assert negotiate_encoding("") is None
+
+def test_compression_middleware():
+  stats = CompressionStats()
+  client = TestClient(__create_app(stats))
+
+  response = client.get("/api/v1/rows/3", headers={"Accept-Encoding": "gzip"})
+  assert response.headers["content-encoding"] == "gzip"
+  assert response.headers["vary"] == "Accept-Encoding"
+  assert len(response.json()["data"]) == 200
+
+  # 圧縮済みのレスポンスは二重に圧縮しない
+  response = client.get("/api/v1/encoded", headers={"Accept-Encoding": "br"})
+  assert response.headers["content-encoding"] == "gzip"
+  assert response.text.count("line") == 100
+
+  # しきい値未満は圧縮しない
+  response = client.get("/api/v1/small", headers={"Accept-Encoding": "gzip"})
+  assert "content-encoding" not in response.headers
+
+  response = client.get("/api/v1/skip", headers={"Accept-Encoding": "gzip"})
+  assert "content-encoding" not in response.headers
+  assert len(response.json()["data"]) == 200
+
+  # ストリーミングはチャンクごとに圧縮して流す
+  with client.stream("GET", "/api/v1/stream", headers={"Accept-Encoding": "br"}) as response:
+    assert response.headers["content-encoding"] == "br"
+    assert "content-length" not in response.headers
+    raw = b"".join(response.iter_raw())
+  assert brotli.decompress(raw).decode().splitlines() == [f"line {n}" for n in range(100)]
+
+  routes = stats.stats()
+  assert routes["GET /api/v1/rows/{row_id}"]["encodings"] == {"gzip": 1}
+  assert routes["GET /api/v1/rows/{row_id}"]["ratio"] < 0.5
+  assert routes["GET /api/v1/small"]["compressed"] == 0
+  assert routes["GET /api/v1/skip"]["compressed"] == 0
+  assert routes["GET /api/v1/encoded"]["compressed"] == 0
+  assert routes["GET /api/v1/stream"]["bytes_in"] == len("".join(f"line {n}\n" for n in range(100)))
+
+def test_compression_gzip_stream_roundtrip():
+  client = TestClient(__create_app(CompressionStats()))
+  with client.stream("GET", "/api/v1/stream", headers={"Accept-Encoding": "gzip"}) as response:
+    raw = b"".join(response.iter_raw())
+  assert gzip.decompress(raw).decode().count("\n") == 100
+
+def test_compression_stats_requires_admin_token(monkeypatch):
+  monkeypatch.setattr(auth, "ADMIN_TOKEN", "admin-secret")
+  app = FastAPI()
+  app.include_router(compression_router.router, prefix="/api/v1")
+  client = TestClient(app)
+
+  assert client.get("/api/v1/compression/stats", headers={"Authorization": "Bearer user-id-token"}).status_code == 403
+  assert client.get("/api/v1/compression/stats", headers={"Authorization": "Bearer admin-secret"}).status_code == 200
+
+# private
+
+def __create_app(stats: CompressionStats):
+  router = APIRouter()
+  rows = [{"id": n, "user_id": "00000000-0000-0000-0000-000000000001", "name": "item"} for n in range(200)]
+
+  @router.get("/rows/{row_id}")
+  def get_rows(row_id: int):
+    return success(rows)
+
+  @router.get("/small")
+  def get_small():
+    return PlainTextResponse("ok")
+
+  @router.get("/skip", dependencies=[Depends(skip_compression)])
+  def get_skip():
+    return success(rows)
+
+  @router.get("/encoded")
+  def get_encoded():
+    body = gzip.compress("".join(f"line {n}\n" for n in range(100)).encode())
+    return Response(body, media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+  @router.get("/stream")
+  def get_stream():
+    return StreamingResponse((f"line {n}\n" for n in range(100)), media_type="text/plain")
+
+  app = FastAPI()
+  app.include_router(router, prefix="/api/v1")
+  app.add_middleware(CompressionMiddleware, minimum_size=500, stats=stats)
+  return app
@@ -0,0 +1,58 @@
+# ===============
+# GetDashboard
+# ===============
+
+async def test_get_dashboard_success(auth_client):
+  item = await __create_category_item_stock(auth_client)
+  await auth_client.post("/api/v1/shopping-list", json={
+    "item_id": item.json()["data"]["id"],
+    "quantity": 10
+  })
+  response = await auth_client.get("/api/v1/dashboard")
+  assert response.status_code == 200
+  data = response.json()
+  assert data["success"]
+  assert data["data"]["items"][0]["category_name"] == "apple"
+  assert data["data"]["items"][0]["stock"]["quantity"] == 10
+  assert len(data["data"]["low_stock"]) == 1
+  assert data["data"]["shopping_list"][0]["name"] == "testName"
+  assert data["data"]["memos"] == []
+
+async def test_get_dashboard_sections(auth_client):
+  await __create_category_item_stock(auth_client)
+  response = await auth_client.get("/api/v1/dashboard?sections=low_stock&limit=1")
+  assert response.status_code == 200
+  data = response.json()
+  assert data["success"]
+  assert list(data["data"].keys()) == ["low_stock"]
+  assert len(data["data"]["low_stock"]) == 1
+
+async def test_get_dashboard_unknown_section(auth_client):
+  response = await auth_client.get("/api/v1/dashboard?sections=unknown")
+  assert response.status_code == 400
+  data = response.json()
+  assert not data["success"]
+
+# Private
+
+async def __create_category_item_stock(auth_client):
+  category = await auth_client.post("/api/v1/categories", json={
+    "name": "apple",
+    "icon": "🍎"
+  })
+  item = await auth_client.post("/api/v1/items", json={
+    "name": "testName",
+    "brand": "brandName",
+    "unit": "unitName",
+    "image_url": "http://www.....",
+    "default_quantity": 10,
+    "notes": "noteName",
+    "is_favorite": True,
+    "category_id": category.json()["data"]["id"]
+  })
+  await auth_client.post(f"/api/v1/test/{item.json()["data"]["id"]}", json={
+    "quantity": 10,
+    "threshold": 20,
+    "location": "test"
+  })
+  return item
@@ -0,0 +1,29 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from app.utils.export import export_chunks
+
+# ===============
+# Export
+# ===============
+
+COLUMNS = ("id", "bought_at", "store", "price")
+PARTITIONS = [
+  [(1, datetime(2025, 11, 1, 9, 0), "a,b", Decimal("100"))],
+  [(2, datetime(2025, 11, 2), "c", Decimal("1.5"))],
+]
+
+def test_export_csv():
+  body = b"".join(export_chunks(iter(PARTITIONS), COLUMNS, "csv")).decode("utf-8-sig")
+  assert body.splitlines() == [
+    "id,bought_at,store,price",
+    '1,2025-11-01T09:00:00,"a,b",100',
+    "2,2025-11-02T00:00:00,c,1.5",
+  ]
+
+def test_export_ndjson():
+  chunks = list(export_chunks(iter(PARTITIONS), COLUMNS, "ndjson"))
+  assert len(chunks) == 2
+  rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+  assert rows[0] == {"id": 1, "bought_at": "2025-11-01T09:00:00", "store": "a,b", "price": 100}
+  assert rows[1]["price"] == 1.5
@@ -0,0 +1,45 @@
+import numpy as np
+from app.core.forecast import SECONDS_PER_DAY, forecast_consumption, forecast_days_of_supply, needs_restock
+
+DAY = SECONDS_PER_DAY
+NOW = 100 * DAY
+
+# ===============
+# Forecast
+# ===============
+
+def test_forecast_steady_consumption():
+  # アイテム 1: 1 日 2 個ずつ / アイテム 2: 2 日に 1 個ずつ
+  history = [(1, NOW - d * DAY, 2) for d in (3, 2, 1, 0)] + [(2, NOW - d * DAY, 1) for d in (6, 4, 2, 0)]
+  forecast = forecast_consumption(history, [(1, 10), (2, 3)], NOW, half_life_days=1e9)
+  np.testing.assert_allclose(forecast.rates, [2, 0.5])
+  np.testing.assert_allclose(forecast.days_of_supply, [5, 6])
+  np.testing.assert_allclose(forecast.run_out_at, [NOW + 5 * DAY, NOW + 6 * DAY])
+  assert forecast.samples.tolist() == [3, 3]
+
+def test_forecast_insufficient_history():
+  history = [(1, NOW - DAY, 1), (3, NOW - 2 * DAY, 1), (3, NOW - DAY, 1)]
+  forecast = forecast_consumption(history, [(1, 5), (2, 5), (3, 5)], NOW)
+  assert np.isnan(forecast.rates[0])
+  assert np.isnan(forecast.rates[1])
+  assert forecast.rates[2] > 0
+
+  forecast = forecast_consumption([(1, NOW, 1)], [(1, 5)], NOW)
+  assert np.isnan(forecast.days_of_supply[0])
+
+def test_forecast_idle_time_lowers_rate():
+  history = [(1, NOW - 11 * DAY, 1), (1, NOW - 10 * DAY, 1)]
+  forecast = forecast_consumption(history, [(1, 1)], NOW, half_life_days=1e9)
+  np.testing.assert_allclose(forecast.rates, [1 / 11])
+
+def test_forecast_empty():
+  forecast = forecast_consumption(np.empty((0, 3)), np.empty((0, 2)), NOW)
+  assert len(forecast.item_ids) == 0
+
+def test_needs_restock():
+  history = [(1, NOW - d * DAY, 1) for d in (2, 1, 0)]
+  assert forecast_days_of_supply(history, 1, 2, NOW) == 2
+  assert forecast_days_of_supply([], 1, 2, NOW) is None
+  assert needs_restock(10, 1, 2)
+  assert not needs_restock(10, 1, 30)
+  assert needs_restock(0, 1, None)
@@ -48,6 +48,36 @@ async def test_get_item_success(auth_client):
   assert data["data"]["is_favorite"] == True
   assert data["data"]["category_id"] == 1
   
+async def test_get_items_include_success(auth_client):
+  item = await __create_category_item(auth_client, 1, True)
+  await auth_client.post(f"/api/v1/test/{item.json()["data"]["id"]}", json={
+    "quantity": 10,
+    "threshold": 20,
+    "location": "test"
+  })
+  response = await auth_client.get("/api/v1/items?include=stock,category,shopping_list")
+  assert response.status_code == 200
+  data = response.json()
+  assert data["success"]
+  assert data["data"][0]["stock"]["quantity"] == 10
+  assert data["data"][0]["category"]["name"] == "apple"
+  assert data["data"][0]["shopping_list"] == []
+
+async def test_get_item_include_category_success(auth_client):
+  item = await __create_category_item(auth_client, 1, True)
+  response = await auth_client.get(f"/api/v1/items/{item.json()["data"]["id"]}?include=category")
+  assert response.status_code == 200
+  data = response.json()
+  assert data["success"]
+  assert data["data"]["category"]["name"] == "apple"
+  assert "stock" not in data["data"]
+
+async def test_get_items_include_unknown(auth_client):
+  response = await auth_client.get("/api/v1/items?include=unknown")
+  assert response.status_code == 400
+  data = response.json()
+  assert data["success"] is False
+
 async def test_get_item_not_found(auth_client):
   response = await auth_client.get(f"/api/v1/items/{30}")
   assert response.status_code == 404
@@ -148,6 +178,20 @@ async def test_delete_item_success(auth_client):
   data = response.json()
   assert data["success"]
 
+async def test_delete_item_cascades_children(auth_client):
+  item = await __create_category_item(auth_client, 1, True)
+  item_id = item.json()["data"]["id"]
+  await auth_client.post("/api/v1/stocks", json={
+    "quantity": 5,
+    "threshold": 1,
+    "location": "fridge",
+    "item_id": item_id
+  })
+  response = await auth_client.delete(f"/api/v1/items/{item_id}")
+  assert response.status_code == 200
+  response = await auth_client.get(f"/api/v1/items/{item_id}/stock")
+  assert response.status_code == 404
+
 async def test_delete_item_not_found(auth_client):
   response = await auth_client.delete(f"/api/v1/items/{50}")
   assert response.status_code == 404
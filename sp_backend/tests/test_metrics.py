@@ -0,0 +1,92 @@
+import threading
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core.metrics import MetricsRegistry, TimedQueuePool
+from app.core.request_metrics import RequestMetricsMiddleware, instrument_engine
+from app.routers import metrics_router
+from app.utils.response import success
+
+# ===============
+# Metrics
+# ===============
+
+def test_counter_sums_thread_shards():
+  registry = MetricsRegistry()
+  counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+
+  def work():
+    for _ in range(1000):
+      counter.inc(("a",))
+
+  threads = [threading.Thread(target=work) for _ in range(4)]
+  for t in threads:
+    t.start()
+  for t in threads:
+    t.join()
+  counter.inc(("b",), 2)
+
+  lines = registry.render().splitlines()
+  assert "# TYPE jobs_total counter" in lines
+  assert 'jobs_total{kind="a"} 4000' in lines
+  assert 'jobs_total{kind="b"} 2' in lines
+
+# 短命なスレッドが入れ替わってもシャードは増え続けない（終わったスレッドの分は retired に畳まれる）
+def test_counter_folds_finished_thread_shards():
+  registry = MetricsRegistry()
+  counter = registry.counter("churn_total", "Jobs.")
+
+  for _ in range(200):
+    t = threading.Thread(target=counter.inc)
+    t.start()
+    t.join()
+
+  assert len(counter._values._shards) <= 1
+  assert 'churn_total 200' in registry.render().splitlines()
+
+def test_histogram_render():
+  registry = MetricsRegistry()
+  histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+  for seconds in (0.05, 0.1, 0.5, 3.0):
+    histogram.observe(seconds, ('/items/"x"',))
+
+  lines = registry.render().splitlines()
+  assert 'latency_seconds_bucket{route="/items/\\"x\\"",le="0.1"} 2' in lines
+  assert 'latency_seconds_bucket{route="/items/\\"x\\"",le="1.0"} 3' in lines
+  assert 'latency_seconds_bucket{route="/items/\\"x\\"",le="+Inf"} 4' in lines
+  assert 'latency_seconds_sum{route="/items/\\"x\\""} 3.65' in lines
+  assert 'latency_seconds_count{route="/items/\\"x\\""} 4' in lines
+
+def test_metrics_endpoint(tmp_path):
+  client = TestClient(__create_app(tmp_path))
+
+  assert client.get("/api/v1/metrics-test/rows/2").status_code == 200
+  assert client.get("/api/v1/metrics-test/missing").status_code == 404
+  body = client.get("/metrics").text
+
+  assert 'http_responses_total{method="GET",route="/api/v1/metrics-test/rows/{count}",status="200"} 1' in body
+  assert 'http_responses_total{method="GET",route="unmatched",status="404"}' in body
+  assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/metrics-test/rows/{count}"} 1' in body
+  assert 'http_db_statements_total{method="GET",route="/api/v1/metrics-test/rows/{count}"} 2' in body
+  assert 'db_pool_checkout_wait_seconds_count{engine="sync"}' in body
+  assert 'db_pool_checked_out{engine="sync"} 0' in body
+  assert "threadpool_threads_max 40" in body
+
+# private
+
+def __create_app(tmp_path):
+  engine = create_engine(f"sqlite:///{tmp_path}/metrics.db", poolclass=TimedQueuePool)
+  instrument_engine(engine)
+  router = APIRouter()
+
+  @router.get("/metrics-test/rows/{count}")
+  def get_rows(count: int):
+    with engine.connect() as conn:
+      rows = [conn.execute(text(f"SELECT {n}")).scalar_one() for n in range(count)]
+    return success(rows)
+
+  app = FastAPI()
+  app.include_router(router, prefix="/api/v1")
+  app.include_router(metrics_router.router)
+  app.add_middleware(RequestMetricsMiddleware, log=False)
+  return app
@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import column
+from app.utils.pagination import PageParams, decode_cursor, encode_cursor, split_page
+
+# ===============
+# Cursor
+# ===============
+
+def test_cursor_round_trip():
+  values = [datetime(2025, 11, 30, 12, 0, tzinfo=timezone.utc), 42]
+  assert decode_cursor(encode_cursor(values)) == values
+
+def test_cursor_invalid():
+  with pytest.raises(RequestValidationError):
+    decode_cursor("not-a-cursor")
+  with pytest.raises(RequestValidationError):
+    decode_cursor(encode_cursor([]))
+
+# ===============
+# SplitPage
+# ===============
+
+def test_split_page_without_page():
+  rows, next_cursor = split_page([1, 2, 3], (column("id"),), None)
+  assert rows == [1, 2, 3]
+  assert next_cursor is None
+
+def test_split_page_has_next():
+  keys = (column("created_at"), column("id"))
+  created_at = datetime(2025, 11, 30, tzinfo=timezone.utc)
+  rows = [SimpleNamespace(id=i, created_at=created_at) for i in (3, 2, 1)]
+  page, next_cursor = split_page(rows, keys, PageParams(2, None))
+  assert [r.id for r in page] == [3, 2]
+  assert decode_cursor(next_cursor) == [created_at, 2]
+
+def test_split_page_last_page():
+  rows = [SimpleNamespace(id=1)]
+  page, next_cursor = split_page(rows, (column("id"),), PageParams(2, None))
+  assert len(page) == 1
+  assert next_cursor is None
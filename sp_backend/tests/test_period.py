@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+import pytest
+from fastapi.exceptions import RequestValidationError
+from app.utils.period import summary_period, summary_range
+
+# ===============
+# SummaryRange
+# ===============
+
+def test_summary_range_local_dates_to_utc():
+  period = summary_range(datetime(2025, 11, 1), datetime(2025, 12, 1), "Asia/Tokyo")
+  assert period.start == datetime(2025, 10, 31, 15, 0)
+  assert period.end == datetime(2025, 11, 30, 15, 0)
+  assert period.tz == "Asia/Tokyo"
+
+def test_summary_range_aware_datetime():
+  period = summary_range(datetime(2025, 11, 1, 9, 0, tzinfo=timezone.utc), None, "Asia/Tokyo")
+  assert period.start == datetime(2025, 11, 1, 9, 0)
+  assert period.end is None
+
+def test_summary_range_invalid():
+  with pytest.raises(RequestValidationError):
+    summary_range(None, None, "Nowhere/Unknown")
+  with pytest.raises(RequestValidationError):
+    summary_range(datetime(2025, 12, 1), datetime(2025, 11, 1), "UTC")
+
+def test_summary_period_granularity():
+  period = summary_period(summary_range(None, None, "UTC"), "week")
+  assert period.granularity == "week"
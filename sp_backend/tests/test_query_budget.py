@@ -0,0 +1,215 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core.query_budget import QueryBudgetExceeded, query_budget, route_query_budget, track_query_budgets
+from app.core.request_metrics import RequestMetricsMiddleware, instrument_engine
+from app.routers import analytics_router, cache_router, category_router, compression_router, dashboard_router, item_router, memo_router, metrics_router, shopping_list_router, shopping_record_router, slow_query_router, stock_router, user_router
+from app.routers.aio import category_router as aio_category_router, item_router as aio_item_router, memo_router as aio_memo_router, shopping_list_router as aio_shopping_list_router, shopping_record_router as aio_shopping_record_router, stock_router as aio_stock_router, user_router as aio_user_router
+from app.routers.test import test_router
+
+SYNC_ROUTERS = [analytics_router, cache_router, category_router, compression_router, dashboard_router, item_router, memo_router, metrics_router, shopping_list_router, shopping_record_router, slow_query_router, stock_router, user_router, test_router]
+AIO_ROUTERS = [aio_category_router, aio_item_router, aio_memo_router, aio_shopping_list_router, aio_shopping_record_router, aio_stock_router, aio_user_router]
+
+# 行数を変えても件数が変わらないことを見る一覧系のエンドポイント
+LIST_PATHS = [
+  "/api/v1/items",
+  "/api/v1/items?include=stock,category,shopping_list",
+  "/api/v1/categories",
+  "/api/v1/stocks",
+  "/api/v1/stocks/forecast",
+  "/api/v1/shopping-list",
+  "/api/v1/shopping-list/store-recommendation",
+  "/api/v1/shopping-records",
+  "/api/v1/shopping-records/summary/monthly",
+  "/api/v1/shopping-records/summary/items",
+  "/api/v1/shopping-records/summary/categories",
+  "/api/v1/memos",
+  "/api/v1/dashboard",
+  "/api/v1/analytics/prices",
+]
+
+# ===============
+# Declarations
+# ===============
+
+def test_every_route_declares_query_budget():
+  missing = [
+    f"{module.__name__} {sorted(route.methods)} {route.path}"
+    for module in SYNC_ROUTERS + AIO_ROUTERS
+    for route in module.router.routes
+    if isinstance(route, APIRoute) and route_query_budget(route) is None
+  ]
+  assert missing == []
+
+def test_aio_routes_share_sync_budgets():
+  sync = __budgets(SYNC_ROUTERS)
+  for key, budget in __budgets(AIO_ROUTERS).items():
+    assert sync[key] == budget, key
+
+# ===============
+# Tracking
+# ===============
+
+def test_track_query_budgets(tmp_path):
+  client = TestClient(__create_app(tmp_path))
+
+  with track_query_budgets() as tracker:
+    client.get("/api/v1/rows/2")
+  assert tracker.counts("GET /api/v1/rows/{count}") == [2]
+
+  with pytest.raises(QueryBudgetExceeded) as e:
+    with track_query_budgets():
+      client.get("/api/v1/rows/3")
+  assert "GET /api/v1/rows/{count}: 3 queries (budget 2)" in str(e.value)
+  assert "SELECT 2" in str(e.value)
+
+# ===============
+# Endpoints
+# ===============
+
+# 1 / 10 / 100 件で一覧を読み、件数がバジェット内で、行数によって増えないことを確かめる
+async def test_list_endpoints_query_budget(auth_client, query_budget):
+  rows = 0
+  for size in (1, 10, 100):
+    while rows < size:
+      await __create_row(auth_client, rows)
+      rows += 1
+    for path in LIST_PATHS:
+      response = await auth_client.get(path)
+      assert response.status_code == 200, path
+
+  for route in {r["route"] for r in query_budget.requests if r["route"].startswith("GET")}:
+    counts = query_budget.counts(route)
+    assert len(set(counts)) == 1, f"{route}: {counts}"
+
+# 在庫がしきい値を下回り、買い物リストにまだ無いアイテムを自動追加する経路
+async def test_restock_query_budget(auth_client, query_budget):
+  item_id = await __create_stocked_item(auth_client, "restock", quantity=5, threshold=3)
+
+  response = await auth_client.put(f"/api/v1/items/{item_id}/stock", json={
+    "reason": "consume",
+    "memo": "",
+    "action": "decrease",
+    "quantity": 3,
+    "threshold": 3,
+    "location": "fridge"
+  })
+  assert response.status_code == 200
+  assert query_budget.counts("PUT /api/v1/items/{item_id}/stock") != []
+
+  shopping_list = await auth_client.get("/api/v1/shopping-list")
+  assert [s["item_id"] for s in shopping_list.json()["data"]] == [item_id]
+
+# リストに載ったアイテムの購入と、店とアイテムを両方変える更新（どちらも補充の経路を通る）
+async def test_shopping_record_writes_query_budget(auth_client, query_budget):
+  item_id = await __create_stocked_item(auth_client, "listed", quantity=1, threshold=5)
+  other_id = await __create_stocked_item(auth_client, "other", quantity=5, threshold=5)
+  await auth_client.post("/api/v1/shopping-list", json={
+    "item_id": item_id,
+    "quantity": 2
+  })
+
+  created = await auth_client.post("/api/v1/shopping-records", json={
+    "item_id": item_id,
+    "quantity": 2,
+    "price": 100,
+    "store": "store0",
+    "bought_at": "2025-10-15T10:00:00"
+  })
+  assert created.status_code == 200
+
+  updated = await auth_client.put(f"/api/v1/shopping-records/{created.json()['data']['id']}", json={
+    "item_id": other_id,
+    "quantity": 1,
+    "price": 120,
+    "store": "store1",
+    "bought_at": "2025-10-16T10:00:00",
+    "reason": "fix",
+    "action": "decrease"
+  })
+  assert updated.status_code == 200
+
+  assert query_budget.counts("POST /api/v1/shopping-records") != []
+  assert query_budget.counts("PUT /api/v1/shopping-records/{shopping_record_id}") != []
+
+# private
+
+def __budgets(modules) -> dict:
+  return {
+    (module.router.prefix, route.path, tuple(sorted(route.methods))): route_query_budget(route)
+    for module in modules
+    for route in module.router.routes
+    if isinstance(route, APIRoute)
+  }
+
+async def __create_row(auth_client, n):
+  category = await auth_client.post("/api/v1/categories", json={
+    "name": f"category{n}",
+    "icon": "🍎"
+  })
+  item = await auth_client.post("/api/v1/items", json={
+    "name": f"item{n}",
+    "default_quantity": 1,
+    "is_favorite": n % 2 == 0,
+    "category_id": category.json()["data"]["id"]
+  })
+  item_id = item.json()["data"]["id"]
+  await auth_client.post("/api/v1/stocks", json={
+    "quantity": 5,
+    "threshold": 1,
+    "location": "fridge",
+    "item_id": item_id
+  })
+  await auth_client.post("/api/v1/shopping-records", json={
+    "item_id": item_id,
+    "quantity": 2,
+    "price": 100 + n,
+    "store": f"store{n % 3}",
+    "bought_at": "2025-10-15T10:00:00"
+  })
+  await auth_client.post("/api/v1/shopping-list", json={
+    "item_id": item_id,
+    "quantity": 2
+  })
+  await auth_client.post("/api/v1/memos", json={
+    "title": f"memo{n}",
+    "is_done": False
+  })
+
+async def __create_stocked_item(auth_client, name, quantity, threshold):
+  category = await auth_client.post("/api/v1/categories", json={
+    "name": f"category_{name}",
+    "icon": "🍎"
+  })
+  item = await auth_client.post("/api/v1/items", json={
+    "name": name,
+    "default_quantity": 1,
+    "is_favorite": False,
+    "category_id": category.json()["data"]["id"]
+  })
+  item_id = item.json()["data"]["id"]
+  await auth_client.post("/api/v1/stocks", json={
+    "quantity": quantity,
+    "threshold": threshold,
+    "location": "fridge",
+    "item_id": item_id
+  })
+  return item_id
+
+def __create_app(tmp_path):
+  engine = create_engine(f"sqlite:///{tmp_path}/budget.db")
+  instrument_engine(engine)
+  router = APIRouter()
+
+  @router.get("/rows/{count}")
+  @query_budget(2)
+  def get_rows(count: int):
+    with engine.connect() as conn:
+      return [conn.execute(text(f"SELECT {n}")).scalar_one() for n in range(count)]
+
+  app = FastAPI()
+  app.include_router(router, prefix="/api/v1")
+  app.add_middleware(RequestMetricsMiddleware, log=False)
+  return app
@@ -0,0 +1,61 @@
+import json
+import logging
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core.request_metrics import RequestMetricsMiddleware, instrument_engine, measure
+from app.utils.response import success
+
+# ===============
+# Request metrics
+# ===============
+
+def test_request_metrics_server_timing(caplog):
+  client = TestClient(__create_app(sample_rate=0))
+
+  with caplog.at_level(logging.INFO, logger="stockypocky.request"):
+    response = client.get("/api/v1/rows/3")
+  assert response.status_code == 200
+  timing = response.headers["server-timing"]
+  assert 'desc="3 queries"' in timing
+  for name in ("db;dur=", "auth;dur=", "serialize;dur=", "total;dur="):
+    assert name in timing
+
+  line = json.loads(caplog.records[-1].getMessage())
+  assert line["route"] == "GET /api/v1/rows/{count}"
+  assert line["status"] == 200
+  assert line["db_count"] == 3
+  assert line["auth_ms"] > 0
+  assert "statements" not in line
+
+def test_request_metrics_statement_sampling(caplog):
+  client = TestClient(__create_app(sample_rate=1))
+
+  with caplog.at_level(logging.INFO, logger="stockypocky.request"):
+    client.get("/api/v1/rows/2")
+  line = json.loads(caplog.records[-1].getMessage())
+  assert [s["sql"] for s in line["statements"]] == ["SELECT 0", "SELECT 1"]
+
+def test_measure_outside_request():
+  with measure("auth"):
+    pass
+
+# private
+
+def __create_app(sample_rate: float):
+  engine = create_engine("sqlite://")
+  instrument_engine(engine)
+  router = APIRouter()
+
+  @router.get("/rows/{count}")
+  def get_rows(count: int):
+    with measure("auth"):
+      sum(range(10000))
+    with engine.connect() as conn:
+      rows = [conn.execute(text(f"SELECT {n}")).scalar_one() for n in range(count)]
+    return success(rows)
+
+  app = FastAPI()
+  app.include_router(router, prefix="/api/v1")
+  app.add_middleware(RequestMetricsMiddleware, sample_rate=sample_rate)
+  return app
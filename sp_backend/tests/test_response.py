@@ -0,0 +1,45 @@
+import json
+from types import SimpleNamespace
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+from app.schemas.category import CategoryResponse
+from app.schemas.response import SuccessResponse
+from app.utils.response import row_data, success
+
+# ===============
+# Success
+# ===============
+
+USER_ID = UUID("00000000-0000-0000-0000-000000000001")
+
+def test_success_matches_response_model():
+  data = [{"category": CategoryResponse(id=1, name="食品", icon="🍎", user_id=USER_ID), "at": datetime(2025, 11, 1, 9, 0)}]
+  body = success(data).body
+  assert json.loads(body) == json.loads(SuccessResponse(data=data).model_dump_json())
+  assert json.loads(body) == {
+    "success": True,
+    "data": [{"category": {"id": 1, "name": "食品", "icon": "🍎", "user_id": str(USER_ID)}, "at": "2025-11-01T09:00:00"}],
+    "next_cursor": None,
+  }
+
+def test_success_next_cursor():
+  assert json.loads(success([], "abc").body)["next_cursor"] == "abc"
+
+# 支出サマリーの金額は文字列ではなく数値で返す（レスポンスの形として固定する）
+def test_row_data_keeps_numbers():
+  rows = [
+    SimpleNamespace(_mapping={"month": datetime(2025, 11, 1), "total_amount": Decimal("618")}),
+    SimpleNamespace(_mapping={"month": datetime(2025, 12, 1), "total_amount": Decimal("1.5")}),
+    SimpleNamespace(_mapping={"month": datetime(2026, 1, 1), "total_amount": Decimal("1500.00")}),
+  ]
+  body = success(row_data(rows)).body
+  assert b'"total_amount":618}' in body
+  assert b'"total_amount":"' not in body
+  data = json.loads(body)["data"]
+  assert data == [
+    {"month": "2025-11-01T00:00:00", "total_amount": 618},
+    {"month": "2025-12-01T00:00:00", "total_amount": 1.5},
+    {"month": "2026-01-01T00:00:00", "total_amount": 1500},
+  ]
+  assert type(data[0]["total_amount"]) is int
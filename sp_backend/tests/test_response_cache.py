@@ -0,0 +1,77 @@
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.response_cache import InProcessBackend, LocalSharedStore, ResponseCache, SharedStoreBackend
+from app.routers import cache_router
+from app.utils import auth
+
+# ===============
+# ResponseCache
+# ===============
+
+def test_in_process_backend_ttl():
+  backend = InProcessBackend(1024)
+  backend.set("a", b"1", 0.05)
+  assert backend.get("a") == b"1"
+  time.sleep(0.1)
+  assert backend.get("a") is None
+  assert backend.stats()["bytes"] == 0
+
+def test_in_process_backend_evicts_by_bytes():
+  backend = InProcessBackend(20)
+  backend.set("a", b"x" * 8, 60)
+  backend.set("b", b"x" * 8, 60)
+  backend.get("a")
+  backend.set("c", b"x" * 8, 60)
+  assert backend.get("b") is None
+  assert backend.get("a") is not None
+  stats = backend.stats()
+  assert stats["evictions"] == 1
+  assert stats["bytes"] <= 20
+
+def test_in_process_backend_skips_oversized():
+  backend = InProcessBackend(10)
+  backend.set("a", b"x" * 20, 60)
+  assert backend.get("a") is None
+  assert backend.stats()["entries"] == 0
+
+def test_response_cache_invalidate_user():
+  cache = ResponseCache(InProcessBackend(1024), 60)
+  key = cache.key(1, cache.version(1), "items", "()")
+  other = cache.key(2, cache.version(2), "items", "()")
+  cache.put(key, b"old")
+  cache.put(other, b"other")
+  assert cache.get(key) == b"old"
+
+  cache.invalidate_user(1)
+  assert cache.get(cache.key(1, cache.version(1), "items", "()")) is None
+  assert cache.get(cache.key(2, cache.version(2), "items", "()")) == b"other"
+  stats = cache.stats()
+  assert stats["hits"] == 2
+  assert stats["misses"] == 1
+  assert stats["invalidations"] == 1
+
+def test_shared_store_backend():
+  cache = ResponseCache(SharedStoreBackend(LocalSharedStore()), 60)
+  assert cache.version(1) == 0
+  cache.invalidate_user(1)
+  assert cache.version(1) == 1
+  key = cache.key(1, cache.version(1), "categories", "None")
+  cache.put(key, b"body")
+  assert cache.get(key) == b"body"
+  assert cache.stats()["backend"] == "shared"
+
+# ===============
+# Endpoint
+# ===============
+
+def test_cache_stats_requires_admin_token(monkeypatch):
+  monkeypatch.setattr(auth, "ADMIN_TOKEN", "admin-secret")
+  app = FastAPI()
+  app.include_router(cache_router.router, prefix="/api/v1")
+  client = TestClient(app)
+
+  assert client.get("/api/v1/cache/stats", headers={"Authorization": "Bearer user-id-token"}).status_code == 403
+  response = client.get("/api/v1/cache/stats", headers={"Authorization": "Bearer admin-secret"})
+  assert response.status_code == 200
+  assert set(response.json()["data"]) == {"response", "token"}
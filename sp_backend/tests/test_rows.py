@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+import pytest
+from app.repositories.categories_repo import CATEGORY_LIST_COLUMNS
+from app.repositories.items_repo import ITEM_LIST_COLUMNS
+from app.repositories.memos_repo import MEMO_LIST_COLUMNS
+from app.repositories.shopping_list_repo import SHOPPING_LIST_COLUMNS
+from app.repositories.shopping_records_repo import SHOPPING_RECORD_LIST_COLUMNS
+from app.repositories.stock_history_repo import STOCK_HISTORY_LIST_COLUMNS
+from app.repositories.stocks_repo import STOCK_LIST_COLUMNS
+from app.schemas.category import CategoryResponse
+from app.schemas.item import ItemResponse
+from app.schemas.memo import MemoResponse
+from app.schemas.shopping_list import ShoppingListResponse
+from app.schemas.shopping_record import ShoppingRecordResponse
+from app.schemas.stock import StockResponse
+from app.schemas.stock_history import StockHistoryResponse
+from app.utils.rows import list_adapter, validate_rows
+
+# ===============
+# ValidateRows
+# ===============
+
+# 一覧の列がレスポンスモデルのフィールドとずれていないこと
+@pytest.mark.parametrize("columns, model", [
+  (CATEGORY_LIST_COLUMNS, CategoryResponse),
+  (ITEM_LIST_COLUMNS, ItemResponse),
+  (MEMO_LIST_COLUMNS, MemoResponse),
+  (SHOPPING_LIST_COLUMNS, ShoppingListResponse),
+  (SHOPPING_RECORD_LIST_COLUMNS, ShoppingRecordResponse),
+  (STOCK_HISTORY_LIST_COLUMNS, StockHistoryResponse),
+  (STOCK_LIST_COLUMNS, StockResponse),
+])
+def test_list_columns_match_response(columns, model):
+  assert sorted(c.key for c in columns) == sorted(model.model_fields)
+
+def test_validate_rows():
+  rows = [SimpleNamespace(id=1, name="食品", icon=None, user_id="00000000-0000-0000-0000-000000000001")]
+  categories = validate_rows(CategoryResponse, rows)
+  assert categories == [CategoryResponse(id=1, name="食品", icon=None, user_id="00000000-0000-0000-0000-000000000001")]
+  assert list_adapter(CategoryResponse) is list_adapter(CategoryResponse)
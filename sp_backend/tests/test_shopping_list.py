@@ -83,6 +83,33 @@ async def test_delete_shopping_list_success(auth_client):
   data = response.json()
   assert data["success"]
 
+# ===============
+# GetStoreRecommendation
+# ===============
+
+async def test_get_store_recommendation_success(auth_client):
+  item = await __create_category_item_stock(auth_client)
+  item_id = item.json()["data"]["id"]
+  await auth_client.post("/api/v1/shopping-list", json={
+    "item_id": item_id,
+    "quantity": 2
+  })
+  for store, price in [("cheap", 300), ("expensive", 500)]:
+    await auth_client.post("/api/v1/shopping-records", json={
+      "item_id": item_id,
+      "quantity": 1,
+      "price": price,
+      "store": store,
+      "bought_at": "2099-01-01"
+    })
+  response = await auth_client.get("/api/v1/shopping-list/store-recommendation")
+  assert response.status_code == 200
+  data = response.json()
+  assert data["success"]
+  assert data["data"]["items"][0]["cheapest"]["store"] == "cheap"
+  assert data["data"]["items"][0]["store_count"] == 2
+  assert data["data"]["stores"][0] == {"store": "cheap", "basket_total": 600, "item_count": 1, "missing_item_count": 0}
+
 # Private
 
 async def __create_category_item_stock(auth_client):
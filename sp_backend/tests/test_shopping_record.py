@@ -151,6 +151,83 @@ async def test_delete_shopping_record_success(auth_client):
   data = response.json()
   assert data["success"]
 
+# ===============
+# SpendingSummary
+# ===============
+
+async def test_monthly_summary_follows_records(auth_client):
+  item = await __create_category_item_stock(auth_client)
+  record = await auth_client.post("/api/v1/shopping-records", json={
+    "item_id": item.json()["data"]["id"],
+    "quantity": 2,
+    "price": 100,
+    "store": "test",
+    "bought_at": "2025-11-30"
+  })
+  response = await auth_client.get("/api/v1/shopping-records/summary/monthly")
+  assert response.status_code == 200
+  assert response.json()["data"][0]["total_amount"] == 200
+
+  await auth_client.put(f"/api/v1/shopping-records/{record.json()["data"]["id"]}", json={
+    "item_id": item.json()["data"]["id"],
+    "quantity": 3,
+    "price": 100,
+    "store": "test",
+    "bought_at": "2025-12-01"
+  })
+  response = await auth_client.get("/api/v1/shopping-records/summary/monthly")
+  data = response.json()["data"]
+  assert len(data) == 1
+  assert data[0]["total_amount"] == 300
+
+  await auth_client.delete(f"/api/v1/shopping-records/{record.json()["data"]["id"]}")
+  response = await auth_client.get("/api/v1/shopping-records/summary/categories")
+  assert response.json()["data"] == []
+
+async def test_summary_range_and_granularity(auth_client):
+  item = await __create_category_item_stock(auth_client)
+  for bought_at in ["2025-10-31T16:00:00", "2025-11-15T00:00:00"]:
+    await auth_client.post("/api/v1/shopping-records", json={
+      "item_id": item.json()["data"]["id"],
+      "quantity": 1,
+      "price": 100,
+      "store": "test",
+      "bought_at": bought_at
+    })
+
+  # UTC では 10 月と 11 月、Asia/Tokyo では両方 11 月
+  response = await auth_client.get("/api/v1/shopping-records/summary/monthly", params={"from": "2025-11-01", "to": "2025-12-01"})
+  assert [d["total_amount"] for d in response.json()["data"]] == [100]
+  response = await auth_client.get("/api/v1/shopping-records/summary/monthly", params={"from": "2025-11-01", "to": "2025-12-01", "tz": "Asia/Tokyo"})
+  assert response.json()["data"] == [{"month": "2025-11-01T00:00:00", "total_amount": 200}]
+
+  response = await auth_client.get("/api/v1/shopping-records/summary/monthly", params={"granularity": "day", "tz": "Asia/Tokyo"})
+  assert [d["day"] for d in response.json()["data"]] == ["2025-11-15T00:00:00", "2025-11-01T00:00:00"]
+
+  response = await auth_client.get("/api/v1/shopping-records/summary/items", params={"tz": "Invalid/Zone"})
+  assert response.status_code == 422
+
+async def test_export_shopping_records(auth_client):
+  item = await __create_category_item_stock(auth_client)
+  for bought_at in ["2025-11-01", "2025-12-01"]:
+    await auth_client.post("/api/v1/shopping-records", json={
+      "item_id": item.json()["data"]["id"],
+      "quantity": 1,
+      "price": 100,
+      "store": "test",
+      "bought_at": bought_at
+    })
+
+  response = await auth_client.get("/api/v1/shopping-records/export")
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("text/csv")
+  assert len(response.text.splitlines()) == 3
+
+  response = await auth_client.get("/api/v1/shopping-records/export", params={"format": "ndjson", "from": "2025-12-01"})
+  lines = response.text.splitlines()
+  assert len(lines) == 1
+  assert '"bought_at": "2025-12-01T00:00:00"' in lines[0]
+
 # Private
 
 async def __create_category_item_stock(auth_client):
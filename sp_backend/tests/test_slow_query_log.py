@@ -0,0 +1,93 @@
+import json
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from app.core.slow_query_log import SlowQueryLog, explainable, parameter_shape
+from app.routers import slow_query_router
+from app.utils import auth
+
+# ===============
+# Slow query log
+# ===============
+
+def test_parameter_shape():
+  assert parameter_shape({"name": "milk", "ids": [1, 2, 3], "limit": 10}) == {"name": "str[4]", "ids": "list[3]", "limit": "int"}
+  assert parameter_shape(("abc", None)) == ["str[3]", "NoneType"]
+
+def test_explainable():
+  assert explainable("SELECT * FROM items")
+  assert explainable("  WITH x AS (SELECT 1) SELECT * FROM x")
+  assert not explainable("WITH u AS (INSERT INTO users DEFAULT VALUES RETURNING id) SELECT id FROM u")
+  assert not explainable("SELECT * FROM items FOR UPDATE")
+  assert not explainable("DELETE FROM items")
+  assert not explainable("SELECT pg_advisory_xact_lock(1016, hashtext('x'))")
+  assert not explainable("SELECT nextval('items_id_seq')")
+  assert not explainable("SELECT setval('items_id_seq', 1)")
+
+def test_slow_query_log_records_and_explains(tmp_path):
+  log = SlowQueryLog(threshold_ms=0, size=3, explain_sample_rate=1)
+  engine = create_engine(f"sqlite:///{tmp_path}/slow.db")
+  log.instrument(engine)
+
+  with engine.connect() as conn:
+    for n in range(5):
+      conn.execute(text("SELECT :n"), {"n": n})
+
+  # 古いものから捨てる。パラメーターは DBAPI に渡した形（sqlite は位置指定）
+  entries = log.entries()
+  assert [e["parameters"] for e in entries] == [["int"]] * 3
+  assert entries[0]["id"] > entries[-1]["id"]
+  assert entries[0]["route"] is None
+  assert entries[0]["sql"] == "SELECT ?"
+
+  # sqlite は EXPLAIN (ANALYZE ...) を解釈できないので、別スレッドでエラーとして記録される
+  deadline = time.monotonic() + 5
+  while any(e["explain"]["status"] == "pending" for e in log.entries()) and time.monotonic() < deadline:
+    time.sleep(0.01)
+  statuses = [e["explain"]["status"] for e in log.entries()]
+  assert set(statuses) <= {"error", "skipped"} and "error" in statuses
+
+  log.dump(str(tmp_path / "dump.json"))
+  with open(tmp_path / "dump.json") as f:
+    assert [e["id"] for e in json.load(f)] == [e["id"] for e in entries]
+
+def test_slow_query_log_threshold(tmp_path):
+  log = SlowQueryLog(threshold_ms=60_000, explain_sample_rate=1)
+  engine = create_engine(f"sqlite:///{tmp_path}/slow.db")
+  log.instrument(engine)
+  with engine.connect() as conn:
+    conn.execute(text("SELECT 1"))
+  assert log.entries() == []
+
+# slow_query_explain=False の文は記録するが EXPLAIN しない
+def test_slow_query_log_explain_opt_out(tmp_path):
+  log = SlowQueryLog(threshold_ms=0, explain_sample_rate=1)
+  engine = create_engine(f"sqlite:///{tmp_path}/slow.db")
+  log.instrument(engine)
+  with engine.connect() as conn:
+    conn.execute(text("SELECT 1").execution_options(slow_query_explain=False))
+  assert [e["explain"] for e in log.entries()] == [None]
+
+# ===============
+# Endpoint
+# ===============
+
+def test_slow_queries_requires_admin_token(monkeypatch):
+  monkeypatch.setattr(auth, "ADMIN_TOKEN", "admin-secret")
+  app = FastAPI()
+  app.include_router(slow_query_router.router, prefix="/api/v1")
+  client = TestClient(app)
+
+  # 普通のユーザーの ID トークンでは見られない
+  assert client.get("/api/v1/slow-queries", headers={"Authorization": "Bearer user-id-token"}).status_code == 403
+  assert client.get("/api/v1/slow-queries").status_code in (401, 403)
+  response = client.get("/api/v1/slow-queries", headers={"Authorization": "Bearer admin-secret"})
+  assert response.status_code == 200
+  assert response.json()["success"]
+
+def test_slow_queries_disabled_without_admin_token(monkeypatch):
+  monkeypatch.setattr(auth, "ADMIN_TOKEN", None)
+  app = FastAPI()
+  app.include_router(slow_query_router.router, prefix="/api/v1")
+  assert TestClient(app).get("/api/v1/slow-queries", headers={"Authorization": "Bearer anything"}).status_code == 403
@@ -0,0 +1,45 @@
+import time
+from app.core.token_cache import TokenCache
+
+# ===============
+# TokenCache
+# ===============
+
+def test_token_cache_hit_and_miss():
+  cache = TokenCache(10)
+  assert cache.get("token") is None
+  cache.put("token", {"id": 1}, time.time() + 60)
+  assert cache.get("token") == {"id": 1}
+  stats = cache.stats()
+  assert stats["hits"] == 1
+  assert stats["misses"] == 1
+
+def test_token_cache_expired():
+  cache = TokenCache(10)
+  cache.put("token", {"id": 1}, time.time() - 1)
+  assert cache.get("token") is None
+  cache._entries.clear()
+  cache.put("token", {"id": 1}, time.time() + 0.05)
+  time.sleep(0.1)
+  assert cache.get("token") is None
+  assert cache.stats()["size"] == 0
+
+def test_token_cache_lru_eviction():
+  cache = TokenCache(2)
+  cache.put("a", {"id": 1}, time.time() + 60)
+  cache.put("b", {"id": 2}, time.time() + 60)
+  cache.get("a")
+  cache.put("c", {"id": 3}, time.time() + 60)
+  assert cache.get("b") is None
+  assert cache.get("a") == {"id": 1}
+  assert cache.stats()["evictions"] == 1
+
+def test_token_cache_evict_user():
+  cache = TokenCache(10)
+  cache.put("a", {"id": 1}, time.time() + 60)
+  cache.put("b", {"id": 1}, time.time() + 60)
+  cache.put("c", {"id": 2}, time.time() + 60)
+  cache.evict_user(1)
+  assert cache.get("a") is None
+  assert cache.get("b") is None
+  assert cache.get("c") == {"id": 2}
@@ -0,0 +1,88 @@
+import json
+import logging
+import time
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from app.core.token_verifier import LocalKeySetVerifier, UnknownKeyError
+
+PROJECT_ID = "stockypocky-test"
+
+# ===============
+# LocalKeySetVerifier
+# ===============
+
+def test_verify_success(tmp_path):
+  key, verifier = __create_verifier(tmp_path)
+  decoded = verifier.verify(__sign(key, "kid-1"))
+  assert decoded["uid"] == "user-1"
+  assert decoded["email"] == "test@example.com"
+
+def test_verify_expired(tmp_path):
+  key, verifier = __create_verifier(tmp_path)
+  with pytest.raises(jwt.ExpiredSignatureError):
+    verifier.verify(__sign(key, "kid-1", exp=int(time.time()) - 10))
+
+def test_verify_wrong_audience(tmp_path):
+  key, verifier = __create_verifier(tmp_path)
+  with pytest.raises(jwt.InvalidAudienceError):
+    verifier.verify(__sign(key, "kid-1", aud="other-project"))
+
+def test_verify_unknown_kid(tmp_path):
+  key, verifier = __create_verifier(tmp_path)
+  with pytest.raises(UnknownKeyError):
+    verifier.verify(__sign(key, "kid-2"))
+
+def test_verify_wrong_key(tmp_path):
+  _, verifier = __create_verifier(tmp_path)
+  other = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+  with pytest.raises(jwt.InvalidSignatureError):
+    verifier.verify(__sign(other, "kid-1"))
+
+# 鍵は起動時に読み込む。verify() からは取りに行かない
+def test_verify_does_not_fetch_keys(tmp_path, monkeypatch):
+  key, _ = __create_verifier(tmp_path)
+  verifier = LocalKeySetVerifier(PROJECT_ID, keys_file=str(tmp_path / "keys.json"))
+  monkeypatch.setattr(verifier, "refresh", lambda: pytest.fail("verify() must not load keys"))
+  with pytest.raises(UnknownKeyError):
+    verifier.verify(__sign(key, "kid-1"))
+
+def test_refresh_error_is_logged(tmp_path, caplog):
+  key, _ = __create_verifier(tmp_path)
+  verifier = LocalKeySetVerifier(PROJECT_ID, keys_file=str(tmp_path / "keys.json"), file_poll_interval=0.01)
+  with caplog.at_level(logging.WARNING, logger="stockypocky.token_verifier"):
+    verifier.start()
+    (tmp_path / "keys.json").unlink()
+    deadline = time.monotonic() + 5
+    while not caplog.records and time.monotonic() < deadline:
+      time.sleep(0.01)
+  assert json.loads(caplog.records[0].getMessage())["event"] == "keyset_refresh_error"
+  # 読み込み済みの鍵で検証を続ける
+  assert verifier.verify(__sign(key, "kid-1"))["uid"] == "user-1"
+
+# private
+
+def __create_verifier(tmp_path):
+  key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+  pem = key.public_key().public_bytes(
+    serialization.Encoding.PEM,
+    serialization.PublicFormat.SubjectPublicKeyInfo,
+  ).decode()
+  keys_file = tmp_path / "keys.json"
+  keys_file.write_text(json.dumps({"kid-1": pem}))
+  verifier = LocalKeySetVerifier(PROJECT_ID, keys_file=str(keys_file))
+  verifier.refresh()
+  return key, verifier
+
+def __sign(key, kid, aud=PROJECT_ID, exp=None):
+  now = int(time.time())
+  claims = {
+    "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+    "aud": aud,
+    "sub": "user-1",
+    "email": "test@example.com",
+    "iat": now,
+    "exp": exp or now + 3600,
+  }
+  return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
@@ -11,11 +11,9 @@ import {
 } from "@mui/material";
 import { Settings } from "@mui/icons-material";
 import {
-  Category,
   Item,
   ItemListDisplay,
   Memo,
-  ShoppingList,
   ShoppingListDisplay,
   Stock,
 } from "@/app/types";
@@ -31,6 +29,11 @@ import DashboardMemo from "@/components/DashboardMemo";
 import { useFormatDate } from "@/hooks/useFormatDate";
 import { logout } from "@/libs/logout";
 
+type DashboardItem = Item & {
+  category_name: string | null;
+  stock: Stock | null;
+};
+
 export default function DashboardPage() {
   const router = useRouter();
   const [displayName, setDisplayName] = useState<string | null>(null);
@@ -39,7 +42,6 @@ export default function DashboardPage() {
   const [lowStockItemList, setLowStockItemList] = useState<ItemListDisplay[]>(
     []
   );
-  const [, setCategories] = useState<Category[]>([]);
   const [loading, setLoading] = useState(true);
   const [openErrorSnackbar, setOpenErrorSnackbar] = useState(false);
   const [error, setError] = useState("");
@@ -55,63 +57,21 @@ export default function DashboardPage() {
     return stock < threshold;
   };
 
-  const mergeItemData = useCallback(
-    (
-      dataItems: Item[],
-      dataCategories: Category[],
-      dataStocks: Stock[]
-    ): ItemListDisplay[] => {
-      const categoryMap = new Map(
-        dataCategories.map((c: Category) => [c.id, c.name])
-      );
-      const stockMap = new Map(dataStocks.map((s: Stock) => [s.item_id, s]));
-      const result: ItemListDisplay[] = dataItems.map((item) => {
-        const stock = stockMap.get(item.id);
-        return {
+  const toItemDisplay = useCallback(
+    (items: DashboardItem[]): ItemListDisplay[] => {
+      return items
+        .map((item) => ({
           id: item.id,
           name: item.name,
           categoryId: item.category_id,
-          categoryName: categoryMap.get(item.category_id) ?? "未分類",
-          stockQuantity: stock ? stock.quantity : 0,
+          categoryName: item.category_name ?? "未分類",
+          stockQuantity: item.stock ? item.stock.quantity : 0,
           isFavorite: item.is_favorite,
-          threshold: stock ? stock.threshold : 0,
+          threshold: item.stock ? item.stock.threshold : 0,
           imageUrl: item.image_url,
-          location: stock ? stock.location : "",
+          location: item.stock ? item.stock.location : "",
           unit: item.unit,
-        };
-      });
-      return result
-        .filter((item) => isLowStock(item.stockQuantity, item.threshold))
-        .slice(0, 3);
-    },
-    []
-  );
-
-  const mergeShoppingData = useCallback(
-    (
-      dataItems: Item[],
-      dataShopping: ShoppingList[]
-    ): ShoppingListDisplay[] => {
-      const itemMap = new Map(dataItems.map((i: Item) => [i.id, i]));
-      const result: ShoppingListDisplay[] = dataShopping.map((shopping) => {
-        const item = itemMap.get(shopping.item_id);
-        return {
-          id: shopping.id,
-          quantity: shopping.quantity,
-          checked: shopping.checked,
-          user_id: shopping.user_id,
-          item_id: shopping.item_id,
-          name: item ? item.name : "",
-          image_url: item ? item.image_url : "",
-          notes: item ? item.notes : "",
-          added_at: shopping.added_at,
-        };
-      });
-      return result
-        .sort(
-          (a, b) =>
-            new Date(b.added_at).getTime() - new Date(a.added_at).getTime()
-        )
+        }))
         .slice(0, 3);
     },
     []
@@ -121,43 +81,26 @@ export default function DashboardPage() {
     const fetchAll = async () => {
       try {
         setLoading(true);
-        // アイテム一覧取得
-        const resItems = await api.get("/items");
-        const dataItems = resItems.data.data;
-        // カテゴリ一覧取得
-        const resCategories = await api.get("/categories");
-        const dataCategories = resCategories.data.data;
-        setCategories(dataCategories);
-        // 在庫一覧取得
-        const resStocks = await api.get("/stocks");
-        const dataStocks = resStocks.data.data;
-        // 買い物リスト取得
-        const resShopping = await api.get("/shopping-list");
-        const dataShopping = resShopping.data.data;
-        // メモ一覧取得
-        const resMemo = await api.get("/memos");
-        const dataMemo = resMemo.data.data;
-        setMemoList(dataMemo);
-
-        const res = await api.get("/users/me");
-        setDisplayName(res.data.data.name);
-
-        // 表示アイテムの整形
-        const mergeData = mergeItemData(dataItems, dataCategories, dataStocks);
-        setLowStockItemList(mergeData);
-        const mergeShopping = mergeShoppingData(dataItems, dataShopping);
-        setShoppingList(mergeShopping);
+        // ダッシュボード表示に必要なデータを 1 リクエストで取得
+        const res = await api.get("/dashboard", {
+          params: { sections: "user,low_stock,shopping_list,memos" },
+        });
+        const data = res.data.data;
+        setDisplayName(data.user.name);
+        setMemoList(data.memos);
+        setLowStockItemList(toItemDisplay(data.low_stock));
+        // 買い物リストは追加日の新しい順で返ってくる
+        setShoppingList(data.shopping_list.slice(0, 3));
       } catch (err) {
         setError("データ取得エラー：" + err);
         setOpenErrorSnackbar(true);
       } finally {
-        // 全て整形し終わってからロード解除
         setLoading(false);
       }
     };
 
     fetchAll();
-  }, [mergeItemData, mergeShoppingData]);
+  }, [toItemDisplay]);
 
   if (loading) return <LoadingScreen />;
 
@@ -18,13 +18,7 @@ import { useItemStore } from "@/stores/item";
 import { api } from "@/libs/api/client";
 import { use, useEffect, useState } from "react";
 import axios from "axios";
-import {
-  Category,
-  Item,
-  ItemListDisplay,
-  Stock,
-  StockHistory,
-} from "@/app/types";
+import { ItemDetail, ItemListDisplay, StockHistory } from "@/app/types";
 import ErrorPage from "@/components/ErrorPage";
 import CalendarMonthIcon from "@mui/icons-material/CalendarMonth";
 import Header from "@/components/Header";
@@ -74,19 +68,13 @@ export default function ItemDetailPage({
     setOpenDialogManual(false);
   };
 
-  const mergeItemData = (
-    dataItems: Item,
-    dataCategories: Category[],
-    dataStocks: Stock
-  ): ItemListDisplay => {
-    const categoryMap = new Map(
-      dataCategories.map((c: Category) => [c.id, c.name])
-    );
+  const mergeItemData = (dataItems: ItemDetail): ItemListDisplay => {
+    const dataStocks = dataItems.stock;
     return {
       id: dataItems.id,
       name: dataItems.name,
       categoryId: dataItems.category_id,
-      categoryName: categoryMap.get(dataItems.category_id) ?? "未分類",
+      categoryName: dataItems.category?.name ?? "未分類",
       stockQuantity: dataStocks ? dataStocks.quantity : 0,
       isFavorite: dataItems.is_favorite,
       threshold: dataStocks ? dataStocks.threshold : 0,
@@ -100,13 +88,14 @@ export default function ItemDetailPage({
     if (!item) {
       const fetchItem = async () => {
         try {
-          const resItem = (await api.get(`/items/${unwrapParams.id}`)).data
-            .data;
-          const resStock = (await api.get(`/items/${unwrapParams.id}/stock`))
-            .data.data;
-          const resCategory = (await api.get("/categories")).data.data;
-
-          const mergeData = mergeItemData(resItem, resCategory, resStock);
+          // 在庫とカテゴリはアイテムに埋め込んで 1 リクエストで取得
+          const resItem = (
+            await api.get(`/items/${unwrapParams.id}`, {
+              params: { include: "stock,category" },
+            })
+          ).data.data;
+
+          const mergeData = mergeItemData(resItem);
           useItemStore.getState().setSelectedItem(mergeData);
         } catch (err) {
           setError("アイテム取得エラー：" + err);
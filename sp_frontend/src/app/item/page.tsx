@@ -17,7 +17,7 @@ import SearchIcon from "@mui/icons-material/Search";
 import FavoriteIcon from "@mui/icons-material/Favorite";
 import { useRouter } from "next/navigation";
 import FavoriteBorderIcon from "@mui/icons-material/FavoriteBorder";
-import { Category, Item, ItemListDisplay, Stock } from "../types";
+import { Category, ItemDetail, ItemListDisplay } from "../types";
 import { api } from "@/libs/api/client";
 import LoadingScreen from "@/components/LoadingScreen";
 import CategoryIcon2 from "@mui/icons-material/Category";
@@ -61,22 +61,14 @@ export default function ItemsPage() {
       return true;
     });
 
-  const mergeItemData = (
-    dataItems: Item[],
-    dataCategories: Category[],
-    dataStocks: Stock[]
-  ): ItemListDisplay[] => {
-    const categoryMap = new Map(
-      dataCategories.map((c: Category) => [c.id, c.name])
-    );
-    const stockMap = new Map(dataStocks.map((s: Stock) => [s.item_id, s]));
+  const mergeItemData = (dataItems: ItemDetail[]): ItemListDisplay[] => {
     const result: ItemListDisplay[] = dataItems.map((item) => {
-      const stock = stockMap.get(item.id);
+      const stock = item.stock;
       return {
         id: item.id,
         name: item.name,
         categoryId: item.category_id,
-        categoryName: categoryMap.get(item.category_id) ?? "未分類",
+        categoryName: item.category?.name ?? "未分類",
         stockQuantity: stock ? stock.quantity : 0,
         isFavorite: item.is_favorite,
         threshold: stock ? stock.threshold : 0,
@@ -92,15 +84,17 @@ export default function ItemsPage() {
     const fetchItem = async () => {
       try {
         setLoading(true);
-        const resItems = await api.get("/items");
+        // 在庫とカテゴリはアイテムに埋め込んで取得する
+        const resItems = await api.get("/items", {
+          params: { include: "stock,category" },
+        });
         const dataItems = resItems.data.data;
+        // カテゴリ一覧はフィルタ用
         const resCategories = await api.get("/categories");
         const dataCategories = resCategories.data.data;
         setCategories(dataCategories);
-        const resStocks = await api.get("/stocks");
-        const dataStocks = resStocks.data.data;
 
-        const mergeData = mergeItemData(dataItems, dataCategories, dataStocks);
+        const mergeData = mergeItemData(dataItems);
         setItemList(mergeData);
       } catch (err) {
         setError("アイテム取得エラー：" + err);
@@ -28,6 +28,13 @@ export interface Stock {
   item_id: number;
 }
 
+// GET /items?include=stock,category,shopping_list のレスポンス
+export interface ItemDetail extends Item {
+  stock?: Stock | null;
+  category?: Category | null;
+  shopping_list?: ShoppingList[];
+}
+
 export interface ItemListDisplay {
   id: number;
   name: string;